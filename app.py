@@ -1,7 +1,11 @@
 import dash
-from dash import html, dcc
+from dash import html, dcc, Input, Output, clientside_callback
 import dash_bootstrap_components as dbc
 
+from utils.rendering import RENDER_MODES, CLIENT_HINTS_JS
+from utils.layouts import install_layout_cache
+from utils.metrics import install_metrics
+
 
 
 
@@ -35,6 +39,7 @@ Navbar = dbc.Nav([
     dbc.NavLink(html.Div("Centroids", className = "ms-2"),   href = "/centroids",   active = "exact"),    
     dbc.NavLink(html.Div("Deflections", className = "ms-2"), href = "/deflections", active = "exact"),    
     dbc.NavLink(html.Div("Friction", className = "ms-2"),    href = "/friction",    active = "exact"),    
+    dbc.NavLink(html.Div("Belts & Wedges", className = "ms-2"), href = "/friction/belts", active = "exact"),
     dbc.NavLink(html.Div("Cables", className = "ms-2"),      href = "/cables",      active = "exact"),
     dbc.NavLink(html.Div("Vibrations", className = "ms-2"),  href = "/vibrations",  active = "exact"),
     dbc.NavLink(html.Div("Resonance", className = "ms-2"),   href = "/resonance",   active = "exact"),
@@ -94,6 +99,27 @@ app.layout = dbc.Container([
         
     ]),
     
+    ## Render mode:
+    dbc.Row([
+        
+        dbc.Col(
+            
+            dbc.RadioItems(
+                id = "render-mode",
+                options = [{"label": label, "value": mode} for mode, label in RENDER_MODES.items()],
+                value = "auto",
+                inline = True,
+                persistence = True,
+                className = "text-end small",
+            ),
+            
+            xs = 12, sm = 12, md = 12, lg = 12, xl = 12, xxl = 12
+        ),
+        
+        dcc.Store(id = "client-hints"),
+        
+    ], className = "mt-1"),
+    
     # Line
     dbc.Row([
         dbc.Col(
@@ -130,6 +156,42 @@ app.layout = dbc.Container([
 
 
 
+#################################################################################
+# CLIENT HINTS:
+
+clientside_callback(
+    CLIENT_HINTS_JS,
+    Output("client-hints", "data"),
+    Input("client-hints", "id"),
+)
+
+
+
+
+
+
+
+
+#################################################################################
+# COMPILED LAYOUTS:
+
+install_layout_cache(app)
+
+
+
+
+#################################################################################
+# METRICS:
+
+install_metrics(app)   # Solver counters and histograms at /_metrics
+
+
+
+
+
+
+
+
 #################################################################################
 # RUN APP:
 
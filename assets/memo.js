@@ -0,0 +1,83 @@
+// Browser-side memo store for server callbacks registered with utils/memo.py.
+//
+// Every memoized callback has a clientside half that runs in front of the server:
+// inputs already seen are answered from a bounded per-tab Map, and only misses are
+// written to the "<name>-request" store, which triggers the server. The server answer
+// comes back through the "<name>-response" store, is remembered and then dispatched.
+
+window.dash_clientside = window.dash_clientside || {};
+
+window.dash_clientside.memo = {
+
+    stores:  {},
+    pending: {},
+    count:   0,
+
+    lookup: function (name, nOutputs, maxEntries, previewIndex, args) {
+
+        const noUpdate  = window.dash_clientside.no_update;
+        const triggered = window.dash_clientside.callback_context.triggered.map(t => t.prop_id);
+        const skip      = Array(nOutputs).fill(noUpdate);
+        const response  = args[args.length - 1];
+        const inputs    = args.slice(0, -1);
+
+        const store = this.stores[name] = this.stores[name] || new Map();
+
+        //--------------------------------------------------------------------------
+        // Server answer:
+
+        if (triggered.length === 1 && triggered[0] === name + "-response.data") {
+
+            if (!response) {
+                return skip.concat([noUpdate]);
+            }
+
+            this.remember(store, maxEntries, response.key, response.outputs);
+
+            if (response.key !== this.pending[name]) {
+                return skip.concat([noUpdate]);     // a newer request is on its way
+            }
+            return this.dispatch(response.outputs).concat([noUpdate]);
+        }
+
+        //--------------------------------------------------------------------------
+        // Input change:
+
+        const preview = previewIndex >= 0 && triggered.some(t => t.endsWith("-drag.data")) &&
+                        inputs[previewIndex] !== null && inputs[previewIndex] !== undefined;
+
+        // The drag store only matters for previews, so full results ignore it:
+        const keyed = inputs.filter((_, i) => preview || i !== previewIndex);
+        const key   = JSON.stringify([preview, keyed]);
+
+        this.pending[name] = key;
+
+        if (maxEntries > 0 && store.has(key)) {
+            const outputs = store.get(key);
+            store.delete(key);
+            store.set(key, outputs);
+            return this.dispatch(outputs).concat([noUpdate]);
+        }
+
+        this.count += 1;
+        return skip.concat([{key: key, args: inputs, preview: preview, n: this.count}]);
+    },
+
+    remember: function (store, maxEntries, key, outputs) {
+
+        if (maxEntries <= 0) {
+            return;
+        }
+        store.delete(key);
+        store.set(key, outputs);
+        while (store.size > maxEntries) {
+            store.delete(store.keys().next().value);
+        }
+    },
+
+    dispatch: function (outputs) {
+
+        const noUpdate = window.dash_clientside.no_update;
+        return outputs.map(o => (o && o._dash_no_update) ? noUpdate : o);
+    },
+};
@@ -0,0 +1,69 @@
+// Angle sweep of the deflections page (pages/deflections.py, Sweep_Bundle).
+//
+// The server sends every frame of the sweep at once. On each tick of sweep-interval the
+// trace patches of the next frame are applied to copies of the current figures, so the
+// animation runs without requests. The figures shown before the sweep are restored at
+// the end.
+
+window.dash_clientside = window.dash_clientside || {};
+
+window.dash_clientside.sweep = {
+
+    graphs:   ["mohr-circle-graph", "channel-graph", "beam-deflection-graph"],
+    original: null,
+
+    tick: function (n, bundle, ...figures) {
+
+        const noUpdate = window.dash_clientside.no_update;
+
+        if (!bundle) {
+            return figures.map(() => noUpdate).concat([true]);
+        }
+
+        if (this.original === null) {
+            this.original = figures;
+        }
+
+        const frame = n - 1;
+
+        // Play_Sweep resets n_intervals to 0, which fires a tick before the first frame:
+        if (frame < 0) {
+            return figures.map(() => noUpdate).concat([false]);
+        }
+
+        if (frame >= bundle.angles.length) {
+            const original = this.original;
+            this.original = null;
+            return original.concat([true]);
+        }
+
+        const updated = this.graphs.map((graph, g) => {
+
+            const patches = bundle.frames[graph];
+            if (!patches || !figures[g]) {
+                return noUpdate;
+            }
+
+            const figure = {...figures[g], data: figures[g].data.slice()};
+
+            patches[frame].forEach(patch => {
+                const trace = {...figure.data[patch.i]};
+                ["x", "y", "text"].forEach(key => {
+                    if (patch[key] !== undefined) {
+                        trace[key] = patch[key];
+                    }
+                });
+                figure.data[patch.i] = trace;
+            });
+
+            if (bundle.yranges[graph]) {
+                figure.layout = {...figure.layout,
+                                 yaxis: {...figure.layout.yaxis, range: bundle.yranges[graph]}};
+            }
+
+            return figure;
+        });
+
+        return updated.concat([false]);
+    },
+};
@@ -0,0 +1,329 @@
+from functools import lru_cache
+
+import dash
+from dash import dcc, html, Output, Input
+import dash_bootstrap_components as dbc
+
+import numpy as np, plotly.graph_objects as go
+from shapely.geometry import Point
+
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_rows
+from utils.friction import belt_tensions, required_wrap, wedge_forces
+from utils.geometry import outline
+
+
+########################################################################################################
+
+
+dash.register_page(__name__, name = "Belts & Wedges", path = "/friction/belts")
+
+MEMO_SIZE = 32   # Responses remembered per callback in the browser, 0 disables.
+
+BELT_TYPES = {180: "Flat belt", 38: "V-belt (38° groove)"}
+
+WRAP_ANGLES  = np.linspace(0, 720, 241)          # Wrap angles of the tension ratio graph [deg]
+WEDGE_ANGLES = np.linspace(0.5, 45, 179)         # Wedge angles of the wedge force graph [deg]
+DRUM_RADIUS  = 1.0                               # Radius of the drawn drum
+BELT_PITCH   = 0.08                              # Radial gap between the turns of a drawn belt wrapped more than once
+
+
+
+########################################################################################################
+# APP LAYOUT:
+
+SLIDERS = [
+    SliderSpec("BeltFriction-slider", "Friction Coefficient: ",  1,  12,  1,   6, lambda i: f"{i/20}"),
+    SliderSpec("Wrap-slider",         "Wrap Angle [deg]: ",      0, 720, 15, 180, mark_step = 90),
+    SliderSpec("Slack-slider",        "Slack Tension [kN]: ",    1,  10,  1,   2),
+    SliderSpec("WedgeAngle-slider",   "Wedge Angle [deg]: ",     1,  45,  1,  10, mark_step = 5),
+    SliderSpec("WedgeLoad-slider",    "Wedge Load [kN]: ",      10, 100, 10,  50),
+]
+
+
+layout = dbc.Container([
+
+
+    #-------------------------------------------------------------------------------------------------------
+    # ROWS 1-5: Labels & Sliders
+
+    *slider_rows(SLIDERS),
+
+
+    #-------------------------------------------------------------------------------------------------------
+    # ROW 6: Graphs
+
+    dbc.Row([
+
+        dbc.Col([
+
+            html.Div(
+                children = html.Label(
+                                style = {"verticalAlign": "top", "textAlign": "justify"},
+                                id = "belt-results"
+                            ),
+                style = {
+                    "fontSize": "1rem",
+                    "family": "Arial",
+                    "color": "black",
+                },
+                className = "align-top",
+            ),
+
+        ], xs = 12, sm = 12, md = 12, lg = 3, xl = 3, xxl = 3, className = "mt-3"
+        ),
+
+        dbc.Col([
+
+            dbc.RadioItems(
+                id = "belt-type",
+                options = [{"label": label, "value": groove} for groove, label in BELT_TYPES.items()],
+                value = 180,
+                inline = True,
+            ),
+            dcc.Graph(id = "belt-graph"),
+
+        ], xs = 12, sm = 12, md = 12, lg = 4, xl = 4, xxl = 4, className = "mt-3"
+        ),
+
+        dbc.Col([
+
+            dcc.Graph(id = "belt-ratio-graph", style = {"height": "40vh"}),
+            dcc.Graph(id = "wedge-graph", style = {"height": "40vh"}),
+
+        ], xs = 12, sm = 12, md = 12, lg = 5, xl = 5, xxl = 5, className = "mt-3"
+        ),
+
+
+    ], align = "center", justify = "center"
+    ),
+
+    memo_stores("belts"),
+
+
+
+], fluid = True,)
+
+
+
+
+########################################################################################################
+# Tension ratios and wedge forces over the whole graphs, one vectorized call per friction coefficient:
+
+@lru_cache(maxsize = 64)
+def Friction_Curves(mu):
+
+    ratios = belt_tensions(mu, WRAP_ANGLES[None, :], 1, np.array(list(BELT_TYPES))[:, None]).ratio
+    wedges = wedge_forces(1, WEDGE_ANGLES, mu)
+
+    return ratios, wedges
+
+# end def Friction_Curves()
+
+
+
+
+########################################################################################################
+# Calculate belt tensions and wedge forces:
+
+@memo_callback(
+    "belts",
+    [Output("belt-graph", "figure"),
+     Output("belt-ratio-graph", "figure"),
+     Output("wedge-graph", "figure"),
+     Output("belt-results", "children")],
+    [Input("BeltFriction-slider", "value"),
+     Input("Wrap-slider", "value"),
+     Input("Slack-slider", "value"),
+     Input("WedgeAngle-slider", "value"),
+     Input("WedgeLoad-slider", "value"),
+     Input("belt-type", "value")],
+    max_entries = MEMO_SIZE,
+)
+def Calculate_Belts(mu, wrap, slack, alpha, W, groove):
+
+    mu /= 20
+
+    belt  = belt_tensions(mu, wrap, slack, groove)
+    wedge = wedge_forces(W, alpha, mu)
+
+    ratios, wedges = Friction_Curves(mu)
+
+    results = [
+        html.Strong("Belt"), html.Br(),
+        f"Tension ratio T1/T2 = {belt.ratio:.3f}", html.Br(),
+        f"Tight side T1 = {belt.tight:.2f} kN", html.Br(),
+        f"Friction force T1 - T2 = {belt.friction:.2f} kN", html.Br(),
+        f"Wrap to double the tension: {required_wrap(2, mu, groove):.0f}°", html.Br(),
+        html.Br(),
+        html.Strong("Wedge"), html.Br(),
+        f"Friction angle φ = {wedge.phi:.2f}°", html.Br(),
+        f"Force to raise the load P = {wedge.push:.2f} kN", html.Br(),
+    ]
+
+    if wedge.self_locking:
+        results += [f"Force to remove the wedge = {wedge.removal:.2f} kN", html.Br(),
+                    "The wedge is ", html.Strong("SELF-LOCKING"), f" (α ≤ 2φ = {2*wedge.phi:.1f}°)."]
+    else:
+        results += [f"Force to hold the wedge in place = {-wedge.removal:.2f} kN", html.Br(),
+                    "The wedge is ", html.Strong("NOT SELF-LOCKING"), f" (α > 2φ = {2*wedge.phi:.1f}°)."]
+    # end if else
+
+    return Belt_Graph(wrap, belt), Ratio_Graph(ratios, wrap, belt.ratio, groove), Wedge_Graph(wedges, wedge, alpha, W), results
+
+# end def Calculate_Belts()
+
+
+
+
+########################################################################################################
+# DRUM & BELT:
+#
+# The slack side hangs down from the left of the drum, the belt wraps clockwise over the top and the
+# tight side leaves along the tangent. Every turn beyond the first is drawn BELT_PITCH further out.
+
+def Belt_Graph(wrap, belt):
+
+    fig1 = go.Figure()
+
+    x, y = outline([Point(0, 0).buffer(DRUM_RADIUS)])
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", fill = "toself", line_color = "black",
+                              fillcolor = "lightgrey", hoverinfo = "skip", showlegend = False,
+                              )
+    )
+
+    t     = np.radians(np.linspace(0, wrap, max(2, int(wrap))))
+    r     = DRUM_RADIUS + BELT_PITCH*t/(2*np.pi)
+    theta = np.pi - t
+
+    # Tangent of the tight side, in the direction of travel:
+    end  = np.array([r[-1]*np.cos(theta[-1]), r[-1]*np.sin(theta[-1])])
+    tail = end + 1.5*np.array([np.sin(theta[-1]), -np.cos(theta[-1])])
+
+    x = np.concatenate([[-DRUM_RADIUS], r*np.cos(theta), [tail[0]]])
+    y = np.concatenate([[-1.5], r*np.sin(theta), [tail[1]]])
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", line_color = "blue", line_width = 4,
+                              hoverinfo = "skip", showlegend = False,
+                              )
+    )
+
+    fig1.add_trace(go.Scatter(x = [-DRUM_RADIUS, tail[0]], y = [-1.5, tail[1]], mode = "markers+text",
+                              marker_color = "red", marker_size = 10, showlegend = False, hoverinfo = "skip",
+                              text = [f"T2 = {belt.slack:.2f} kN", f"T1 = {belt.tight:.2f} kN"],
+                              textposition = ["bottom center", "top center"],
+                              )
+    )
+
+    fig1.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        autosize = True,
+    )
+    fig1.update_xaxes(
+        range = [-3, 3],
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+    )
+    fig1.update_yaxes(
+        range = [-3, 3],
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+        scaleanchor = "x",
+        scaleratio = 1,
+    )
+
+    return fig1
+
+# end def Belt_Graph()
+
+
+
+
+########################################################################################################
+# TENSION RATIO & WEDGE FORCE GRAPHS:
+
+def Ratio_Graph(ratios, wrap, ratio, groove):
+
+    fig2 = go.Figure()
+
+    for (g, label), curve in zip(BELT_TYPES.items(), ratios):
+        fig2.add_trace(go.Scatter(x = WRAP_ANGLES, y = curve, mode = "lines",
+                                  line_color = "blue" if g == groove else "grey",
+                                  name = label, hovertemplate = "%{x}°: T1/T2 = %{y:.3f}",
+                                  )
+        )
+    # end for g
+
+    fig2.add_trace(go.Scatter(x = [wrap], y = [ratio], mode = "markers", marker_color = "red",
+                              marker_size = 12, showlegend = False, hoverinfo = "skip",
+                              )
+    )
+
+    fig2.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=30, b=0),
+        title = "Tension ratio",
+        legend = dict(x = 0, y = 1),
+    )
+    fig2.update_xaxes(
+        title = "Wrap Angle [deg]",
+        title_font = {"family": "Arial Black"},
+    )
+    fig2.update_yaxes(
+        title = "T1/T2",
+        title_font = {"family": "Arial Black"},
+        type = "log",
+    )
+
+    return fig2
+
+# end def Ratio_Graph()
+
+
+def Wedge_Graph(wedges, wedge, alpha, W):
+
+    fig3 = go.Figure()
+
+    # Self-locking wedges, alpha <= 2 phi:
+    fig3.add_vrect(x0 = WEDGE_ANGLES[0], x1 = min(2*wedge.phi, WEDGE_ANGLES[-1]), fillcolor = "lightblue",
+                   opacity = 0.5, line_width = 0, annotation_text = "Self-locking",
+                   annotation_position = "top left")
+
+    fig3.add_trace(go.Scatter(x = WEDGE_ANGLES, y = W*wedges.push, mode = "lines", line_color = "blue",
+                              name = "Raise", hovertemplate = "%{x}°: P = %{y:.2f} kN",
+                              )
+    )
+    fig3.add_trace(go.Scatter(x = WEDGE_ANGLES, y = W*wedges.removal, mode = "lines", line_color = "black",
+                              line_dash = "dash", name = "Remove", hovertemplate = "%{x}°: %{y:.2f} kN",
+                              )
+    )
+    fig3.add_trace(go.Scatter(x = [alpha, alpha], y = [wedge.push, wedge.removal], mode = "markers",
+                              marker_color = "red", marker_size = 12, showlegend = False, hoverinfo = "skip",
+                              )
+    )
+
+    fig3.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=30, b=0),
+        title = "Wedge forces",
+        legend = dict(x = 0, y = 1),
+    )
+    fig3.update_xaxes(
+        title = "Wedge Angle [deg]",
+        title_font = {"family": "Arial Black"},
+    )
+    fig3.update_yaxes(
+        title = "Force [kN]",
+        title_font = {"family": "Arial Black"},
+        zeroline = True,
+    )
+
+    return fig3
+
+# end def Wedge_Graph()
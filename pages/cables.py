@@ -3,102 +3,47 @@ from dash import dcc, html, callback, Output, Input
 import dash_bootstrap_components as dbc
 
 import numpy as np, plotly.graph_objects as go
-from scipy.optimize import root_scalar
-
-
-########################################################################################################
-
-
-dash.register_page(__name__, name = "Cables", path = "/cables")
 
+from utils.rendering import render
+from utils.preview import drag_store, preview_values
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_rows
+from utils.catenary import atlas_catenary, solve_elastic, elastic_profile
+from utils.cablenet import CableLoad, solve_network, network_curve
 
 
 ########################################################################################################
-# APP LAYOUT:
 
-layout = dbc.Container([
 
-    
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 1: Label & Slider - Self Weight
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Cable Self Weight [kN/m]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(1, 10, 1, value = 5, id = "SW-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(1, 10+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
+dash.register_page(__name__, name = "Cables", path = "/cables")
 
-    ], className = "mt-1"
-    ),
+POINTS, PREVIEW_POINTS = 500, 60   # Points along the cable after release / while dragging.
+MEMO_SIZE = 32                     # Responses remembered per callback in the browser, 0 disables.
 
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 2: Label & Slider - Cable Length
-    
-    dbc.Row([
+CABLE_SYSTEMS = {"single": "Single span", "spans": "Two spans", "hangers": "Hanger loads", "elastic": "Elastic cable"}
+HANGERS, HANGER_LOAD = 9, 5        # Hangers evenly spaced along the cable, load of each [kN].
 
-        dbc.Col(
 
-            html.Div(html.Label("Cable Length [m]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
 
-        ),
+########################################################################################################
+# APP LAYOUT:
 
-        dbc.Col(
+SLIDERS = [
+    SliderSpec("SW-slider", "Cable Self Weight [kN/m]: ", 1, 10, 1, 5),
+    SliderSpec("L-slider",  "Cable Length [m]: ",        23, 30, 0.1, 25, mark_step = 1),
+    SliderSpec("H-slider",  "Height B [m]: ",             5, 20, 0.1, 20, mark_step = 1),
+    SliderSpec("EA-slider", "Elastic Cable EA [MN]: ",   10, 100, 5, 60, mark_step = 10),
+    SliderSpec("dT-slider", "Elastic Cable ΔT [°C]: ",   -40, 60, 5, 0, mark_step = 20),
+]
 
-            dcc.Slider(23, 30, 1, value = 25, id = "L-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(23, 30+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
 
-        )
+layout = dbc.Container([
 
-    ], className = "mt-3"
-    ),
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 3: Label & Slider - Height of B
+    # ROWS 1-5: Labels & Sliders
     
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Height B [m]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(5, 20, 1, value = 20, id = "H-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(5, 20+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-3"
-    ),
+    *slider_rows(SLIDERS),
     
     
     #-------------------------------------------------------------------------------------------------------
@@ -126,7 +71,14 @@ layout = dbc.Container([
         
         dbc.Col([
 
+            dbc.RadioItems(
+                id = "cable-system",
+                options = [{"label": label, "value": system} for system, label in CABLE_SYSTEMS.items()],
+                value = "single",
+                inline = True,
+            ),
             dcc.Graph(id = "cable-graph"),
+            dcc.Graph(id = "tension-graph"),
 
         ], xs = 12, sm = 12, md = 12, lg = 6, xl = 6, xxl = 6, className = "mt-3"
         ),
@@ -136,6 +88,10 @@ layout = dbc.Container([
 
     ], align = "center", justify = "center"
     ),
+    
+    drag_store("cables-drag", ["SW-slider", "L-slider", "H-slider", "EA-slider", "dT-slider"]),
+    
+    memo_stores("cables-cable"),
 
 
 
@@ -147,14 +103,47 @@ layout = dbc.Container([
 ########################################################################################################
 # Draw cable and calculate parameters:
 
-@callback(
-    Output("cable-graph", "figure"),
-    Output("cable-properties", "children"),
-    Input("SW-slider", "value"),
-    Input("L-slider", "value"),
-    Input("H-slider", "value")
+@memo_callback(
+    "cables-cable",
+    [Output("cable-graph", "figure"),
+     Output("cable-properties", "children"),
+     Output("tension-graph", "figure")],
+    [Input("SW-slider", "value"),
+     Input("L-slider", "value"),
+     Input("H-slider", "value"),
+     Input("EA-slider", "value"),
+     Input("dT-slider", "value"),
+     Input("cable-system", "value"),
+     Input("render-mode", "value"),
+     Input("client-hints", "data"),
+     Input("cables-drag", "data")],
+    max_entries = MEMO_SIZE,
+    preview = "cables-drag",
 )
-def Draw_Cable(w, L, H):
+def Draw_Cable(w, L, H, EA, dT, system, mode, hints, drag):
+    
+    (w, L, H, EA, dT), preview = preview_values("cables-drag", [w, L, H, EA, dT], drag)
+    
+    if system == "single":
+        fig1, results, tension = Single_Span(w, L, H, preview)
+    elif system == "elastic":
+        fig1, results, tension = Elastic_Cable(w, L, H, EA*1e3, dT, preview)
+    else:
+        fig1, results, tension = Cable_System(w, L, H, system, preview)
+    # end if else
+    
+    fig2 = Tension_Graph(*tension)
+    
+    return render(fig1, mode, hints), results, render(fig2, mode, hints)
+# end def Draw_Cable()
+
+
+
+
+########################################################################################################
+# Single catenary between two supports:
+
+def Single_Span(w, L, H, preview):
     
     bx = 20
     
@@ -164,36 +153,16 @@ def Draw_Cable(w, L, H):
     #------------------------------------------------------------------------------------------
     # Calculations:
     
-    solve_for_c = lambda c: (2*c/bx)*np.sinh(0.5*bx/c) - (1/bx)*np.sqrt((L**2) - ((H-10)**2))
-    c = root_scalar(solve_for_c, x0 = 10, method = "newton").root
-    
-    solve_for_v1 = lambda v1: c*np.cosh((bx-v1)/c) - c*np.cosh((0-v1)/c) - (H-10)
-    v1 = root_scalar(solve_for_v1, x0 = 10, method = "newton").root
-    
-    v2 = 10 - c*np.cosh((0-v1)/c)
+    sol = atlas_catenary(L, H, w, span = bx)   # Interpolated from the precomputed atlas within 1 mm
+    c, v1, v2, x_turn, max_sag, To = (float(v) for v in sol[:6])
         
     cable = lambda x: c*np.cosh((x-v1)/c) + v2
     
-    solve_for_turning = lambda x: np.sinh((x-v1)/c)
-    x_turn = root_scalar(solve_for_turning, x0 = 10, method = "newton").root
-    
     straight_line = lambda x: (H-10)*x/bx + 10
-    max_sag = np.abs(straight_line(x_turn) - cable(x_turn))
-    
-    To = w*c
     
     #------------------------------------------------------------------------------------------
     # Draw Supports & line:
-    fig1.add_trace(go.Scatter(x = [0], y = [10-1], mode = "markers", marker_color = "black", 
-                              marker_symbol = "triangle-up", hoverinfo = "skip",
-                              marker_size = 20, showlegend = False,
-                              )
-    )
-    fig1.add_trace(go.Scatter(x = [bx], y = [H-1], mode = "markers", marker_color = "black", 
-                              marker_symbol = "triangle-up", hoverinfo = "skip",
-                              marker_size = 20, showlegend = False,
-                              )
-    )
+    Draw_Supports(fig1, [[0, 10], [bx, H]])
     fig1.add_trace(go.Scatter(x = [0, bx], y = [10, H], mode = "lines", line_color = "gray", 
                               hoverinfo = "skip", showlegend = False,
                               )
@@ -202,7 +171,7 @@ def Draw_Cable(w, L, H):
     
     #------------------------------------------------------------------------------------------
     # Draw Cable:
-    x1 = np.linspace(0, bx, 500)
+    x1 = np.linspace(0, bx, PREVIEW_POINTS if preview else POINTS)
     fig1.add_trace(go.Scatter(x = x1, y = cable(x1), mode = "lines", line_color = "blue",
                               marker_size = 20, showlegend = True, name = "Cable",
                               hovertemplate='(%{x:.2f}, %{y:.2f})',
@@ -245,10 +214,8 @@ def Draw_Cable(w, L, H):
     
     #------------------------------------------------------------------------------------------
     # Update layout:
+    Cable_Layout(fig1, bx, min(0, ysag))
     fig1.update_layout(
-        plot_bgcolor = "white",
-        template = "simple_white",
-        autosize = True,
         annotations = [go.layout.Annotation(
             dict(x=x_turn+2, y=0.5*(straight_line(x_turn) + cable(x_turn)), xref="x", yref="y",
                 text=f"h = {max_sag:.2f} m", showarrow=False,
@@ -258,23 +225,217 @@ def Draw_Cable(w, L, H):
         )],
 
     )
-    fig1.update_xaxes(
+    
+    if preview:
+        fig1.update_layout(annotations = [])
+    # end if
+    
+    
+    return fig1, results, (x1, To*np.cosh((x1-v1)/c), [0, bx])
+# end def Single_Span()
+
+
+
+
+########################################################################################################
+# Cable over several supports or carrying hanger loads:
+
+def Cable_System(w, L, H, system, preview):
+    
+    fig1 = go.Figure()
+    
+    
+    #------------------------------------------------------------------------------------------
+    # Calculations:
+    
+    if system == "spans":
+        supports = [[0, 10], [20, H], [40, 10]]
+        lengths  = [L, L]
+        loads    = []
+    else:
+        supports = [[0, 10], [20, H]]
+        lengths  = [L]
+        loads    = [CableLoad(0, L*k/(HANGERS + 1), HANGER_LOAD) for k in range(1, HANGERS + 1)]
+    # end if else
+    
+    net = solve_network(supports, lengths, w, loads)
+    
+    per_segment  = max(2, (PREVIEW_POINTS if preview else POINTS)//len(net.length))
+    x1, y1, T1   = network_curve(net, per_segment)
+    
+    #------------------------------------------------------------------------------------------
+    # Draw Supports & Cable:
+    Draw_Supports(fig1, supports)
+    fig1.add_trace(go.Scatter(x = x1, y = y1, mode = "lines", line_color = "blue",
+                              showlegend = True, name = "Cable", customdata = T1,
+                              hovertemplate='(%{x:.2f}, %{y:.2f})<br>T = %{customdata:.2f} kN',
+                              )
+    )
+    
+    #------------------------------------------------------------------------------------------
+    # Draw Hangers:
+    if loads:
+        hangers = net.nodes[1:-1]
+        fig1.add_trace(go.Scatter(x = hangers[:, 0], y = hangers[:, 1] - 0.6, mode = "markers",
+                                  marker_color = "red", marker_symbol = "arrow-down", marker_size = 12,
+                                  showlegend = True, name = f"Hangers, {HANGER_LOAD} kN",
+                                  hovertemplate='(%{x:.2f}, %{y:.2f})',
+                                  )
+        )
+    # end if
+    
+    #------------------------------------------------------------------------------------------
+    # results:
+    
+    results = []
+    for k in range(len(lengths)):
+        on_span = net.span == k
+        results += [
+            html.B(f"Span {k + 1}"), html.Br(),
+            "T", html.Sub("o"), f" = {net.H[on_span][0]:.2f} kN", html.Br(),
+            "T", html.Sub("max"), f" = {net.T[on_span].max():.2f} kN", html.Br(),
+        ]
+    # end for k
+    
+    #------------------------------------------------------------------------------------------
+    # Update layout:
+    Cable_Layout(fig1, supports[-1][0], y1.min())
+    
+    
+    return fig1, results, (x1, T1, [s[0] for s in supports])
+# end def Cable_System()
+
+
+
+
+########################################################################################################
+# Elastic cable, stretched by its tension and the temperature change:
+
+def Elastic_Cable(w, L, H, EA, dT, preview):
+    
+    bx = 20
+    
+    fig1 = go.Figure()
+    
+    
+    #------------------------------------------------------------------------------------------
+    # Calculations:
+    
+    sol = solve_elastic(L, H, w, EA, dT, span = bx)
+    x1, y1, T1 = elastic_profile(sol, PREVIEW_POINTS if preview else POINTS)
+    
+    rigid = atlas_catenary(L, H, w, span = bx)
+    c, v1, v2 = (float(v) for v in rigid[:3])
+    
+    #------------------------------------------------------------------------------------------
+    # Draw Supports & Cables:
+    Draw_Supports(fig1, [[0, 10], [bx, H]])
+    
+    x0 = np.linspace(0, bx, PREVIEW_POINTS if preview else POINTS)
+    fig1.add_trace(go.Scatter(x = x0, y = c*np.cosh((x0-v1)/c) + v2, mode = "lines", 
+                              line = {"color": "gray", "dash": "dash"},
+                              showlegend = True, name = "Inextensible", hoverinfo = "skip",
+                              )
+    )
+    fig1.add_trace(go.Scatter(x = x1, y = y1, mode = "lines", line_color = "blue",
+                              showlegend = True, name = "Cable", customdata = T1,
+                              hovertemplate='(%{x:.2f}, %{y:.2f})<br>T = %{customdata:.2f} kN',
+                              )
+    )
+    
+    #------------------------------------------------------------------------------------------
+    # results:
+    
+    results = [
+        "T", html.Sub("o"), f" = {float(sol.To):.2f} kN", html.Br(),
+        "T", html.Sub("A"), f" = {float(sol.Ta):.2f} kN,  V", html.Sub("A"), f" = {float(sol.Va):.2f} kN", html.Br(),
+        "T", html.Sub("B"), f" = {float(sol.Tb):.2f} kN,  V", html.Sub("B"), f" = {float(sol.Vb):.2f} kN", html.Br(),
+        f"Thermal elongation = {1e3*(float(sol.L0) - L):.1f} mm", html.Br(),
+        f"Elastic stretch = {1e3*float(sol.stretch):.1f} mm", html.Br(),
+    ]
+    
+    #------------------------------------------------------------------------------------------
+    # Update layout:
+    Cable_Layout(fig1, bx, y1.min())
+    
+    
+    return fig1, results, (x1, T1, [0, bx])
+# end def Elastic_Cable()
+
+
+
+
+########################################################################################################
+# Figure helpers:
+
+def Draw_Supports(fig, supports):
+    
+    for x, y in supports:
+        fig.add_trace(go.Scatter(x = [x], y = [y-1], mode = "markers", marker_color = "black", 
+                                 marker_symbol = "triangle-up", hoverinfo = "skip",
+                                 marker_size = 20, showlegend = False,
+                                 )
+        )
+    # end for x
+# end def Draw_Supports()
+
+
+def Cable_Layout(fig, bx, ymin):
+    
+    fig.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        autosize = True,
+    )
+    fig.update_xaxes(
         title = "x [m]",
         title_font = {"family": "Arial Black"},
         zeroline = False,
         range = [0-2, bx+2],
     )
-    fig1.update_yaxes(
+    fig.update_yaxes(
         title = "y [m]",
         title_font = {"family": "Arial Black"},
         zeroline = False,
-        range = [0-2, 20+2],
+        range = [min(0, ymin)-2, 20+2],
     )
+# end def Cable_Layout()
+
+
+def Tension_Graph(x, T, supports):
     
+    fig = go.Figure()
     
+    fig.add_trace(go.Scatter(x = x, y = T, mode = "lines", line_color = "firebrick",
+                             showlegend = False, name = "Tension",
+                             hovertemplate='x = %{x:.2f} m<br>T = %{y:.2f} kN',
+                             )
+    )
+    fig.add_trace(go.Scatter(x = supports, y = np.interp(supports, x, T), mode = "markers",
+                             marker_color = "black", marker_symbol = "triangle-up", marker_size = 12,
+                             showlegend = False, hoverinfo = "skip",
+                             )
+    )
     
-    return fig1, results
-# end def Draw_Cable()
+    fig.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        autosize = True,
+        height = 300,
+    )
+    fig.update_xaxes(
+        title = "x [m]",
+        title_font = {"family": "Arial Black"},
+        range = [0-2, supports[-1]+2],
+    )
+    fig.update_yaxes(
+        title = "Tension [kN]",
+        title_font = {"family": "Arial Black"},
+        rangemode = "tozero",
+    )
+    
+    return fig
+# end def Tension_Graph()
 
 
 
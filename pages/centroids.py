@@ -2,108 +2,39 @@ import dash
 from dash import dcc, html, callback, Output, Input
 import dash_bootstrap_components as dbc
 
-from shapely.geometry import Point, Polygon
 import numpy as np, plotly.graph_objects as go
 
-dash.register_page(__name__, name = "Centroids", path = "/centroids")
-
-
-
+from utils.rendering import render
+from utils.preview import drag_store, preview_values
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_rows
+from utils.geometry import sector, outline
 
+dash.register_page(__name__, name = "Centroids", path = "/centroids")
 
-########################################################################################################
-# FUNCTION - SECTOR()
-
-def sector(center, start_angle, end_angle, radius=1, steps=500):
-    
-    def polar_point(origin_point, angle,  distance):
-        return [origin_point.x + np.cos(np.radians(angle)) * distance, 
-                origin_point.y + np.sin(np.radians(angle)) * distance]
-
-    if start_angle > end_angle:
-        start_angle = start_angle - 360
-    else:
-        pass
-    # end if else
-    
-    step_angle_width = (end_angle-start_angle) / steps
-    sector_width     = (end_angle-start_angle) 
-    segment_vertices = []
+STEPS, PREVIEW_STEPS = 500, 36   # Arc segments per sector after release / while dragging.
+MEMO_SIZE = 40                   # Responses remembered per callback in the browser, 0 disables.
 
-    segment_vertices.append(polar_point(center, 0,0))
-    segment_vertices.append(polar_point(center, start_angle,radius))
 
-    for z in np.arange(1, steps):
-        segment_vertices.append((polar_point(center, start_angle + z * step_angle_width, radius)))
-    # end for z
-    
-    segment_vertices.append(polar_point(center, start_angle+sector_width,radius))
-    segment_vertices.append(polar_point(center, 0,0))
-    
-    return Polygon(segment_vertices)
 
-# end def sector()
 
 
 ########################################################################################################
 # LAYOUT:
 
+SLIDERS = [
+    SliderSpec("SA-slider", "Starting Angle [deg]: ",  0, 180, 45, 0),
+    SliderSpec("EA-slider", "Ending Angle [deg]: ",   45, 360, 45, 45),
+]
+
+
 layout = dbc.Container([
 
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 1: Label & Slider - Starting angle
+    # ROWS 1-2: Labels & Sliders
     
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Starting Angle [deg]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(0, 180, 45, value = 0, id = "SA-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(0, 180+1, 45)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-1"
-    ),
-
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 2: Label & Slider - Ending Angle
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Ending Angle [deg]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(45, 360, 45, value = 45, id = "EA-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(45, 360+1, 45)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-3"
-    ),
+    *slider_rows(SLIDERS),
     
     
     #-------------------------------------------------------------------------------------------------------
@@ -128,6 +59,10 @@ layout = dbc.Container([
 
     ], align = "center", justify = "center"
     ),
+    
+    drag_store("centroids-drag", ["SA-slider", "EA-slider"]),
+    
+    memo_stores("centroids"),
 
 
 
@@ -140,12 +75,7 @@ layout = dbc.Container([
 ########################################################################################################
 # LINE CENTROID:
 
-@callback(
-    Output("line-centroid-graph", "figure"),
-    Input("SA-slider", "value"),
-    Input("EA-slider", "value")
-)
-def Line_Centroid_Graph(SA, EA):
+def Line_Centroid_Graph(SA, EA, sec, preview):
     
     fig1 = go.Figure()
     
@@ -158,10 +88,9 @@ def Line_Centroid_Graph(SA, EA):
     #----------------------------------------------------------------------------------------------------
     ## Draw circle:
     
-    sec = sector(Point(0, 0), SA, EA)
-    x1, y1 = sec.exterior.xy
+    x1, y1 = outline([sec.exterior])   # The arc: the ring without the centre at both ends
 
-    fig1.add_trace(go.Scatter(x = np.array(x1)[1:-2], y = np.array(y1)[1:-2],  mode = "lines", 
+    fig1.add_trace(go.Scatter(x = x1[1:-1], y = y1[1:-1],  mode = "lines", 
                               line_color = "black", showlegend = False,
                               name = " ",
                               hovertemplate='(%{x:.2f}, %{y:.2f})',
@@ -215,6 +144,10 @@ def Line_Centroid_Graph(SA, EA):
         zeroline = True,
     )
     
+    if preview:
+        fig1.update_layout(annotations = [])
+    # end if
+    
     return fig1
 
 
@@ -226,12 +159,7 @@ def Line_Centroid_Graph(SA, EA):
 ########################################################################################################
 # AREA CENTROID:
 
-@callback(
-    Output("area-centroid-graph", "figure"),
-    Input("SA-slider", "value"),
-    Input("EA-slider", "value")
-)
-def Area_Centroid_Graph(SA, EA):
+def Area_Centroid_Graph(SA, EA, sec, preview):
     
     fig2 = go.Figure()
     
@@ -245,10 +173,9 @@ def Area_Centroid_Graph(SA, EA):
     #----------------------------------------------------------------------------------------------------
     ## Draw circle:
     
-    sec = sector(Point(0, 0), SA, EA)
-    x1, y1 = sec.exterior.xy
+    x1, y1 = outline([sec])
 
-    fig2.add_trace(go.Scatter(x = np.array(x1), y = np.array(y1),  mode = "lines", fill = "toself",
+    fig2.add_trace(go.Scatter(x = x1, y = y1,  mode = "lines", fill = "toself",
                               line_color = "#b4b4b4", hoverinfo = "skip",
                               showlegend = False, name = " "))
     
@@ -299,4 +226,48 @@ def Area_Centroid_Graph(SA, EA):
         zeroline = True,
     )
     
-    return fig2
\ No newline at end of file
+    if preview:
+        fig2.update_layout(annotations = [])
+    # end if
+    
+    return fig2
+
+
+
+
+
+########################################################################################################
+# UPDATE PAGE:
+#
+# One round trip per slider change: the sector is built once and drawn by both graphs.
+
+@memo_callback(
+    "centroids",
+    [Output("line-centroid-graph", "figure"),
+     Output("area-centroid-graph", "figure")],
+    [Input("SA-slider", "value"),
+     Input("EA-slider", "value"),
+     Input("render-mode", "value"),
+     Input("client-hints", "data"),
+     Input("centroids-drag", "data")],
+    max_entries = MEMO_SIZE,
+    preview = "centroids-drag",
+)
+def Update_Centroids(SA, EA, mode, hints, drag):
+    
+    (SA, EA), preview = preview_values("centroids-drag", [SA, EA], drag)
+    
+    sec = sector((0, 0), SA, EA, steps = PREVIEW_STEPS if preview else STEPS) if SA < EA else None
+    
+    fig1 = Line_Centroid_Graph(SA, EA, sec, preview)
+    fig2 = Area_Centroid_Graph(SA, EA, sec, preview)
+    
+    return render(fig1, mode, hints), render(fig2, mode, hints)
+
+# end def Update_Centroids()
+
+
+
+
+
+########################################################################################################
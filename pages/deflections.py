@@ -1,81 +1,122 @@
 import dash, numpy as np, plotly.graph_objects as go, matplotlib.pyplot as plt
-from dash import html, dcc, Input, Output, callback
+from functools import lru_cache
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
+from plotly.subplots import make_subplots
 
 from shapely.geometry import Point, LineString, Polygon
-from shapely.affinity import rotate
-from shapely import centroid
+from shapely import centroid, contains_xy
+
+from utils.preview import drag_store, preview_values
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_rows, slider_values
+from utils.sections import rotated_inertia
+from utils.mohr import mohr, inertia_tensor, circle_points
+from utils.beams import Support, Load, solve_beam, influence_matrix
+from utils.thinwalled import midline, thin_walled_properties, shear_flow
+from utils.geometry import make_scene, rotate_scene, group, outline, affine, transform
+from utils import catalog
 
 dash.register_page(__name__, name = "Deflections", path = "/deflections")
 
 ########################################################################################################
+# SECTIONS:
+#
+# Sections come from the bundled steel catalog (utils/catalog.py). The default is the 250 x 75 mm
+# lipped channel with 20 mm lips and 2.5 mm walls from assets/channel.jpg.
+
+DEFAULT_SECTION = "LC 250x75x20x2.5"
+
+SECTIONS = catalog.designations()
+
+########################################################################################################
+# BEAMS:
+
+BEAM_LENGTH = 5e3   # mm
+BEAM_LOAD   = 5e3   # N
 
-Ix, Iy = 759_071, 9_941_055
-O, R   = 5_350_063, 4_590_992
+BEAMS = {
+    "Simply supported":   [Support(0, "pin"),   Support(BEAM_LENGTH, "roller")],
+    "Fixed ends":         [Support(0, "fixed"), Support(BEAM_LENGTH, "fixed")],
+    "Propped cantilever": [Support(0, "fixed"), Support(BEAM_LENGTH, "roller")],
+    "Cantilever":         [Support(0, "fixed")],
+    "Two spans":          [Support(0, "pin"),   Support(0.75*BEAM_LENGTH, "roller"), Support(BEAM_LENGTH, "roller")],
+}
+
+SUPPORT_SYMBOLS = {"pin": "triangle-up", "roller": "circle", "fixed": "square"}
+
+LOAD_MODES    = {"midspan": "Load at midspan", "moving": "Moving load"}
+SECTION_MODES = {"outline": "Section", "stress": "Bending stress", "shear": "Shear flow"}
 
 ########################################################################################################
 
+CIRCLE_POINTS, PREVIEW_CIRCLE_POINTS = 500, 60   # Points per Mohr half-circle after release / while dragging.
+BEAM_ELEMENTS, PREVIEW_BEAM_ELEMENTS = 200, 30   # Beam finite elements after release / while dragging.
+LOAD_FRAMES,   PREVIEW_LOAD_FRAMES   = 51,  11   # Animation frames of the moving load.
+STRESS_CELLS,  PREVIEW_STRESS_CELLS  = 300, 80   # Stress raster cells across the section.
+
+SWEEP_INTERVAL = 150   # ms between the frames of the angle sweep.
+
+DESIGN_ANGLES = np.arange(0, 91, 1)   # Angle grid of the design space [deg], includes every slider angle.
+
+MEMO_SIZE = 32   # Responses remembered per callback in the browser, 0 disables.
+
+########################################################################################################
+
+
+SLIDERS = [
+    SliderSpec("E-slider",     "Choose E [GPa]: ",        100, 200, 10, 100),
+    SliderSpec("angle-slider", "Choose Angle [degrees]: ",  0,  90,  5, 0),
+]
+
 
 layout = dbc.Container([
 
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 1: Label & Slider - E-value
+    # ROWS 1-2: Labels & Sliders
+    
+    *slider_rows(SLIDERS),
+    
+    #-------------------------------------------------------------------------------------------------------
+    # ROW 3: Labels & Dropdowns - Section & Supports
     
     dbc.Row([
 
         dbc.Col(
 
-            html.Div(html.Label("Choose E [GPa]: ", style = {"color": "black"})),
+            html.Div(html.Label("Choose Section: ", style = {"color": "black"})),
             xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
 
         ),
 
         dbc.Col(
 
-            dcc.Slider(100, 200, 10, value = 100, id = "E-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(100, 200+1, 10)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-1"
-    ),
+            dcc.Dropdown(SECTIONS, DEFAULT_SECTION, id = "section-dropdown", clearable = False),
+            xs = 12, sm = 12, md = 12, lg = 4, xl = 4, xxl = 4
 
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 2: Label & Slider - Angle
-    
-    dbc.Row([
+        ),
 
         dbc.Col(
 
-            html.Div(html.Label("Choose Angle [degrees]: ", style = {"color": "black"})),
+            html.Div(html.Label("Choose Supports: ", style = {"color": "black"})),
             xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
 
         ),
 
         dbc.Col(
 
-            dcc.Slider(0, 90, 5, value = 0, id = "angle-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(0, 90+1, 5)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
+            dcc.Dropdown(list(BEAMS), "Simply supported", id = "beam-dropdown", clearable = False),
+            xs = 12, sm = 12, md = 12, lg = 4, xl = 4, xxl = 4
 
-        )
+        ),
 
     ], className = "mt-3"
     ),
     
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 3: Graphs
+    # ROW 4: Graphs
     
     dbc.Row([
         
@@ -89,6 +130,14 @@ layout = dbc.Container([
                 
         dbc.Col([
 
+            dbc.Button("Play angle sweep", id = "sweep-play", size = "sm", color = "secondary",
+                       className = "mb-1"),
+            dbc.RadioItems(
+                id = "channel-mode",
+                options = [{"label": label, "value": mode} for mode, label in SECTION_MODES.items()],
+                value = "outline",
+                inline = True,
+            ),
             dcc.Graph(id = "channel-graph"),
             
         ], xs = 12, sm = 12, md = 6, lg = 6, xl = 3, xxl = 3, className = "mt-3"
@@ -96,6 +145,12 @@ layout = dbc.Container([
         
         dbc.Col([
 
+            dbc.RadioItems(
+                id = "beam-load-mode",
+                options = [{"label": label, "value": mode} for mode, label in LOAD_MODES.items()],
+                value = "midspan",
+                inline = True,
+            ),
             html.Div(dcc.Graph(id = "beam-deflection-graph", style = {"height": "60vh"})),
             
         ], xs = 12, sm = 12, md = 12, lg = 12, xl = 6, xxl = 6, className = "mt-3"
@@ -104,6 +159,29 @@ layout = dbc.Container([
 
     ], align = "center", justify = "center"
     ),
+    
+    
+    #-------------------------------------------------------------------------------------------------------
+    # ROW 5: Design space
+    
+    dbc.Row([
+        
+        dbc.Col([
+
+            dcc.Graph(id = "design-space-graph", style = {"height": "45vh"}),
+            
+        ], xs = 12, sm = 12, md = 12, lg = 12, xl = 8, xxl = 8, className = "mt-3"
+        ),
+        
+    ], align = "center", justify = "center"
+    ),
+    
+    drag_store("deflections-drag", ["angle-slider", "E-slider"]),
+    
+    memo_stores("deflections"),
+    
+    dcc.Store(id = "deflections-sweep"),
+    dcc.Interval(id = "sweep-interval", interval = SWEEP_INTERVAL, disabled = True),
 
 
 
@@ -111,30 +189,44 @@ layout = dbc.Container([
 
 
 ########################################################################################################
-# MOHR CIRCLE GRAPH:
+# PRINCIPAL MOMENTS OF INERTIA:
 
-@callback(
-    Output("mohr-circle-graph", "figure"),
-    Output("results", "children"),
-    Input("angle-slider", "value")
-)
-def Mohr_Circle_Graph(angle):
-    
-    fig1 = go.Figure()
-    
-    a  = 2*R*np.cos(np.radians(angle))
-    b  = a*np.cos(np.radians(angle))
+def Rotated_Inertia(props, angle):
+    """
+    Moments of inertia of the section as drawn, shared by all the graphs of the page. Drawn_Section()
+    turns the section anticlockwise by angle, so about the fixed horizontal (u) and vertical (v) axes
+    the section has the inertia of axes turned clockwise by angle: rotated_inertia(props, -angle).
+
+    Args:
+        props (SectionProperties):  Properties of the selected section.
+        angle (float):              Rotation of the section [deg], scalar or array.
+
+    Returns:
+        tuple: Iu, Iv, Iuv [mm^4], floats for a scalar angle, arrays over the angles otherwise.
+    """
     
-    Iu = Iy - b
+    Iu, Iv, Iuv = rotated_inertia(props, -np.asarray(angle, dtype = float))
     
-    a  = 2*R*np.sin(np.radians(angle))
-    b  = a*np.sin(np.radians(angle))
+    if np.ndim(angle) == 0:
+        return Iu[0], Iv[0], Iuv[0]
+    # end if
     
-    Iv = Iy - b
+    return Iu, Iv, Iuv
 
+# end def Rotated_Inertia()
 
-    x = np.linspace(Ix, Iy, 500)
-    y1 = np.sqrt((R**2) - (x - O)**2)
+
+########################################################################################################
+# MOHR CIRCLE GRAPH:
+
+def Mohr_Circle_Graph(props, Iu, Iv, Iuv, preview):
+    
+    fig1 = go.Figure()
+    
+    state = mohr(inertia_tensor(props.Ix[0], props.Iy[0], props.Ixy[0]))
+    O, R  = state.centres[0], state.radii[0]
+    
+    x, y1 = circle_points(O, R, PREVIEW_CIRCLE_POINTS if preview else CIRCLE_POINTS, half = True)
     
     fig1.add_trace(go.Scatter(x = x, y = y1,  mode = "lines", line_color = "black", showlegend = False,
                               name = "Mohr Circle",
@@ -149,11 +241,11 @@ def Mohr_Circle_Graph(angle):
     
     # Point 1:
     x1 = Iu
-    y1 = -1*np.sqrt((R**2) - (x1 - O)**2)
+    y1 = Iuv
     
     # Point 2:
     x2 = Iv
-    y2 = np.sqrt((R**2) - (x2 - O)**2)
+    y2 = -Iuv
     
     fig1.add_trace(go.Scatter(x = [x1, x2], y = [y1, y2], mode = "lines+markers", line_color = "red", 
                               showlegend = False, name = "(Ix/Iy, Ixy)",
@@ -175,10 +267,10 @@ def Mohr_Circle_Graph(angle):
         autosize = True
     )
     fig1.update_xaxes(
-        range = [0, 10e6],
+        range = [0, 1.1*(O + R)],
     )
     fig1.update_yaxes(
-        range = [-5e6 - Ix/2, 5e6 + Ix/2],
+        range = [-0.55*(O + R), 0.55*(O + R)],
         scaleanchor = "x",
         scaleratio = 1,
         zeroline = True,
@@ -198,42 +290,80 @@ def Mohr_Circle_Graph(angle):
 ########################################################################################################
 # ROTATE CHANNEL:
 
-@callback(
-    Output("channel-graph", "figure"),
-    Input("angle-slider", "value")
-)
-def Rotate_Graph(angle):
-        
-    fig2 = go.Figure()
+@lru_cache(maxsize = 64)
+def Drawn_Section(designation, angle):
+    """
+    Section as drawn: scaled so its largest dimension is 250 units, centred on (150, 150) and rotated.
+
+    Args:
+        designation (str):  Catalog section.
+        angle (float):      Rotation [deg].
+
+    Returns:
+        tuple: Rotated Polygon and the scale from mm to drawing units.
+    """
     
-    #--------------------------------------------------------------------------
-    # Draw channel:
+    section = catalog.polygon(designation)
+    x0, y0, x1, y1 = section.bounds
+    k = 250/max(x1 - x0, y1 - y0)
     
-    t = 5
+    # One affine map: scale about the centroid, move it to (150, 150) and rotate.
+    c = centroid(section)
     
-    channel = Polygon([[25, 100], [25, 175], [275, 175], [275, 100], [255, 100], [255, 100+t],
-                       [275-t, 100+t], [275-t, 175-t], [25+t, 175-t], [25+t, 100+t], [45, 100+t], [45, 100]])
-    c_x, c_y = centroid(channel).xy
+    return transform(section, *affine(angle, (c.x, c.y), k, (150 - c.x, 150 - c.y)))[()], k
+
+# end def Drawn_Section()
+
+
+def Section_Traces(section, fill):
     
-    line = LineString([[0, c_y[0]], [300, c_y[0]]])
+    # Two traces whatever the number of holes: the outline and all holes, NaN-separated.
+    (outx, outy), (holex, holey) = Section_Rings(section)
     
+    return [
+        go.Scatter(x = outx, y = outy, 
+                   mode = "lines", fill = "toself" if fill else None, hoverinfo = "skip",
+                   line_color = "black", fillcolor = "black", showlegend = False, name = " ",
+                   ),
+        go.Scatter(x = holex, y = holey, 
+                   mode = "lines", fill = "toself" if fill else None, hoverinfo = "skip",
+                   line_color = "black", fillcolor = "white", showlegend = False, name = " ",
+                   ),
+    ]
+
+
+def Section_Rings(section):
     
+    return outline([section.exterior]), outline(list(section.interiors))
+
+
+@lru_cache(maxsize = 64)
+def Section_Scene(designation):
     
-    channelx, channely = rotate(channel, angle, (c_x[0], c_y[0])).exterior.xy
-    fig2.add_trace(go.Scatter(x = np.array(channelx), y = np.array(channely),  
-                              mode = "lines", fill = "toself", hoverinfo = "skip", line_color = "black",
-                              fillcolor = "black", showlegend = False, name = " ",
-                              )
-    )
+    # Unrotated section and its horizontal axis, rotated together by rotate_scene():
+    return make_scene(section = [Drawn_Section(designation, 0)[0]], axis = [LineString([[0, 150], [300, 150]])])
+
+
+@lru_cache(maxsize = 64)
+def Rotate_Graph(designation, angle):
+        
+    fig2 = go.Figure()
+    
+    #--------------------------------------------------------------------------
+    # Draw section:
+    
+    scene = rotate_scene(Section_Scene(designation), angle, (150, 150))
+    
+    fig2.add_traces(Section_Traces(group(scene, "section")[0], fill = True))
     
-    fig2.add_trace(go.Scatter(x = [0, 300], y = [c_y[0], c_y[0]], 
+    fig2.add_trace(go.Scatter(x = [0, 300], y = [150, 150], 
                               mode = "lines", line_color = "black", 
                               showlegend = False,  hoverinfo = "skip",
                               )
     )
     
-    linex, liney = rotate(line, angle, (c_x[0], c_y[0])).xy
-    fig2.add_trace(go.Scatter(x = np.array(linex), y = np.array(liney), 
+    linex, liney = outline(group(scene, "axis"))
+    fig2.add_trace(go.Scatter(x = linex, y = liney, 
                               mode = "lines", line_color = "red", 
                               showlegend = False,  hoverinfo = "skip",
                               )
@@ -270,63 +400,289 @@ def Rotate_Graph(angle):
 
 
 
+########################################################################################################
+# BENDING STRESS:
+#
+# Normal stress of unsymmetric bending on a raster of the drawn section. The raster and its mask
+# (shapely.contains_xy over all cells at once) depend only on the section and angle and are cached;
+# a request only evaluates the linear stress field. The moment acts about the horizontal axis of
+# the drawing, so the rotated section's own Ix, Iy and Ixy are used:
+#
+#   σ = M (Ixy x - Iy y)/(Ix Iy - Ixy²),  x, y from the centroid, sagging M positive.
+
+@lru_cache(maxsize = 64)
+def Design_Actions(beam):
+    
+    # With a uniform EI the internal forces do not depend on EI, so one solve per layout is enough:
+    result = solve_beam(BEAM_LENGTH, 1.0, BEAMS[beam], [Load("point", BEAM_LENGTH/2, BEAM_LOAD)])
+    
+    M = result.moment[np.argmax(np.abs(result.moment))]
+    V = result.shear[np.argmax(np.abs(result.shear))]
+    
+    return M, V
+
+
+@lru_cache(maxsize = 64)
+def Stress_Raster(designation, angle, cells):
+    
+    section, k     = Drawn_Section(designation, angle)
+    x0, y0, x1, y1 = section.bounds
+    d              = max(x1 - x0, y1 - y0)/cells
+    
+    xs = np.arange(x0 + d/2, x1, d)
+    ys = np.arange(y0 + d/2, y1, d)
+    X, Y = np.meshgrid(xs, ys)
+    
+    mask = contains_xy(section, X, Y)
+    
+    # Cell centres in mm from the centroid:
+    return xs, ys, (X - 150)/k, (Y - 150)/k, mask
+
+
+def Stress_Graph(designation, props, angle, beam, preview):
+    
+    M, _ = Design_Actions(beam)
+    
+    Ix, Iy, Ixy = Rotated_Inertia(props, angle)   # Of the section rotated by angle
+    stress      = lambda x, y: M*(Ixy*x - Iy*y)/(Ix*Iy - Ixy**2)
+    
+    xs, ys, X, Y, mask = Stress_Raster(designation, angle, PREVIEW_STRESS_CELLS if preview else STRESS_CELLS)
+    sigma = np.where(mask, np.round(stress(X, Y), 1), np.nan)
+    
+    # The field is linear, so its extremes are at vertices of the outline:
+    section, k = Drawn_Section(designation, angle)
+    vx, vy     = (np.array(v) for v in section.exterior.xy)
+    sv         = stress((vx - 150)/k, (vy - 150)/k)
+    it, ic     = np.argmax(sv), np.argmin(sv)
+    
+    fig2 = go.Figure()
+    
+    fig2.add_trace(go.Heatmap(x = xs, y = ys, z = sigma, colorscale = "RdBu_r", zmid = 0,
+                              colorbar = dict(title = "σ [MPa]", thickness = 10),
+                              hovertemplate = "%{z:.1f} MPa<extra></extra>",
+                              )
+    )
+    fig2.add_traces(Section_Traces(section, fill = False))
+    
+    fig2.add_trace(go.Scatter(x = [vx[it], vx[ic]], y = [vy[it], vy[ic]], mode = "markers+text",
+                              marker_color = ["red", "blue"], marker_size = 10, showlegend = False,
+                              text = [f"{sv[it]:.1f} MPa", f"{sv[ic]:.1f} MPa"],
+                              textposition = ["top center", "bottom center"],
+                              hovertemplate = "%{text}<extra></extra>",
+                              )
+    )
+    
+    fig2.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=0, b=0),
+    )
+    fig2.update_xaxes(
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+        scaleanchor = "y",
+        scaleratio = 1,
+        range = [-50, 300]
+    )
+    fig2.update_yaxes(
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+        range = [-50, 300]
+    )
+    
+    if preview:
+        fig2.update_traces(text = None, selector = dict(mode = "markers+text"))
+    # end if
+    
+    return fig2
+
+
+
+
+
+########################################################################################################
+# SHEAR FLOW:
+#
+# Thin-walled model of the section (utils/thinwalled.py): shear flow of the largest shear force of the
+# beam, acting vertically through the shear centre, drawn across the mid-line of the rotated section.
+
+SHEAR_POINTS = 20   # Shear flow samples per wall segment.
+
+@lru_cache(maxsize = 64)
+def Thin_Walled(designation):
+    
+    model = midline(*catalog.dimensions(designation))
+    
+    return model, thin_walled_properties(model)
+
+
+def Shear_Flow_Graph(designation, props, angle, beam):
+    
+    _, V         = Design_Actions(beam)
+    model, thin  = Thin_Walled(designation)
+    section, k   = Drawn_Section(designation, angle)
+    
+    # Vertical shear in the axes of the section, which is rotated by angle:
+    Vx = V*np.sin(np.radians(angle))
+    Vy = V*np.cos(np.radians(angle))
+    
+    xy, q = shear_flow(model, thin, Vx, Vy, SHEAR_POINTS)
+    xy, q = xy[0], q[0]
+    
+    # Diagram offset across the wall, the largest flow drawn at 15% of the section size [mm]:
+    u = xy[:, -1] - xy[:, 0]
+    n = np.stack([-u[:, 1], u[:, 0]], axis = -1)/np.linalg.norm(u, axis = -1)[:, None]
+    w = xy + n[:, None]*q[..., None]*0.15*max(np.ptp(xy[..., 0]), np.ptp(xy[..., 1]))/np.abs(q).max()
+    
+    # To the drawing: centroid at (150, 150), scaled by k and rotated by angle
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    drawn = lambda p: np.stack([150 + k*(c*(p[..., 0] - props.cx[0]) - s*(p[..., 1] - props.cy[0])),
+                                150 + k*(s*(p[..., 0] - props.cx[0]) + c*(p[..., 1] - props.cy[0]))], axis = -1)
+    
+    xy, w = drawn(xy), drawn(w)
+    sc    = drawn(np.array([thin.xs[0], thin.ys[0]]))
+    
+    # One closed area per segment, separated by None:
+    area = np.concatenate([xy, w[:, ::-1], xy[:, :1], np.full((len(xy), 1, 2), None)], axis = 1).reshape(-1, 2)
+    
+    fig2 = go.Figure()
+    
+    fig2.add_traces(Section_Traces(section, fill = False))
+    
+    fig2.add_trace(go.Scatter(x = area[:, 0], y = area[:, 1], mode = "lines", fill = "toself",
+                              line_color = "blue", line_width = 1, fillcolor = "rgba(0, 0, 255, 0.3)",
+                              showlegend = False, hoverinfo = "skip",
+                              )
+    )
+    fig2.add_trace(go.Scatter(x = w[..., 0].ravel(), y = w[..., 1].ravel(), mode = "markers",
+                              marker_size = 4, marker_color = "blue", customdata = q.ravel(),
+                              showlegend = False, hovertemplate = "q = %{customdata:.2f} N/mm<extra></extra>",
+                              )
+    )
+    fig2.add_trace(go.Scatter(x = [sc[0], 150], y = [sc[1], 150], mode = "markers+text",
+                              marker_color = ["red", "black"], marker_size = 10,
+                              text = ["Shear centre", "Centroid"], textposition = "bottom center",
+                              showlegend = False, hoverinfo = "skip",
+                              )
+    )
+    
+    fig2.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=30, b=0),
+        title = dict(text = f"J = {thin.J[0]:.3e} mm⁴, Cw = {thin.Cw[0]:.3e} mm⁶", font_size = 12),
+    )
+    fig2.update_xaxes(
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+        scaleanchor = "y",
+        scaleratio = 1,
+        range = [-50, 300]
+    )
+    fig2.update_yaxes(
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+        range = [-50, 300]
+    )
+    
+    return fig2
+
+
+
+
+
 ########################################################################################################
 # BEAM DEFLECTION:
+#
+# The beam is solved with the finite element solver of utils/beams.py, so any of the support
+# layouts of BEAMS can carry the load. The vertical load bends the drawn section about both axes
+# unless Iuv = 0: with f the deflection for EI = 1, the vertical and sideways deflections are
+#
+#   v = f Iv/(Iu Iv - Iuv²),   u = -f Iuv/(Iu Iv - Iuv²)
+#
+# (as in the design space), and the graph shows both with their resultant.
 
-@callback(
-    Output("beam-deflection-graph", "figure"),
-    Input("angle-slider", "value"),
-    Input("E-slider", "value")
-)
-def Beam_Deflection(angle, E):
+def Deflection_Factors(Iu, Iv, Iuv):
+    """
+    Vertical and sideways deflection per unit deflection of a beam with EI = 1 [1/mm^4].
+    """
     
-    P = 5e3   # N
-    L = 5e3   # mm
-    E *= 1000 # MPa
+    D = Iu*Iv - Iuv**2
     
-    x1 = np.linspace(0, L/2, 100)
-    x2 = np.linspace(L/2, L, 100)
+    return Iv/D, -Iuv/D
+
+# end def Deflection_Factors()
+
+
+def Beam_Deflection(Iu, Iv, Iuv, E, beam, preview):
     
-    a  = 2*R*np.cos(np.radians(angle))
-    b  = a*np.cos(np.radians(angle))
+    P = BEAM_LOAD
+    L = BEAM_LENGTH
+    E *= 1000 # MPa
     
-    Iu = Iy - b
+    supports = BEAMS[beam]
+    result   = solve_beam(L, 1.0, supports, [Load("point", L/2, P)],
+                          elements = PREVIEW_BEAM_ELEMENTS if preview else BEAM_ELEMENTS)
     
-    defl1 = -P*x1*( (3*(L**2)) - (4*(x1**2)))/(48*E*Iu)
-    defl2 = defl1[::-1]
+    kv, ku    = Deflection_Factors(Iu, Iv, Iuv)
+    x, defl   = result.x, result.deflection*kv/E
+    side      = result.deflection*ku/E
+    resultant = -np.hypot(defl, side)            # Drawn downwards, with the vertical deflection
+    i_max     = np.argmax(np.abs(defl))
     
-    fig3 = go.Figure()
+    fig3 = make_subplots(rows = 2, cols = 1, shared_xaxes = True, row_heights = [0.65, 0.35],
+                         vertical_spacing = 0.05)
     
     # Deflections:
-    fig3.add_trace(go.Scatter(x = x1, y = defl1, mode = "lines", line_color = "blue", showlegend = False, 
+    fig3.add_trace(go.Scatter(x = x, y = defl, mode = "lines", line_color = "blue", showlegend = False, 
                               name = "Deflection",
                               hovertemplate='(%{x:.2f}, %{y:.2f})',
-                              )
+                              ), row = 1, col = 1
     )
-    fig3.add_trace(go.Scatter(x = x2, y = defl2, mode = "lines", line_color = "blue", showlegend = False,
-                              name = "Deflection",
-                              hovertemplate='(%{x:.2f}, %{y:.2f})',
-                              )
+    
+    # Bending moment:
+    fig3.add_trace(go.Scatter(x = x, y = result.moment/1e6, mode = "lines", line_color = "red",
+                              fill = "tozeroy", showlegend = False, name = "Bending Moment",
+                              hovertemplate='(%{x:.2f}, %{y:.2f} kNm)',
+                              ), row = 2, col = 1
     )
     
     # Supports:
-    fig3.add_trace(go.Scatter(x = [0], y = [-11], mode = "markers", marker_color = "black", 
-                              marker_symbol = "triangle-up", hoverinfo = "skip",
-                              marker_size = 20, showlegend = False,
-                              )
-    )
-    fig3.add_trace(go.Scatter(x = [5000], y = [-11], mode = "markers", marker_color = "black", 
-                              marker_symbol = "circle", hoverinfo = "skip",
+    lo, hi = min(-200, 1.2*resultant.min()), 50   # Flexible sections deflect off the default range.
+    
+    fig3.add_trace(go.Scatter(x = [s.x for s in supports], y = [-0.044*(hi - lo)]*len(supports),
+                              mode = "markers", marker_color = "black", 
+                              marker_symbol = [SUPPORT_SYMBOLS[s.kind] for s in supports], hoverinfo = "skip",
                               marker_size = 20, showlegend = False,
-                              )
+                              ), row = 1, col = 1
     )
     
     # Maximum Deflection: 
-    fig3.add_trace(go.Scatter(x = [x2[0]], y = [defl2[0]], mode = "markers+text", marker_color = "black", 
-                              text = f"{defl2[0]:.2f} mm", textposition="bottom center",
+    fig3.add_trace(go.Scatter(x = [x[i_max]], y = [defl[i_max]], mode = "markers+text", marker_color = "black", 
+                              text = f"{defl[i_max]:.2f} mm (resultant {-resultant[i_max]:.2f} mm)", textposition="bottom center",
                               showlegend = False, name = "Maximum Deflection",
                               hovertemplate='%{y:.2f} mm',
-                              )
+                              ), row = 1, col = 1
+    )
+    
+    # Sideways deflection and resultant, zero and equal to the vertical one for Iuv = 0:
+    fig3.add_trace(go.Scatter(x = x, y = side, mode = "lines", line_color = "green", line_dash = "dash",
+                              showlegend = False, name = "Sideways Deflection",
+                              hovertemplate='(%{x:.2f}, %{y:.2f})',
+                              ), row = 1, col = 1
+    )
+    fig3.add_trace(go.Scatter(x = x, y = resultant, mode = "lines", line_color = "grey", line_dash = "dot",
+                              showlegend = False, name = "Resultant Deflection",
+                              hovertemplate='(%{x:.2f}, %{y:.2f})',
+                              ), row = 1, col = 1
     )
     
     # Update Layout:
@@ -335,9 +691,9 @@ def Beam_Deflection(angle, E):
         template = "simple_white",
         autosize = True,
         annotations = [go.layout.Annotation(
-            dict(x=2500, y=0, xref="x", yref="y",
+            dict(x=L/2, y=0, xref="x", yref="y",
                 text="10 kN", showarrow=True,
-                axref="x", ayref='y', ax=2500, ay=50,
+                axref="x", ayref='y', ax=L/2, ay=hi,
                 arrowhead=1, arrowwidth=3, arrowcolor='red',
                 )
         )],
@@ -352,8 +708,20 @@ def Beam_Deflection(angle, E):
         title = "Deflection [mm]",
         title_font = {"family": "Arial Black"},
         showticklabels=True,
-        range = [-200, 50],
+        range = [lo, hi],
+        row = 1, col = 1,
     )
+    fig3.update_yaxes(
+        title = "Moment [kNm]",
+        title_font = {"family": "Arial Black"},
+        showticklabels=True,
+        autorange = "reversed",
+        row = 2, col = 1,
+    )
+    
+    if preview:
+        fig3.update_layout(annotations = [])
+    # end if
     
     
     return fig3
@@ -362,4 +730,386 @@ def Beam_Deflection(angle, E):
 
 
 
-########################################################################################################
\ No newline at end of file
+########################################################################################################
+# MOVING LOAD:
+#
+# Influence lines of the beam: the deflected shape for every load position comes out of one batched
+# solve. The matrix is computed once per support layout for EI = 1 and scaled by P/EI per request.
+
+@lru_cache(maxsize = 16)
+def Unit_Influence(beam, elements):
+    
+    return influence_matrix(BEAM_LENGTH, 1.0, BEAMS[beam], elements)
+
+
+def Moving_Load_Graph(Iu, Iv, Iuv, E, beam, preview):
+    
+    P = BEAM_LOAD
+    E *= 1000 # MPa
+    
+    supports = BEAMS[beam]
+    x, G     = Unit_Influence(beam, PREVIEW_BEAM_ELEMENTS if preview else BEAM_ELEMENTS)
+    G        = G*P*Deflection_Factors(Iu, Iv, Iuv)[0]/E   # Vertical deflection
+    
+    envelope = G.min(axis = 0)                                # Worst deflection at every point
+    j, i     = np.unravel_index(np.argmin(G), G.shape)       # Worst load position j, worst point i
+    
+    lo, hi = min(-200, 1.2*envelope.min()), 50
+    
+    frames = np.unique(np.linspace(0, len(x) - 1, PREVIEW_LOAD_FRAMES if preview else LOAD_FRAMES).astype(int))
+    
+    fig3 = make_subplots(rows = 2, cols = 1, shared_xaxes = True, row_heights = [0.65, 0.35],
+                         vertical_spacing = 0.05)
+    
+    # Deflected shape and load, animated:
+    fig3.add_trace(go.Scatter(x = x, y = G[j], mode = "lines", line_color = "blue", showlegend = False,
+                              name = "Deflection",
+                              hovertemplate='(%{x:.2f}, %{y:.2f})',
+                              ), row = 1, col = 1
+    )
+    fig3.add_trace(go.Scatter(x = [x[j]], y = [0.5*hi], mode = "markers", marker_color = "red",
+                              marker_symbol = "triangle-down", marker_size = 15, showlegend = False,
+                              name = "Load", hovertemplate='Load at %{x:.0f} mm',
+                              ), row = 1, col = 1
+    )
+    
+    # Envelope:
+    fig3.add_trace(go.Scatter(x = x, y = envelope, mode = "lines", line_color = "grey", line_dash = "dash",
+                              showlegend = False, name = "Envelope",
+                              hovertemplate='(%{x:.2f}, %{y:.2f})',
+                              ), row = 1, col = 1
+    )
+    
+    # Supports:
+    fig3.add_trace(go.Scatter(x = [s.x for s in supports], y = [-0.044*(hi - lo)]*len(supports),
+                              mode = "markers", marker_color = "black", 
+                              marker_symbol = [SUPPORT_SYMBOLS[s.kind] for s in supports], hoverinfo = "skip",
+                              marker_size = 20, showlegend = False,
+                              ), row = 1, col = 1
+    )
+    
+    # Maximum Deflection: 
+    fig3.add_trace(go.Scatter(x = [x[i]], y = [G[j, i]], mode = "markers+text", marker_color = "black", 
+                              text = f"{G[j, i]:.2f} mm (load at {x[j]:.0f} mm)", textposition="bottom center",
+                              showlegend = False, name = "Maximum Deflection",
+                              hovertemplate='%{y:.2f} mm',
+                              ), row = 1, col = 1
+    )
+    
+    # Influence line of the deflection at the worst point:
+    fig3.add_trace(go.Scatter(x = x, y = G[:, i], mode = "lines", line_color = "red", fill = "tozeroy",
+                              showlegend = False, name = f"Influence line at {x[i]:.0f} mm",
+                              hovertemplate='Load at %{x:.0f} mm: %{y:.2f} mm',
+                              ), row = 2, col = 1
+    )
+    
+    # Frames only carry what moves, rounded to 0.001 mm to keep the response small:
+    fig3.frames = [go.Frame(data = [go.Scatter(y = np.round(G[k], 3)), go.Scatter(x = [x[k]])],
+                            traces = [0, 1], name = str(k))
+                   for k in frames]
+    
+    # Update Layout:
+    fig3.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        autosize = True,
+        updatemenus = [dict(
+            type = "buttons", showactive = False, x = 0, y = 1.1, xanchor = "left",
+            buttons = [dict(label = "Play", method = "animate",
+                            args = [None, {"frame": {"duration": 80, "redraw": False}, "fromcurrent": True,
+                                           "transition": {"duration": 0}}])],
+        )],
+    )
+    fig3.update_xaxes(
+        showticklabels=False,
+        showgrid = False,
+        zeroline = False,
+        visible = False,
+    )
+    fig3.update_yaxes(
+        title = "Deflection [mm]",
+        title_font = {"family": "Arial Black"},
+        showticklabels=True,
+        range = [lo, hi],
+        row = 1, col = 1,
+    )
+    fig3.update_yaxes(
+        title = "Influence [mm]",
+        title_font = {"family": "Arial Black"},
+        showticklabels=True,
+        row = 2, col = 1,
+    )
+    
+    return fig3
+
+
+
+
+
+########################################################################################################
+# UPDATE PAGE:
+#
+# One round trip per input change: the section properties are read from the catalog and the rotated
+# moments of inertia are computed once, then passed to every graph of the page.
+
+@memo_callback(
+    "deflections",
+    [Output("mohr-circle-graph", "figure"),
+     Output("results", "children"),
+     Output("channel-graph", "figure"),
+     Output("beam-deflection-graph", "figure")],
+    [Input("angle-slider", "value"),
+     Input("E-slider", "value"),
+     Input("section-dropdown", "value"),
+     Input("beam-dropdown", "value"),
+     Input("beam-load-mode", "value"),
+     Input("channel-mode", "value"),
+     Input("deflections-drag", "data")],
+    max_entries = MEMO_SIZE,
+    preview = "deflections-drag",
+)
+def Update_Deflections(angle, E, designation, beam, load_mode, section_mode, drag):
+    
+    (angle, E), preview = preview_values("deflections-drag", [angle, E], drag)
+    
+    props       = catalog.properties(designation)
+    Iu, Iv, Iuv = Rotated_Inertia(props, angle)
+    
+    fig1, results = Mohr_Circle_Graph(props, Iu, Iv, Iuv, preview)
+    
+    if section_mode == "stress":
+        fig2 = Stress_Graph(designation, props, angle, beam, preview)
+    elif section_mode == "shear":
+        fig2 = Shear_Flow_Graph(designation, props, angle, beam)
+    else:
+        fig2 = Rotate_Graph(designation, angle)
+    # end if else
+    
+    if load_mode == "moving":
+        fig3 = Moving_Load_Graph(Iu, Iv, Iuv, E, beam, preview)
+    else:
+        fig3 = Beam_Deflection(Iu, Iv, Iuv, E, beam, preview)
+    # end if else
+    
+    return fig1, results, fig2, fig3
+
+# end def Update_Deflections()
+
+
+
+
+
+########################################################################################################
+# DESIGN SPACE:
+#
+# Biaxial deflection over the whole E x angle grid. The vertical load acts on the rotated section, so
+# with the rotated section's own Ix, Iy and Ixy the midspan deflection vector is
+#
+#   (u, v) = c P/(E (Ix Iy - Ixy²)) (Ixy, -Iy),   c = deflection of the beam for P = EI = 1,
+#
+# which also deflects sideways unless Ixy = 0. The grid is cached per section and supports; moving
+# a slider only moves the marker, in the browser.
+
+@lru_cache(maxsize = 64)
+def Biaxial_Grid(designation, beam):
+    """
+    Resultant deflection and its direction over every E and angle of the design space.
+
+    Args:
+        designation (str):  Catalog section.
+        beam (str):         Key of BEAMS.
+
+    Returns:
+        tuple: E values [GPa], angles [deg], resultant deflection (E, angle) [mm] and its direction
+               from the vertical (angle) [deg].
+    """
+    
+    props = catalog.properties(designation)
+    Es    = slider_values(SLIDERS[0]).astype(float)
+    
+    Ix, Iy, Ixy = Rotated_Inertia(props, DESIGN_ANGLES.astype(float))   # Of the rotated section
+    
+    c = np.abs(solve_beam(BEAM_LENGTH, 1.0, BEAMS[beam], [Load("point", BEAM_LENGTH/2, 1.0)],
+                          elements = BEAM_ELEMENTS).deflection).max()
+    
+    D         = Ix*Iy - Ixy**2
+    resultant = c*BEAM_LOAD*np.hypot(Ixy, Iy)/D/(Es[:, None]*1000)
+    direction = np.degrees(np.arctan2(Ixy, Iy))
+    
+    return Es, DESIGN_ANGLES, resultant, direction
+
+# end def Biaxial_Grid()
+
+
+def Design_Space_Graph(designation, beam, angle, E):
+    
+    Es, angles, resultant, direction = Biaxial_Grid(designation, beam)
+    
+    fig4 = go.Figure()
+    
+    fig4.add_trace(go.Heatmap(x = angles, y = Es, z = np.round(resultant, 3), colorscale = "Viridis",
+                              customdata = np.broadcast_to(np.round(direction, 1), resultant.shape),
+                              colorbar = dict(title = "δ [mm]", thickness = 10),
+                              hovertemplate = "%{x}°, E = %{y} GPa<br>δ = %{z:.2f} mm at %{customdata}° "
+                                              "from vertical<extra></extra>",
+                              )
+    )
+    fig4.add_trace(go.Scatter(x = [angle], y = [E], mode = "markers+text", marker_color = "red",
+                              marker_size = 12, marker_line_color = "white", marker_line_width = 2,
+                              text = [f"{resultant[Es == E, angles == angle][0]:.2f} mm"],
+                              textposition = "top center", textfont_color = "white",
+                              showlegend = False, hoverinfo = "skip",
+                              )
+    )
+    
+    fig4.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=30, b=0),
+        title = "Biaxial deflection",
+    )
+    fig4.update_xaxes(
+        title = "Angle [degrees]",
+        title_font = {"family": "Arial Black"},
+    )
+    fig4.update_yaxes(
+        title = "E [GPa]",
+        title_font = {"family": "Arial Black"},
+    )
+    
+    return fig4
+
+
+@callback(
+    Output("design-space-graph", "figure"),
+    Input("section-dropdown", "value"),
+    Input("beam-dropdown", "value"),
+    State("angle-slider", "value"),
+    State("E-slider", "value"),
+)
+def Update_Design_Space(designation, beam, angle, E):
+    
+    return Design_Space_Graph(designation, beam, angle, E)
+
+
+clientside_callback(
+    """
+    function(angle, E, figure) {
+        if (!figure) {
+            return window.dash_clientside.no_update;
+        }
+        const grid   = figure.data[0];
+        const z      = grid.z[grid.y.indexOf(E)][grid.x.indexOf(angle)];
+        const marker = {...figure.data[1], x: [angle], y: [E], text: [z.toFixed(2) + " mm"]};
+        return {...figure, data: [grid, marker]};
+    }
+    """,
+    Output("design-space-graph", "figure", allow_duplicate = True),
+    Input("angle-slider", "value"),
+    Input("E-slider", "value"),
+    State("design-space-graph", "figure"),
+    prevent_initial_call = True,
+)
+
+
+
+
+
+########################################################################################################
+# ANGLE SWEEP:
+#
+# "Play angle sweep" fetches one bundle with every angle of the slider and the browser animates it
+# locally (assets/sweep.js), patching the traces of the graphs on every tick of sweep-interval.
+# Bundles are cached per E, section, supports and modes in the server process, so they are shared
+# by all clients. A bundle holds, per graph, one list of trace patches per frame and optionally a
+# y-axis range that fits every frame.
+
+@lru_cache(maxsize = 64)
+def Sweep_Bundle(E, designation, beam, load_mode, section_mode):
+    
+    angles = slider_values(SLIDERS[1]).tolist()
+    
+    props       = catalog.properties(designation)
+    Iu, Iv, Iuv = Rotated_Inertia(props, np.array(angles, dtype = float))
+    
+    frames, yranges = {}, {}
+    
+    # Mohr circle, trace 2: the (Iu, Iuv) - (Iv, -Iuv) diameter
+    frames["mohr-circle-graph"] = [[{"i": 2, "x": [Iu[k], Iv[k]], "y": [Iuv[k], -Iuv[k]]}]
+                                   for k in range(len(angles))]
+    
+    # Section outline, trace 0, its holes, trace 1, and the rotated axis, trace 3:
+    if section_mode == "outline":
+        frames["channel-graph"] = []
+        for angle in angles:
+            scene = rotate_scene(Section_Scene(designation), angle, (150, 150))
+            rings = Section_Rings(group(scene, "section")[0])
+            linex, liney = outline(group(scene, "axis"))
+            frames["channel-graph"].append(
+                [{"i": i, "x": x.tolist(), "y": y.tolist()} for i, (x, y) in enumerate(rings)] +
+                [{"i": 3, "x": linex.tolist(), "y": liney.tolist()}]
+            )
+        # end for angle
+    # end if
+    
+    # Vertical deflection, trace 0, maximum deflection, trace 3, sideways deflection, trace 4, and the
+    # resultant, trace 5. Deflections scale with 1/EI, so the beam is solved once:
+    if load_mode == "midspan":
+        result = solve_beam(BEAM_LENGTH, 1.0, BEAMS[beam], [Load("point", BEAM_LENGTH/2, BEAM_LOAD)],
+                            elements = BEAM_ELEMENTS)
+        i_max  = int(np.argmax(np.abs(result.deflection)))
+        kv, ku = Deflection_Factors(Iu, Iv, Iuv)
+        defl   = np.outer(kv/(E*1000), result.deflection)
+        side   = np.outer(ku/(E*1000), result.deflection)
+        res    = -np.hypot(defl, side)
+        frames["beam-deflection-graph"] = [
+            [{"i": 0, "y": np.round(defl[k], 3).tolist()},
+             {"i": 3, "y": [defl[k, i_max]], "text": [f"{defl[k, i_max]:.2f} mm (resultant {-res[k, i_max]:.2f} mm)"]},
+             {"i": 4, "y": np.round(side[k], 3).tolist()},
+             {"i": 5, "y": np.round(res[k], 3).tolist()}]
+            for k in range(len(angles))
+        ]
+        yranges["beam-deflection-graph"] = [min(-200, 1.2*res.min()), 50]
+    # end if
+    
+    return {"angles": angles, "frames": frames, "yranges": yranges}
+
+# end def Sweep_Bundle()
+
+
+@callback(
+    Output("deflections-sweep", "data"),
+    Output("sweep-interval", "n_intervals"),
+    Output("sweep-interval", "disabled"),
+    Input("sweep-play", "n_clicks"),
+    State("E-slider", "value"),
+    State("section-dropdown", "value"),
+    State("beam-dropdown", "value"),
+    State("beam-load-mode", "value"),
+    State("channel-mode", "value"),
+    prevent_initial_call = True,
+)
+def Play_Sweep(n_clicks, E, designation, beam, load_mode, section_mode):
+    
+    return Sweep_Bundle(E, designation, beam, load_mode, section_mode), 0, False
+
+
+clientside_callback(
+    ClientsideFunction(namespace = "sweep", function_name = "tick"),
+    Output("mohr-circle-graph", "figure", allow_duplicate = True),
+    Output("channel-graph", "figure", allow_duplicate = True),
+    Output("beam-deflection-graph", "figure", allow_duplicate = True),
+    Output("sweep-interval", "disabled", allow_duplicate = True),
+    Input("sweep-interval", "n_intervals"),
+    State("deflections-sweep", "data"),
+    State("mohr-circle-graph", "figure"),
+    State("channel-graph", "figure"),
+    State("beam-deflection-graph", "figure"),
+    prevent_initial_call = True,
+)
+
+
+
+
+
+########################################################################################################
@@ -1,11 +1,16 @@
+from functools import lru_cache
+
 import dash
-from dash import dcc, html, callback, Output, Input
+from dash import dcc, html, callback, clientside_callback, Output, Input, State
 import dash_bootstrap_components as dbc
 
 import numpy as np, plotly.graph_objects as go
 from shapely.geometry import Point, LineString, Polygon
-from shapely.affinity import rotate
-from scipy.optimize import root_scalar
+
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_row, slider_rows
+from utils.friction import slip_case, solve_blocks, simulate_blocks, slip_reliability, VARIABLES
+from utils.geometry import make_scene, rotate_scene, group, outline, affine, transform
 
 
 ########################################################################################################
@@ -13,42 +18,49 @@ from scipy.optimize import root_scalar
 
 dash.register_page(__name__, name = "Friction", path = "/friction")
 
+MEMO_SIZE = 32   # Responses remembered per callback in the browser, 0 disables.
+
+BLOCK_CABLES = [1, 2]   # Cable coefficients of the bottom and top block (the top block hangs in a bight)
+
+FRICTION_MODES = {"static": "Impending motion", "kinetic": "Motion after slip", "reliability": "Uncertain inputs"}
+
+KINETIC_RATIO  = 0.8                             # Kinetic over static friction coefficient
+BLOCK_TRAVEL   = [[1.0, 1.375], [1.0, 0.5]]      # Room of the bottom and top block down and up the incline [m]
+MOTION_TIME    = 2.0                             # Simulated time after slip [s]
+MOTION_STEPS   = 400                             # Integration steps
+MOTION_FRAMES  = 41                              # Animation frames of the motion
+
+RELIABILITY_SAMPLES = 10**6                      # Monte Carlo samples of the reliability mode
+RELIABILITY_WORKERS = 0                          # Processes of the Monte Carlo, 0 samples in the server process
+RELIABILITY_SEED    = 0                          # Fixed seed, the same inputs give the same probabilities
+
+REGIME_ANGLES   = np.linspace(0, 90, 181)        # Angles of the regime map [deg]
+REGIME_FRICTION = np.linspace(0.005, 1, 200)     # Friction coefficients of the regime map
+REGIMES         = ["No slip", "Case 1", "Case 2"]
+
 ########################################################################################################
 # DETERMINE SLIPPAGE:
 
-def Slippage(Wt, Wb, us, angle):
+def Slip_Boundaries(Wt, Wb, angle):
     """
-    Determines the case of the slippage.
-    Case 1 Slippage: Top block slides UPWARDS and the bottom block slides DOWNWARDS.
-    Case 2 Slippage: Top block slides DOWNWARDS and the bottom block slides UPWARDS.
-    
+    Friction coefficients at which impending motion starts, from Ttop1 = Tbot1 (case 1) and
+    Tbot2 = Ttop2 (case 2) of slip_case(). The blocks slip for smaller coefficients; a negative value means that
+    the case cannot occur.
 
     Args:
         Wt (float):     Mass of the top block [kN].
         Wb (float):     Mass of the bottom block [kN].
-        us (float):     Coefficient of static friction.
-        angle (float):  Inclination angle of blocks [deg].
+        angle (float):  Inclination angles of blocks [deg].
 
     Returns:
-        int: 1, 2, 0
+        tuple: Boundary coefficients of case 1 and case 2.
     """
     
-    Ttop1 = 0.5*Wt*np.sin(np.radians(angle)) + 0.5*us*Wt*np.cos(np.radians(angle))
-    Ttop2 = 0.5*Wt*np.sin(np.radians(angle)) - 0.5*us*Wt*np.cos(np.radians(angle))
+    tan = np.tan(np.radians(angle))
     
-    Tbot1 = Wb*np.sin(np.radians(angle)) - us*(2*Wt + Wb)*np.cos(np.radians(angle))
-    Tbot2 = Wb*np.sin(np.radians(angle)) + us*(2*Wt + Wb)*np.cos(np.radians(angle))
+    return (Wb - 0.5*Wt)*tan/(2.5*Wt + Wb), (0.5*Wt - Wb)*tan/(2.5*Wt + Wb)
     
-    if (Ttop1 <= Tbot1) and (Ttop2 < Tbot2):
-        return 1
-    elif (Tbot2 <= Ttop2) and (Tbot1 < Ttop1):
-        return 2
-    elif (Tbot1 < Ttop1) and (Ttop2 < Tbot2):
-        return 0
-    else:
-        return 0
-    
-# end of def Slippage()
+# end def Slip_Boundaries()
 
 
 
@@ -60,121 +72,36 @@ def Slippage(Wt, Wb, us, angle):
 ########################################################################################################
 # APP LAYOUT:
 
-layout = dbc.Container([
-
-    
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 1: Label & Slider - Top Mass
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Top Mass [kg]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(10, 100, 10, value = 50, id = "TMass-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(10, 100+1, 10)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-1"
-    ),
-
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 2: Label & Slider - Bottom Mass
-    
-    dbc.Row([
+SLIDERS = [
+    SliderSpec("TMass-slider",    "Top Mass [kg]: ",        10, 100, 10, 50),
+    SliderSpec("BMass-slider",    "Bottom Mass [kg]: ",     10, 100, 10, 50),
+    SliderSpec("Friction-slider", "Friction Coefficient: ",  1,  20,  1,  8, lambda i: f"{i/20}"),
+    SliderSpec("Angle-slider",    "Angle [deg]: ",           0,  90,  5, 10),
+]
 
-        dbc.Col(
-
-            html.Div(html.Label("Bottom Mass [kg]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
+# Scatter of the inputs in the reliability mode, coefficients of variation and the angle's standard deviation:
+UNCERTAINTY_SLIDERS = [
+    SliderSpec("FrictionCOV-slider", "μs Scatter [%]: ",     0, 50, 5, 20),
+    SliderSpec("MassCOV-slider",     "Mass Scatter [%]: ",   0, 30, 5, 10),
+    SliderSpec("AngleSD-slider",     "Angle Scatter [deg]: ", 0, 10, 1,  2),
+]
 
-        dbc.Col(
 
-            dcc.Slider(10, 100, 10, value = 50, id = "BMass-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(10, 100+1, 10)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
+layout = dbc.Container([
 
-    ], className = "mt-3"
-    ),
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 3: Label & Slider - Friction Coefficient
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Friction Coefficient: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(1, 20, 1, value = 8, id = "Friction-slider", 
-                       marks = {i: {"label": f"{i/20}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(1, 20+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-3"
-    ),
+    # ROWS 1-4: Labels & Sliders
     
+    *slider_rows(SLIDERS),
     
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 4: Label & Slider - Angle
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Angle [deg]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(0, 90, 5, value = 10, id = "Angle-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(0, 90+1, 5)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-3"
-    ),
+    # Only shown in the reliability mode:
+    html.Div([slider_row(spec) for spec in UNCERTAINTY_SLIDERS], id = "uncertainty-sliders",
+             style = {"display": "none"}),
     
     
     #-------------------------------------------------------------------------------------------------------
-    # ROW 4: Graphs
+    # ROW 5: Graphs
     
     dbc.Row([
         
@@ -199,6 +126,12 @@ layout = dbc.Container([
         
         dbc.Col([
 
+            dbc.RadioItems(
+                id = "friction-mode",
+                options = [{"label": label, "value": mode} for mode, label in FRICTION_MODES.items()],
+                value = "static",
+                inline = True,
+            ),
             dcc.Graph(id = "blocks-graph"),
 
         ], xs = 12, sm = 12, md = 12, lg = 6, xl = 6, xxl = 6, className = "mt-3"
@@ -218,6 +151,7 @@ layout = dbc.Container([
                 },
                 className = "align-top",
             ),
+            dcc.Graph(id = "regime-graph", style = {"height": "40vh"}),
 
         ], xs = 12, sm = 12, md = 12, lg = 3, xl = 3, xxl = 3, className = "mt-3"
         ),
@@ -225,6 +159,8 @@ layout = dbc.Container([
 
     ], align = "center", justify = "center"
     ),
+    
+    memo_stores("friction-blocks"),
 
 
 
@@ -233,18 +169,54 @@ layout = dbc.Container([
 
 
 
+########################################################################################################
+# Scene of the blocks, pulleys and cables before rotation, per displacement of the blocks. The three
+# static positions are cached; animation frames build their scenes uncached, every frame has its own
+# displacements.
+
+def Blocks_Geometry(dtop, dbot):
+    
+    return make_scene(
+        pulleys = [Point(0.75, 0.875).buffer(0.375), Point(1.75, 1.50).buffer(0.25)],
+        lines   = [
+            LineString([[0, 2], [0, 0], [5, 0]]),
+            LineString([[0.75, 0.5], [2.50+dbot, 0.50]]),
+            LineString([[0.75, 1.25], [1.75, 1.25]]),
+            LineString([[0.00, 1.75], [1.75, 1.75]]),
+            LineString([[0.00, 0.875], [0.75, 0.875]]),
+            LineString([[1.75, 1.50], [2.50+dtop, 1.50]]),
+        ],
+        bottom  = [Polygon([[2.5+dbot, 0], [2.5+dbot, 1], [4+dbot, 1], [4+dbot, 0]])],
+        top     = [Polygon([[2.5+dtop, 1], [2.5+dtop, 2], [4+dtop, 2], [4+dtop, 1]])],
+    )
+
+
+@lru_cache(maxsize = 8)
+def Blocks_Scene(dtop, dbot):
+    
+    return Blocks_Geometry(dtop, dbot)
+
+
+
+
 ########################################################################################################
 # Calculate angle and draw blocks:
 
-@callback(
-    Output("blocks-graph", "figure"),
-    Output("blocks", "children"),
-    Input("TMass-slider", "value"),
-    Input("BMass-slider", "value"),
-    Input("Angle-slider", "value"),
-    Input("Friction-slider", "value")
+@memo_callback(
+    "friction-blocks",
+    [Output("blocks-graph", "figure"),
+     Output("blocks", "children")],
+    [Input("TMass-slider", "value"),
+     Input("BMass-slider", "value"),
+     Input("Angle-slider", "value"),
+     Input("Friction-slider", "value"),
+     Input("friction-mode", "value"),
+     Input("FrictionCOV-slider", "value"),
+     Input("MassCOV-slider", "value"),
+     Input("AngleSD-slider", "value")],
+    max_entries = MEMO_SIZE,
 )
-def Calculate_Rotation(TMass, BMass, angle, us):
+def Calculate_Rotation(TMass, BMass, angle, us, mode, us_cov, mass_cov, angle_sd):
     
     
     fig1 = go.Figure()
@@ -256,15 +228,26 @@ def Calculate_Rotation(TMass, BMass, angle, us):
     Wb = BMass*9.81
     us /= 20
     
-    slip_case = Slippage(Wt, Wb, us, angle)
+    system = solve_blocks([Wb, Wt], angle, us, BLOCK_CABLES)
+    
+    if not system.slip[0]:
+        case = 0
+    elif system.velocity[0, 1] > 0:
+        case = 1
+    else:
+        case = 2
+    # end if else
     
-    if slip_case == 1:
+    if mode == "kinetic":
+        dtop = 0
+        dbot = 0
+    elif case == 1:
         dtop = 0
         dbot = 0.5
-    elif slip_case == 2:
+    elif case == 2:
         dtop = 0.5
         dbot = 0
-    elif slip_case == 0:
+    elif case == 0:
         dtop = 0
         dbot = 0
     # end if else
@@ -272,86 +255,24 @@ def Calculate_Rotation(TMass, BMass, angle, us):
     #------------------------------------------------------------------------------------------
     # Generate Figures:
     
-    
-    
-    Line1    = LineString([[0, 2], [0, 0], [5, 0]])
-    BlockBot = Polygon([[2.5+dbot, 0], [2.5+dbot, 1], [4+dbot, 1], [4+dbot, 0]])
-    BlockTop = Polygon([[2.5+dtop, 1], [2.5+dtop, 2], [4+dtop, 2], [4+dtop, 1]])
-    
-    PulleyBot = Point(0.75, 0.875).buffer(0.375)
-    PulleyTop = Point(1.75, 1.50).buffer(0.25)
-    
-    PulleyLine1 = LineString([[0.75, 0.5], [2.50+dbot, 0.50]])
-    PulleyLine2 = LineString([[0.75, 1.25], [1.75, 1.25]])
-    PulleyLine3 = LineString([[0.00, 1.75], [1.75, 1.75]])
-    
-    PulleyLine4 = LineString([[0.00, 0.875], [0.75, 0.875]])
-    PulleyLine5 = LineString([[1.75, 1.50], [2.50+dtop, 1.50]])
-    
-    #------------------------------------------------------------------------------------------
-    # Plot Lines:
+    scene = rotate_scene(Blocks_Scene(dtop, dbot), -1*angle, (5, 0))
     
     fig1.add_trace(go.Scatter(x = [0, 5], y = [0, 0],  mode = "lines", hoverinfo = "skip",
                               line_color = "black", showlegend = False, name = " ",
                               )
     )
-
-    Line1x, Line1y = rotate(Line1, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(Line1x), y = np.array(Line1y),  
-                              mode = "lines",  hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
     
     #------------------------------------------------------------------------------------------
-    # Plot Pulleys:
+    # Plot Pulleys, Incline & Pulley lines:
     
-    ## Bot:
-    PulleyBotx, PulleyBoty = rotate(PulleyBot, -1*angle, (5, 0)).exterior.xy
-    fig1.add_trace(go.Scatter(x = np.array(PulleyBotx), y = np.array(PulleyBoty),  
-                              mode = "lines", fill = "toself", hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
-
-    ## Top:
-    PulleyTopx, PulleyTopy = rotate(PulleyTop, -1*angle, (5, 0)).exterior.xy
-    fig1.add_trace(go.Scatter(x = np.array(PulleyTopx), y = np.array(PulleyTopy),  
-                              mode = "lines", fill = "toself", hoverinfo = "skip",
+    x, y = outline(group(scene, "pulleys"))
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", fill = "toself", hoverinfo = "skip",
                               line_color = "black", showlegend = False, name = " ",
                               )
     )
-
-    #------------------------------------------------------------------------------------------
-    # Plot Pulley lines:
     
-    x1, y1 = rotate(PulleyLine1, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(x1), y = np.array(y1),  
-                              mode = "lines",  hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
-    x2, y2 = rotate(PulleyLine2, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(x2), y = np.array(y2),  
-                              mode = "lines",  hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
-    x3, y3 = rotate(PulleyLine3, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(x3), y = np.array(y3),  
-                              mode = "lines",  hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
-    x4, y4 = rotate(PulleyLine4, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(x4), y = np.array(y4),  
-                              mode = "lines",  hoverinfo = "skip",
-                              line_color = "black", showlegend = False, name = " ",
-                              )
-    )
-    x5, y5 = rotate(PulleyLine5, -1*angle, (5, 0)).xy
-    fig1.add_trace(go.Scatter(x = np.array(x5), y = np.array(y5),  
-                              mode = "lines",  hoverinfo = "skip",
+    x, y = outline(group(scene, "lines"))
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", hoverinfo = "skip",
                               line_color = "black", showlegend = False, name = " ",
                               )
     )
@@ -360,41 +281,44 @@ def Calculate_Rotation(TMass, BMass, angle, us):
     # Plot Blocks:
     
     ## Bot:
-    BlockBotx, BlockBoty = rotate(BlockBot, -1*angle, (5, 0)).exterior.xy
-    fig1.add_trace(go.Scatter(x = np.array(BlockBotx), y = np.array(BlockBoty),  
-                              mode = "lines", fill = "toself",
+    x, y = outline(group(scene, "bottom"))
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", fill = "toself",
                               line_color = "black", showlegend = False, 
                               name = f"Mass = {BMass} kg",
                               )
     )
 
     ## Top:
-    BlockTopx, BlockTopy = rotate(BlockTop, -1*angle, (5, 0)).exterior.xy
-    fig1.add_trace(go.Scatter(x = np.array(BlockTopx), y = np.array(BlockTopy),  
-                              mode = "lines", fill = "toself", 
+    x, y = outline(group(scene, "top"))
+    fig1.add_trace(go.Scatter(x = x, y = y, mode = "lines", fill = "toself", 
                               line_color = "blue", showlegend = False, 
                               name = f"Mass = {TMass} kg",
                               )
     )
 
-    if slip_case == 1:
+    if case == 1:
         results = [
             "The top block slides ", html.Strong("UPWARDS"), "." ,html.Br(),
             html.Br(),
             "The bottom block slides ", html.Strong("DOWNWARDS"), ".",
         ]
-    elif slip_case == 2:
+    elif case == 2:
         results = [
-            "The top block slides ", html.Strong("UPWARDS"), "." ,html.Br(),
+            "The top block slides ", html.Strong("DOWNWARDS"), "." ,html.Br(),
             html.Br(),
-            "The bottom block slides ", html.Strong("DOWNWARDS"), ".",
+            "The bottom block slides ", html.Strong("UPWARDS"), ".",
         ]
-    elif slip_case == 0:
+    elif case == 0:
         results = [
             "The blocks ", html.Strong("DO NOT"), " slide." ,html.Br(),
         ]
     # end if else
     
+    if mode == "kinetic" and case:
+        results += Motion_After_Slip(fig1, Wb, Wt, angle, us, system.velocity)
+    elif mode == "reliability":
+        results += Slip_Reliability(Wt, Wb, us, angle, us_cov, mass_cov, angle_sd)
+    # end if
     
     
     #------------------------------------------------------------------------------------------
@@ -422,9 +346,211 @@ def Calculate_Rotation(TMass, BMass, angle, us):
     
     return fig1, results
     
-# end def Calculate_Rotation() 
+# end def Calculate_Rotation()
+
+
+########################################################################################################
+# Motion after slip, animated with precomputed frames:
+
+def Motion_After_Slip(fig, Wb, Wt, angle, us, mechanism):
+    
+    mu_k   = KINETIC_RATIO*us
+    motion = simulate_blocks([Wb, Wt], angle, mu_k, mechanism, BLOCK_TRAVEL, MOTION_TIME, MOTION_STEPS)
+    
+    if motion.a[0] <= 0:
+        return [html.Br(), html.Br(), f"With μk = {mu_k:.3f} kinetic friction holds the blocks as soon as they start to slide."]
+    # end if
+    
+    # Frames up to the end of the motion, at real time:
+    ended  = motion.stopped[0] <= MOTION_TIME
+    last   = min(int(np.searchsorted(motion.t, motion.stopped[0])), MOTION_STEPS)
+    frames = np.unique(np.linspace(0, last, MOTION_FRAMES).astype(int))
+    
+    # The blocks move along the drawing's x axis; every frame's geometry is rotated in one transform:
+    d      = -motion.displacement[0, frames]
+    moving = [group(Blocks_Geometry(dtop, dbot), name) for dbot, dtop in d for name in ["lines", "bottom", "top"]]
+    parts  = np.split(transform([geom for part in moving for geom in part], *affine(-1*angle, (5, 0))),
+                      np.cumsum([len(part) for part in moving])[:-1])
+    
+    fig.frames = [go.Frame(data = [go.Scatter(x = np.round(x, 4), y = np.round(y, 4))
+                                   for x, y in map(outline, parts[3*k:3*k + 3])],
+                           traces = [2, 3, 4], name = f"{motion.t[step]:.3f}")
+                  for k, step in enumerate(frames)]
+    
+    fig.update_layout(
+        updatemenus = [dict(
+            type = "buttons", showactive = False, x = 0, y = 1.1, xanchor = "left",
+            buttons = [dict(label = "Play", method = "animate",
+                            args = [None, {"frame": {"duration": 1000*motion.t[last]/(len(frames) - 1), "redraw": False},
+                                           "fromcurrent": True, "transition": {"duration": 0}}])],
+        )],
+    )
+    
+    # Speed of the top block:
+    end = min(motion.stopped[0], MOTION_TIME)
+    a   = abs(motion.a[0]*mechanism[0, 1])
+    v   = a*end
+    
+    return [
+        html.Br(), html.Br(),
+        f"After slip (μk = {mu_k:.3f}) the top block accelerates at {a:.2f} m/s² and reaches {v:.2f} m/s ",
+        f"in {end:.2f} s" + (", when a block reaches the end of its travel." if ended else "."),
+    ]
+    
+# end def Motion_After_Slip()
+
+
+########################################################################################################
+# Probability of every slip case for scattered inputs. A run costs RELIABILITY_SAMPLES samples, so
+# runs are cached in the server process, shared by all clients; the sliders only report on release.
+
+@lru_cache(maxsize = 64)
+def Reliability_Run(Wt, Wb, us, angle, us_cov, mass_cov, angle_sd):
+    
+    distributions = {
+        "Wt":    ("lognormal", Wt, Wt*mass_cov/100) if mass_cov else Wt,
+        "Wb":    ("lognormal", Wb, Wb*mass_cov/100) if mass_cov else Wb,
+        "us":    ("lognormal", us, us*us_cov/100) if us_cov else us,
+        "angle": ("normal", angle, angle_sd),
+    }
+    
+    return slip_reliability(distributions, RELIABILITY_SAMPLES, workers = RELIABILITY_WORKERS,
+                            seed = RELIABILITY_SEED)
+
+# end def Reliability_Run()
+
+
+def Slip_Reliability(Wt, Wb, us, angle, us_cov, mass_cov, angle_sd):
+    
+    names = {"Wt": "top mass", "Wb": "bottom mass", "us": "μs", "angle": "angle"}
+    
+    reliability = Reliability_Run(Wt, Wb, us, angle, us_cov, mass_cov, angle_sd)
     
+    results = [html.Br(), html.Br(), f"Out of {reliability.samples:,} samples:", html.Br()]
+    for case, p, error in zip(REGIMES, reliability.probability, reliability.error):
+        results += [f"{case}: ", html.Strong(f"{100*p:.2f} %"), f" (± {100*error:.2f} %)", html.Br()]
+    # end for case
     
+    # Inputs by influence, with the correlation of each input with slip:
+    slip = -reliability.correlation[:, 0]
+    influence = [f"{names[name]} ({slip[VARIABLES.index(name)]:+.2f})" for name in reliability.ranking
+                 if slip[VARIABLES.index(name)]]
+    if influence:
+        results += [html.Br(), "Influence on slip: ", ", ".join(influence), "."]
+    # end if
+    
+    return results
+    
+# end def Slip_Reliability()
+
+
+
+
+########################################################################################################
+# SLIP REGIME MAP:
+#
+# Case of every angle and friction coefficient for the chosen masses, classified in one pass by the
+# vectorized slip_case(), with the exact boundaries of impending motion. The grid is cached per mass
+# pair; moving the angle or friction slider only moves the marker, in the browser.
+
+@lru_cache(maxsize = 128)
+def Regime_Grid(TMass, BMass):
+    
+    Wt = TMass*9.81
+    Wb = BMass*9.81
+    
+    cases = slip_case(Wt, Wb, REGIME_FRICTION[:, None], REGIME_ANGLES[None, :])
+    cases.flags.writeable = False
+    
+    return cases, Slip_Boundaries(Wt, Wb, REGIME_ANGLES)
+
+# end def Regime_Grid()
+
+
+def Regime_Graph(TMass, BMass, angle, us):
+    
+    cases, boundaries = Regime_Grid(TMass, BMass)
+    
+    fig2 = go.Figure()
+    
+    fig2.add_trace(go.Heatmap(x = REGIME_ANGLES, y = REGIME_FRICTION, z = cases, zmin = -0.5, zmax = 2.5,
+                              colorscale = [[0, "white"], [1/3, "white"], [1/3, "lightblue"], [2/3, "lightblue"],
+                                            [2/3, "moccasin"], [1, "moccasin"]],
+                              colorbar = dict(tickvals = [0, 1, 2], ticktext = REGIMES, thickness = 10),
+                              hovertemplate = "%{x}°, μs = %{y:.3f}<br>case %{z}<extra></extra>",
+                              )
+    )
+    
+    for case, mu in zip((1, 2), boundaries):
+        mu = np.where((mu > 0) & (mu <= REGIME_FRICTION[-1]), mu, np.nan)
+        fig2.add_trace(go.Scatter(x = REGIME_ANGLES, y = mu, mode = "lines", line_color = "black",
+                                  showlegend = False, name = f"Case {case} boundary",
+                                  hovertemplate = "%{x}°, μs = %{y:.3f}",
+                                  )
+        )
+    # end for case
+    
+    fig2.add_trace(go.Scatter(x = [angle], y = [us/20], mode = "markers", marker_color = "red",
+                              marker_size = 12, marker_line_color = "white", marker_line_width = 2,
+                              showlegend = False, hoverinfo = "skip",
+                              )
+    )
+    
+    fig2.update_layout(
+        plot_bgcolor = "white",
+        template = "simple_white",
+        margin=dict(l=0, r=0, t=30, b=0),
+        title = "Slip regimes",
+    )
+    fig2.update_xaxes(
+        title = "Angle [deg]",
+        title_font = {"family": "Arial Black"},
+    )
+    fig2.update_yaxes(
+        title = "μs",
+        title_font = {"family": "Arial Black"},
+    )
+    
+    return fig2
 
 
+@callback(
+    Output("regime-graph", "figure"),
+    Input("TMass-slider", "value"),
+    Input("BMass-slider", "value"),
+    State("Angle-slider", "value"),
+    State("Friction-slider", "value"),
+)
+def Update_Regime_Map(TMass, BMass, angle, us):
+    
+    return Regime_Graph(TMass, BMass, angle, us)
 
+
+clientside_callback(
+    """
+    function(angle, us, figure) {
+        if (!figure) {
+            return window.dash_clientside.no_update;
+        }
+        const data = [...figure.data];
+        data[3] = {...data[3], x: [angle], y: [us/20]};
+        return {...figure, data: data};
+    }
+    """,
+    Output("regime-graph", "figure", allow_duplicate = True),
+    Input("Angle-slider", "value"),
+    Input("Friction-slider", "value"),
+    State("regime-graph", "figure"),
+    prevent_initial_call = True,
+)
+
+
+clientside_callback(
+    """
+    function(mode) {
+        return {display: mode === "reliability" ? "block" : "none"};
+    }
+    """,
+    Output("uncertainty-sliders", "style"),
+    Input("friction-mode", "value"),
+)
@@ -2,6 +2,10 @@ import dash, numpy as np, plotly.graph_objects as go, matplotlib.pyplot as plt,
 from dash import html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
 
+from utils.rendering import render
+from utils.preview import drag_store, preview_values
+from utils.memo import memo_callback, memo_stores
+from utils.layouts import SliderSpec, slider_rows
 
 
 dash.register_page(__name__, name = "Resonance", path = "/resonance")
@@ -9,63 +13,25 @@ dash.register_page(__name__, name = "Resonance", path = "/resonance")
 
 ########################################################################################################
 
+POINTS, PREVIEW_POINTS = 1000, 150   # Samples per signal after release / while dragging.
+MEMO_SIZE = 32                       # Responses remembered per callback in the browser, 0 disables.
 
-layout = dbc.Container([
-
-    
-    #-------------------------------------------------------------------------------------------------------
-    # ROW 1: Label & Slider - freq 1
-    
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Frequency 1 [rad/s]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
+########################################################################################################
 
-        dbc.Col(
 
-            dcc.Slider(1, 10, 1, value = 3, id = "freq1-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(1, 10+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
+SLIDERS = [
+    SliderSpec("freq1-slider", "Frequency 1 [rad/s]: ", 1, 10, 1, 3),
+    SliderSpec("freq2-slider", "Frequency 2 [rad/s]: ", 1, 10, 1, 1),
+]
 
-        )
 
-    ], className = "mt-1"
-    ),
+layout = dbc.Container([
 
+    
     #-------------------------------------------------------------------------------------------------------
-    # ROW 2: Label & Slider - Angle
+    # ROWS 1-2: Labels & Sliders
     
-    dbc.Row([
-
-        dbc.Col(
-
-            html.Div(html.Label("Frequency 2 [rad/s]: ", style = {"color": "black"})),
-            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
-
-        ),
-
-        dbc.Col(
-
-            dcc.Slider(1, 10, 1, value = 1, id = "freq2-slider", 
-                       marks = {i: {"label": f"{i}",
-                                    "style": {"transform": "rotate(-45deg)", "color": "black"}
-                            } for i in range(1, 10+1, 1)
-                           }
-            ),
-            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
-
-        )
-
-    ], className = "mt-3"
-    ),
+    *slider_rows(SLIDERS),
     
     
     #-------------------------------------------------------------------------------------------------------
@@ -90,6 +56,10 @@ layout = dbc.Container([
 
     ], align = "center", justify = "center"
     ),
+    
+    drag_store("resonance-drag", ["freq1-slider", "freq2-slider"]),
+    
+    memo_stores("resonance"),
 
 
 
@@ -99,19 +69,13 @@ layout = dbc.Container([
 ########################################################################################################
 # SEPARATE SIGNALS GRAPH:
 
-@callback(
-    Output("separate-graph", "figure"),
-    Input("freq1-slider", "value"),
-    Input("freq2-slider", "value")
-)
-def Signals_Graph(w1, w2):
+def Signals_Graph(x, s1, s2):
     
     fig1 = go.Figure()
     
 
-    x  = np.linspace(0, 6*np.pi+0.1, 1000)
-    y1 = 1.2*np.sin(w1*x)
-    y2 = 0.8*np.sin(w2*x)
+    y1 = 1.2*s1
+    y2 = 0.8*s2
     
     fig1.add_trace(go.Scatter(x = x, y = y1,  mode = "lines", line_color = "blue", 
                               name = "Freq1",
@@ -153,21 +117,12 @@ def Signals_Graph(w1, w2):
 ########################################################################################################
 # RESONANCE GRAPH:
 
-@callback(
-    Output("resonance-graph", "figure"),
-    Input("freq1-slider", "value"),
-    Input("freq2-slider", "value")
-)
-def Resonance_Graph(w1, w2):
+def Resonance_Graph(x, s1, s2):
     
     fig2 = go.Figure()
     
 
-    x  = np.linspace(0, 6*np.pi+0.1, 1000)
-    y1 = np.sin(w1*x)
-    y2 = np.sin(w2*x)
-    
-    fig2.add_trace(go.Scatter(x = x, y = y1+y2,  mode = "lines", line_color = "black", 
+    fig2.add_trace(go.Scatter(x = x, y = s1+s2,  mode = "lines", line_color = "black", 
                               name = "superposition",
                               hovertemplate='(%{x:.2f}, %{y:.2f})',
                               )
@@ -202,3 +157,38 @@ def Resonance_Graph(w1, w2):
 
 
 
+########################################################################################################
+# UPDATE PAGE:
+#
+# One round trip per slider change: the time axis and both unit signals are sampled once and shared
+# by the two graphs.
+
+@memo_callback(
+    "resonance",
+    [Output("separate-graph", "figure"),
+     Output("resonance-graph", "figure")],
+    [Input("freq1-slider", "value"),
+     Input("freq2-slider", "value"),
+     Input("render-mode", "value"),
+     Input("client-hints", "data"),
+     Input("resonance-drag", "data")],
+    max_entries = MEMO_SIZE,
+    preview = "resonance-drag",
+)
+def Update_Resonance(w1, w2, mode, hints, drag):
+    
+    (w1, w2), preview = preview_values("resonance-drag", [w1, w2], drag)
+    
+    x  = np.linspace(0, 6*np.pi+0.1, PREVIEW_POINTS if preview else POINTS)
+    s1 = np.sin(w1*x)
+    s2 = np.sin(w2*x)
+    
+    return render(Signals_Graph(x, s1, s2), mode, hints), render(Resonance_Graph(x, s1, s2), mode, hints)
+
+# end def Update_Resonance()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,352 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy.linalg import solveh_banded, LinAlgError
+
+
+########################################################################################################
+# BEAM SOLVER:
+#
+# Euler-Bernoulli finite elements with two degrees of freedom per node (deflection w and slope θ).
+# The stiffness matrix is symmetric with a half bandwidth of 3, so it is assembled directly in
+# upper banded storage and solved by a banded Cholesky factorization: memory and time grow linearly
+# with the number of elements.
+#
+# Sign convention: x along the beam, w and forces upwards, slopes and moments anticlockwise. Loads
+# are given as magnitudes acting downwards (point, distributed) or anticlockwise (moment). Bending
+# moments in the results are sagging positive and shear forces are the sum of the forces to the left.
+
+ELEMENTS = 200   # Default number of elements of a beam.
+
+# Supports and the degrees of freedom they restrain (deflection, slope):
+SUPPORTS = {
+    "pin":    (True, False),
+    "roller": (True, False),
+    "fixed":  (True, True),
+}
+
+Support = namedtuple("Support", ["x", "kind"])                          # Position [mm], key of SUPPORTS
+Load    = namedtuple("Load", ["kind", "x", "value", "end"], defaults = [None])
+                                                                        # kind: "point" [N], "moment" [Nmm]
+                                                                        # or "distributed" [N/mm] from x to end
+
+BeamResult = namedtuple("BeamResult", [
+    "x",            # Node positions [mm]
+    "deflection",   # [mm]
+    "slope",        # [rad]
+    "shear",        # [N]
+    "moment",       # [Nmm]
+    "reactions",    # (supports, 2) array of reaction forces [N] and moments [Nmm]
+])
+
+
+########################################################################################################
+# FUNCTION - BEAM_MESH()
+
+def beam_mesh(L, points = (), elements = ELEMENTS):
+    """
+    Places the nodes of a beam: a uniform mesh plus a node at every support and load position.
+
+    Args:
+        L (float):          Length of the beam [mm].
+        points (list):      Positions that must fall on nodes [mm].
+        elements (int):     Number of elements of the uniform mesh.
+
+    Returns:
+        np.ndarray: Sorted node positions.
+    """
+
+    x = np.unique(np.concatenate([np.linspace(0, L, elements + 1), np.asarray(points, dtype = float)]))
+
+    # Drop nodes that would create vanishingly short elements:
+    keep = np.concatenate([[True], np.diff(x) > 1e-9*L])
+    x    = x[keep]
+    x[-1] = L
+
+    return x
+
+# end def beam_mesh()
+
+
+def node_index(x, positions):
+
+    return np.clip(np.searchsorted(x, np.asarray(positions, dtype = float) - 1e-9*x[-1]), 0, len(x) - 1)
+
+
+########################################################################################################
+# FUNCTION - STIFFNESS()
+
+def stiffness(x, EI):
+    """
+    Assembles the global stiffness matrix in upper banded storage (for scipy.linalg.solveh_banded).
+
+    Args:
+        x (np.ndarray):     Node positions [mm].
+        EI (float):         Flexural rigidity [Nmm²], scalar or one value per element.
+
+    Returns:
+        np.ndarray: (4, 2*nodes) banded matrix.
+    """
+
+    h = np.diff(x)
+    k = np.broadcast_to(EI, h.shape)/h**3
+
+    ke = k[:, None, None]*np.array([
+        [12*np.ones_like(h),  6*h,     -12*np.ones_like(h),  6*h    ],
+        [ 6*h,                4*h**2,   -6*h,                2*h**2 ],
+        [-12*np.ones_like(h), -6*h,     12*np.ones_like(h), -6*h    ],
+        [ 6*h,                2*h**2,   -6*h,                4*h**2 ],
+    ]).transpose(2, 0, 1)
+
+    ab    = np.zeros((4, 2*len(x)))
+    first = 2*np.arange(len(h))
+
+    # For a fixed pair of local dofs every element writes to a different column, so no scatter-add:
+    for a in range(4):
+        for b in range(a, 4):
+            ab[3 + a - b, first + b] += ke[:, a, b]
+        # end for b
+    # end for a
+
+    return ab
+
+# end def stiffness()
+
+
+########################################################################################################
+# FUNCTION - LOAD_VECTOR()
+
+def load_vector(x, loads):
+    """
+    Consistent nodal forces of the loads. Load positions must be nodes of the mesh.
+
+    Args:
+        x (np.ndarray):     Node positions [mm].
+        loads (list):       Loads acting on the beam.
+
+    Returns:
+        np.ndarray: Nodal forces and moments, 2 per node.
+    """
+
+    F = np.zeros(2*len(x))
+    h = np.diff(x)
+
+    for load in loads:
+
+        if load.kind == "point":
+            F[2*node_index(x, load.x)] -= load.value
+
+        elif load.kind == "moment":
+            F[2*node_index(x, load.x) + 1] += load.value
+
+        elif load.kind == "distributed":
+            i, j = node_index(x, [load.x, load.end])
+            q, e = load.value, np.arange(i, j)
+
+            np.add.at(F, 2*e,     -q*h[e]/2)
+            np.add.at(F, 2*e + 1, -q*h[e]**2/12)
+            np.add.at(F, 2*e + 2, -q*h[e]/2)
+            np.add.at(F, 2*e + 3,  q*h[e]**2/12)
+
+        else:
+            raise ValueError(f"Unknown load kind: {load.kind}")
+        # end if else
+    # end for load
+
+    return F
+
+# end def load_vector()
+
+
+########################################################################################################
+# FUNCTION - CONSTRAIN()
+
+def constrain(ab, x, supports):
+    """
+    Applies the supports by replacing the rows and columns of the restrained dofs with identity rows.
+
+    Args:
+        ab (np.ndarray):    Banded stiffness matrix, modified in place.
+        x (np.ndarray):     Node positions [mm].
+        supports (list):    Supports of the beam.
+
+    Returns:
+        np.ndarray: Indices of the restrained dofs, in the order of the supports (deflection first).
+    """
+
+    dofs = []
+    for support in supports:
+        node = node_index(x, support.x)
+        dofs += [2*node + d for d, restrained in enumerate(SUPPORTS[support.kind]) if restrained]
+    # end for support
+
+    dofs = np.array(dofs, dtype = int)
+    n    = ab.shape[1]
+
+    ab[:3, dofs] = 0                    # Column above the diagonal
+    ab[3, dofs]  = 1
+    for d in range(1, 4):               # Row right of the diagonal
+        cols = dofs + d
+        cols = cols[cols < n]
+        ab[3 - d, cols] = 0
+    # end for d
+
+    return dofs
+
+# end def constrain()
+
+
+########################################################################################################
+# FUNCTION - SOLVE_BEAM()
+
+def solve_beam(L, EI, supports, loads, elements = ELEMENTS):
+    """
+    Solves a (multi-span) beam for its deflection, slope, shear and bending moment.
+
+    Args:
+        L (float):          Length of the beam [mm].
+        EI (float):         Flexural rigidity [Nmm²].
+        supports (list):    Supports, e.g. [Support(0, "fixed")] for a cantilever.
+        loads (list):       Loads acting on the beam.
+        elements (int):     Number of elements of the uniform mesh.
+
+    Returns:
+        BeamResult: Results at the nodes.
+    """
+
+    _check_stable(supports)
+
+    points = [s.x for s in supports] + [l.x for l in loads] + [l.end for l in loads if l.end is not None]
+    x      = beam_mesh(L, points, elements)
+
+    ab = stiffness(x, EI)
+    F  = load_vector(x, loads)
+    K  = ab.copy()
+
+    dofs    = constrain(ab, x, supports)
+    F_c     = F.copy()
+    F_c[dofs] = 0
+
+    try:
+        u = solveh_banded(ab, F_c)
+    except LinAlgError:
+        raise ValueError("The beam is not stable on these supports") from None
+    # end try
+
+    # Reactions from the unconstrained stiffness: R = K u - F
+    R = _banded_matvec(K, u) - F
+
+    reactions = np.zeros((len(supports), 2))
+    for i, support in enumerate(supports):
+        node = node_index(x, support.x)
+        reactions[i] = [R[2*node], R[2*node + 1] if SUPPORTS[support.kind][1] else 0]
+    # end for i
+
+    shear, moment = _statics(x, supports, reactions, loads)
+
+    return BeamResult(x, u[0::2], u[1::2], shear, moment, reactions)
+
+# end def solve_beam()
+
+
+def _check_stable(supports):
+    # A beam needs a fixed support or deflection restraints at two positions.
+
+    if len({s.x for s in supports}) < 2 and not any(SUPPORTS[s.kind][1] for s in supports):
+        raise ValueError("The beam is not stable on these supports")
+
+
+def _banded_matvec(ab, u):
+    # Product of a symmetric matrix in upper banded storage with a vector.
+
+    n, out = len(u), ab[3]*u
+    for d in range(1, 4):
+        out[:n-d] += ab[3 - d, d:]*u[d:]
+        out[d:]   += ab[3 - d, d:]*u[:n-d]
+    # end for d
+
+    return out
+
+
+def _statics(x, supports, reactions, loads):
+    # Shear and bending moment from the equilibrium of the part of the beam left of each node. The
+    # value at a node includes the forces applied at that node, except at the right end, where it is
+    # the value just left of the end.
+
+    forces  = [(s.x, r[0]) for s, r in zip(supports, reactions)]
+    moments = [(s.x, r[1]) for s, r in zip(supports, reactions)]
+
+    V = np.zeros_like(x)
+    M = np.zeros_like(x)
+
+    for load in loads:
+        if load.kind == "point":
+            forces.append((load.x, -load.value))
+        elif load.kind == "moment":
+            moments.append((load.x, load.value))
+        else:
+            l  = np.clip(x - load.x, 0, load.end - load.x)
+            V -= load.value*l
+            M -= load.value*l*(x - load.x - l/2)
+        # end if else
+    # end for load
+
+    tol  = 1e-9*x[-1]
+    left = lambda xi: (x >= xi - tol) & (xi < x[-1] - tol)
+
+    for xi, f in forces:
+        V += f*left(xi)
+        M += f*(x - xi)*left(xi)
+    # end for xi
+
+    for xi, c in moments:
+        M -= c*left(xi)
+    # end for xi
+
+    return V, M
+
+
+
+
+########################################################################################################
+# FUNCTION - INFLUENCE_MATRIX()
+
+def influence_matrix(L, EI, supports, elements = ELEMENTS):
+    """
+    Deflection influence lines of a beam: the deflection at every node for a unit downward load at
+    every node. The stiffness matrix is factorized once and all load positions are solved together
+    as the columns of one right-hand side matrix.
+
+    Args:
+        L (float):          Length of the beam [mm].
+        EI (float):         Flexural rigidity [Nmm²].
+        supports (list):    Supports of the beam.
+        elements (int):     Number of elements of the uniform mesh.
+
+    Returns:
+        tuple: Node positions x [mm] and G [mm/N], where G[j, i] is the deflection at x[i] for a unit
+               load at x[j]. G is symmetric (Maxwell's reciprocal theorem).
+    """
+
+    _check_stable(supports)
+
+    x = beam_mesh(L, [s.x for s in supports], elements)
+    n = len(x)
+
+    ab   = stiffness(x, EI)
+    dofs = constrain(ab, x, supports)
+
+    B = np.zeros((2*n, n))
+    B[2*np.arange(n), np.arange(n)] = -1
+    B[dofs] = 0
+
+    U = solveh_banded(ab, B)
+
+    return x, U[0::2].T
+
+# end def influence_matrix()
+
+
+
+
+########################################################################################################
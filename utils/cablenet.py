@@ -0,0 +1,293 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import spsolve
+
+from utils import metrics
+from utils.catenary import segment_offsets
+
+
+########################################################################################################
+# CABLE NETWORK SOLVER:
+#
+# A cable running over several supports and carrying concentrated loads (hangers, signs) is split
+# into catenary segments at every support and load point. Segment i has its unstretched length s_i,
+# self weight w_i per unit length and two unknowns at its left end: the horizontal tension H_i and
+# the vertical force V_i = H_i y'. Along the segment V grows by the weight w_i s_i and the end
+# offsets have closed forms (catenary.segment_offsets()).
+#
+# The equilibrium system has two equations per segment:
+#
+#   inside a span       H_i+1 - H_i = 0,  V_i+1 - V_i - w_i s_i - P = 0     (point load P at the node)
+#   at a span's end     sum(dx) = support dx,  sum(dy) = support dy          (over the span's segments)
+#
+# The cable is held at every support, so the spans only share their supports. The Jacobian is sparse:
+# the continuity rows are bidiagonal and the closure rows only touch their own span, so a damped
+# Newton iteration with a sparse LU solve scales linearly with the number of segments.
+#
+# Sign convention: x to the right, y up, loads and self weight downwards [kN], tensions positive.
+
+TOLERANCE = 1e-12   # Residual tolerance, relative to the span lengths and the total load.
+MAX_ITER  = 50      # Newton iterations.
+
+# Iteration counts reported to the metrics histogram:
+ITERATION_BUCKETS = (2, 3, 4, 5, 6, 8, 10, 15, 20, 30, MAX_ITER)
+
+CableLoad = namedtuple("CableLoad", [
+    "span",         # Index of the span carrying the load
+    "s",            # Cable length from the left support of the span to the load [m]
+    "P",            # Downward force [kN]
+])
+
+CableNetwork = namedtuple("CableNetwork", [
+    "nodes",        # (segments + 1, 2) coordinates of the supports and load points [m]
+    "span",         # Span of every segment
+    "length",       # Unstretched length of every segment [m]
+    "w",            # Self weight of every segment [kN/m]
+    "H",            # Horizontal tension of every segment [kN]
+    "V",            # Vertical force at the left end of every segment, H y' [kN]
+    "T",            # (segments, 2) tension at both ends of every segment [kN]
+    "iterations",   # Newton iterations of the solve
+])
+
+
+########################################################################################################
+# FUNCTION - NETWORK_SEGMENTS()
+
+def network_segments(supports, lengths, w, loads = ()):
+    """
+    Splits the cable at its load points.
+
+    Args:
+        supports (np.ndarray):  (spans + 1, 2) support coordinates from left to right [m].
+        lengths (list):         Cable length of every span [m].
+        w (float):              Self weight [kN/m], scalar or one value per span.
+        loads (list):           CableLoad's acting on the cable.
+
+    Returns:
+        tuple: Span, length, self weight and point load at the right end of every segment.
+    """
+
+    supports = np.asarray(supports, dtype = float)
+    lengths  = np.asarray(lengths, dtype = float)
+    w        = np.broadcast_to(np.asarray(w, dtype = float), lengths.shape)
+
+    chords = np.hypot(*np.diff(supports, axis = 0).T)
+    if len(lengths) != len(supports) - 1:
+        raise ValueError("A cable network needs one cable length per span")
+    if np.any(np.diff(supports[:, 0]) <= 0):
+        raise ValueError("The supports of a cable network must be ordered from left to right")
+    if np.any(lengths <= chords) or np.any(w <= 0):
+        raise ValueError("Every span needs a cable longer than its chord and a positive self weight")
+    # end if
+
+    span, length, weight, P = [], [], [], []
+
+    for k, L in enumerate(lengths):
+
+        at = {}
+        for load in loads:
+            if load.span == k:
+                if not 0 < load.s < L:
+                    raise ValueError(f"Load at s = {load.s} m is not on span {k}")
+                at[load.s] = at.get(load.s, 0) + load.P
+            # end if
+        # end for load
+
+        cuts = np.concatenate([[0], sorted(at), [L]])
+        span   += [k]*(len(cuts) - 1)
+        length += list(np.diff(cuts))
+        weight += [w[k]]*(len(cuts) - 1)
+        P      += [at[s] for s in cuts[1:-1]] + [0]
+    # end for k
+
+    return np.array(span), np.array(length), np.array(weight), np.array(P, dtype = float)
+
+# end def network_segments()
+
+
+########################################################################################################
+# FUNCTION - SOLVE_NETWORK()
+
+def solve_network(supports, lengths, w, loads = (), tol = TOLERANCE, max_iter = MAX_ITER):
+    """
+    Solves the equilibrium shape and tensions of a cable over several supports with point loads.
+
+    Args:
+        supports (np.ndarray):  (spans + 1, 2) support coordinates from left to right [m].
+        lengths (list):         Cable length of every span [m].
+        w (float):              Self weight [kN/m], scalar or one value per span.
+        loads (list):           CableLoad's acting on the cable.
+        tol (float):            Relative residual tolerance.
+        max_iter (int):         Iteration limit.
+
+    Returns:
+        CableNetwork: Shape and tensions of the segments.
+    """
+
+    started  = time.perf_counter()
+    supports = np.asarray(supports, dtype = float)
+
+    span, s, w, P = network_segments(supports, lengths, w, loads)
+    n    = len(s)
+    last = np.append(span[1:] != span[:-1], True)         # Last segment of its span
+    gap  = np.diff(supports, axis = 0)
+
+    X     = _initial_guess(supports, span, s, w, P)
+    scale = max(np.abs(gap).max(), (w*s).sum() + np.abs(P).sum())
+
+    # Sparsity pattern: continuity rows couple a segment with the next one, closure rows couple
+    # all segments of a span.
+    seg   = np.arange(n)
+    first = np.searchsorted(span, span)                   # First segment of every segment's span
+    inner = seg[~last]
+    close = seg[last]
+
+    members = [np.arange(first[i], i + 1) for i in close]
+
+    def residual(X):
+
+        H, V = X[0::2], X[1::2]
+        dx, dy, *_ = segment_offsets(H, V, s, w)
+
+        R = np.empty(2*n)
+        R[2*inner]     = H[inner + 1] - H[inner]
+        R[2*inner + 1] = V[inner + 1] - V[inner] - w[inner]*s[inner] - P[inner]
+        R[2*close]     = np.add.reduceat(dx, first[close]) - gap[:, 0]
+        R[2*close + 1] = np.add.reduceat(dy, first[close]) - gap[:, 1]
+
+        return R
+
+    def jacobian(X):
+
+        H, V = X[0::2], X[1::2]
+        _, _, dx_dH, dx_dV, dy_dH, dy_dV = segment_offsets(H, V, s, w)
+
+        rows = [2*inner, 2*inner, 2*inner + 1, 2*inner + 1]
+        cols = [2*inner + 2, 2*inner, 2*inner + 3, 2*inner + 1]
+        vals = [np.ones(len(inner)), -np.ones(len(inner)), np.ones(len(inner)), -np.ones(len(inner))]
+
+        for i, m in zip(close, members):
+            rows += [np.full(len(m), 2*i)]*2 + [np.full(len(m), 2*i + 1)]*2
+            cols += [2*m, 2*m + 1]*2
+            vals += [dx_dH[m], dx_dV[m], dy_dH[m], dy_dV[m]]
+        # end for i
+
+        return csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape = (2*n, 2*n))
+
+    R    = residual(X)
+    norm = np.abs(R).max()
+
+    for iteration in range(1, max_iter + 1):
+
+        step = spsolve(jacobian(X), -R)
+
+        # Damped step: keep the tensions positive and the residual decreasing.
+        lam = 1.0
+        while lam > 1e-6:
+            trial = X + lam*step
+            if np.all(trial[0::2] > 0):
+                R_trial = residual(trial)
+                if np.all(np.isfinite(R_trial)) and np.abs(R_trial).max() < (1 - 1e-4*lam)*norm:
+                    break
+            # end if
+            lam /= 2
+        # end while
+
+        if lam <= 1e-6:   # No descent left, the residual is at round-off or the solve stalled
+            break
+        # end if
+
+        X, R = trial, R_trial
+        norm = np.abs(R).max()
+        if norm <= tol*scale:
+            break
+        # end if
+    # end for
+
+    metrics.count("cable_network_solves")
+    metrics.observe("cable_network_iterations", iteration, ITERATION_BUCKETS)
+    metrics.observe("cable_network_solve_seconds", time.perf_counter() - started, (1e-4, 1e-3, 1e-2, 1e-1, 1))
+
+    if not norm <= tol*scale:
+        metrics.count("cable_network_failures")
+        raise ValueError("The cable network did not converge")
+    # end if
+
+    H, V   = X[0::2], X[1::2]
+    dx, dy = segment_offsets(H, V, s, w)[:2]
+
+    # Node coordinates: restart the running sums at every support to remove round-off drift.
+    nodes = np.empty((n + 1, 2))
+    nodes[0] = supports[0]
+    for k, m in enumerate(members):
+        nodes[m + 1] = supports[k] + np.cumsum(np.column_stack([dx[m], dy[m]]), axis = 0)
+    # end for k
+
+    T = H[:, None]*np.sqrt(1 + np.column_stack([V, V + w*s])**2/H[:, None]**2)
+
+    return CableNetwork(nodes, span, s, w, H, V, T, iteration)
+
+# end def solve_network()
+
+
+def _initial_guess(supports, span, s, w, P):
+    # Parabolic cable per span: sag from the excess length, H from the sag, V from moments about
+    # the right support, with the loads placed proportionally to their arc length.
+
+    X = np.empty(2*len(s))
+
+    for k in range(len(supports) - 1):
+
+        m      = np.flatnonzero(span == k)
+        (lx, ly), S = supports[k + 1] - supports[k], s[m].sum()
+        chord  = np.hypot(lx, ly)
+        sag    = np.sqrt(3*lx*(S - chord)/8)
+
+        x_load = lx*np.cumsum(s[m])/S
+        W      = (w[m]*s[m]).sum() + P[m][:-1].sum()
+        H      = W*lx/(8*sag)
+        V      = (H*ly - (w[m]*s[m]).sum()*lx/2 - (P[m][:-1]*(lx - x_load[:-1])).sum())/lx
+
+        X[2*m]     = H
+        X[2*m + 1] = V + np.concatenate([[0], np.cumsum(w[m]*s[m] + P[m])[:-1]])
+    # end for k
+
+    return X
+
+
+########################################################################################################
+# FUNCTION - NETWORK_CURVE()
+
+def network_curve(net, points = 20):
+    """
+    Points along every segment of a solved network, for drawing.
+
+    Args:
+        net (CableNetwork):     Solved network.
+        points (int):           Points per segment.
+
+    Returns:
+        tuple: x, y and tension arrays, segments one after the other.
+    """
+
+    t  = np.linspace(0, 1, points)
+    u0 = net.V/net.H
+    u  = u0[:, None] + t*(net.w*net.length/net.H)[:, None]
+    c  = (net.H/net.w)[:, None]
+
+    x = net.nodes[:-1, 0, None] + c*(np.arcsinh(u) - np.arcsinh(u0)[:, None])
+    y = net.nodes[:-1, 1, None] + c*(np.sqrt(1 + u**2) - np.sqrt(1 + u0**2)[:, None])
+    T = net.H[:, None]*np.sqrt(1 + u**2)
+
+    return x.ravel(), y.ravel(), T.ravel()
+
+# end def network_curve()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,291 @@
+import csv, json, os
+
+import numpy as np
+from shapely.geometry import Polygon, box
+
+from utils.sections import section_properties, SectionProperties
+
+
+########################################################################################################
+# STEEL SECTION CATALOG:
+#
+# data/sections.csv lists the dimensions of the bundled sections. build_catalog() calculates their
+# properties in one batch and writes them to data/sections.bin, a columnar binary table:
+#
+#   8 bytes   magic "SWKCAT01"
+#   8 bytes   header length (little endian)
+#   header    JSON: number of rows, and dtype and byte offset of every column
+#   columns   one contiguous array per column, each aligned to 64 bytes
+#
+# load_catalog() memory-maps every column read-only, so opening the catalog costs no parsing and
+# the pages are shared by all worker processes through the OS page cache. Rows are sorted by
+# designation, which is the index for lookups.
+#
+# Rebuild after editing the CSV with:   python -m utils.catalog
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+CSV_PATH = os.path.join(DATA_DIR, "sections.csv")
+BIN_PATH = os.path.join(DATA_DIR, "sections.bin")
+
+MAGIC = b"SWKCAT01"
+ALIGN = 64
+
+# Section kinds, stored as int8 codes:
+KINDS = {
+    "LC":  0,   # Lipped channel, web horizontal on top, lips at the bottom (as in assets/channel.jpg)
+    "UPE": 1,   # Parallel flange channel, web vertical on the left
+    "IPE": 2,   # I-section
+    "L":   3,   # Angle, legs d (vertical) and b (horizontal)
+    "HS":  4,   # Square or rectangular hollow section, d high and b wide
+}
+
+_catalog = None
+
+
+########################################################################################################
+# FUNCTION - SECTION_POLYGON()
+
+def section_polygon(kind, d, b, tw, tf, lip = 0):
+    """
+    Builds the outline of a section from its dimensions. Root and corner radii are ignored.
+
+    Args:
+        kind (int):     Code from KINDS.
+        d (float):      Depth [mm] (web length of a lipped channel).
+        b (float):      Flange width [mm].
+        tw (float):     Web thickness [mm].
+        tf (float):     Flange thickness [mm].
+        lip (float):    Lip length of a lipped channel [mm].
+
+    Returns:
+        Polygon: Section outline with its bottom left corner at the origin.
+    """
+
+    if kind == KINDS["LC"]:
+        W, H, t = d, b, tw
+        return Polygon([[0, 0], [0, H], [W, H], [W, 0], [W-lip, 0], [W-lip, t],
+                        [W-t, t], [W-t, H-t], [t, H-t], [t, t], [lip, t], [lip, 0]])
+
+    elif kind == KINDS["UPE"]:
+        return Polygon([[0, 0], [b, 0], [b, tf], [tw, tf], [tw, d-tf], [b, d-tf], [b, d], [0, d]])
+
+    elif kind == KINDS["IPE"]:
+        x1, x2 = (b - tw)/2, (b + tw)/2
+        return Polygon([[0, 0], [b, 0], [b, tf], [x2, tf], [x2, d-tf], [b, d-tf], [b, d],
+                        [0, d], [0, d-tf], [x1, d-tf], [x1, tf], [0, tf]])
+
+    elif kind == KINDS["L"]:
+        return Polygon([[0, 0], [b, 0], [b, tf], [tw, tf], [tw, d], [0, d]])
+
+    elif kind == KINDS["HS"]:
+        return Polygon(box(0, 0, b, d).exterior, [box(tw, tf, b-tw, d-tf).exterior.coords[::-1]])
+
+    else:
+        raise ValueError(f"Unknown section kind: {kind}")
+    # end if else
+
+# end def section_polygon()
+
+
+########################################################################################################
+# FUNCTION - BUILD_CATALOG()
+
+def build_catalog(csv_path = CSV_PATH, bin_path = BIN_PATH):
+    """
+    Calculates the properties of every section in the CSV and writes the binary catalog.
+
+    Args:
+        csv_path (str): Source table of section dimensions.
+        bin_path (str): Output file.
+
+    Returns:
+        int: Number of sections written.
+    """
+
+    with open(csv_path, newline = "") as f:
+        rows = sorted(csv.DictReader(f), key = lambda row: row["designation"])
+
+    dims = {name: np.array([float(row[name]) for row in rows]) for name in ("d", "b", "tw", "tf", "lip")}
+    kind = np.array([KINDS[row["kind"]] for row in rows], dtype = np.int8)
+
+    polygons = [section_polygon(kind[i], *(dims[name][i] for name in ("d", "b", "tw", "tf", "lip")))
+                for i in range(len(rows))]
+    props = section_properties(polygons)
+
+    columns = {
+        "designation": np.array([row["designation"] for row in rows], dtype = "S24"),
+        "kind":        kind,
+        **{name: values.astype(np.float32) for name, values in dims.items()},
+        **{name: np.asarray(values, dtype = np.float64) for name, values in props._asdict().items()},
+    }
+
+    header, offset = {"rows": len(rows), "columns": {}}, 0
+    for name, values in columns.items():
+        header["columns"][name] = {"dtype": values.dtype.str, "offset": offset}
+        offset = _aligned(offset + values.nbytes)
+    # end for name
+
+    header_bytes = json.dumps(header).encode()
+    start        = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    with open(bin_path, "wb") as f:
+
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+
+        for name, values in columns.items():
+            f.seek(start + header["columns"][name]["offset"])
+            f.write(values.tobytes())
+        # end for name
+
+        f.truncate(start + offset)
+    # end with
+
+    return len(rows)
+
+# end def build_catalog()
+
+
+def _aligned(n):
+
+    return -(-n // ALIGN)*ALIGN
+
+
+########################################################################################################
+# FUNCTION - LOAD_CATALOG()
+
+def load_catalog(bin_path = BIN_PATH):
+    """
+    Memory-maps the columns of the binary catalog (once per process).
+
+    Args:
+        bin_path (str): Catalog file.
+
+    Returns:
+        dict: Read-only np.memmap per column name.
+    """
+
+    global _catalog
+    if _catalog is not None and _catalog["path"] == bin_path:
+        return _catalog["columns"]
+
+    with open(bin_path, "rb") as f:
+
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{bin_path} is not a section catalog")
+
+        size   = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(size))
+    # end with
+
+    start   = _aligned(len(MAGIC) + 8 + size)
+    columns = {name: np.memmap(bin_path, dtype = np.dtype(column["dtype"]), mode = "r",
+                               offset = start + column["offset"], shape = (header["rows"],))
+               for name, column in header["columns"].items()}
+
+    _catalog = {"path": bin_path, "columns": columns}
+    return columns
+
+# end def load_catalog()
+
+
+########################################################################################################
+# LOOKUPS:
+
+def designations():
+
+    return [name.decode() for name in load_catalog()["designation"]]
+
+
+def find(designation):
+    """
+    Finds the row of a section by binary search on the sorted designations.
+
+    Args:
+        designation (str):  Section designation, e.g. "IPE 200".
+
+    Returns:
+        int: Row index.
+    """
+
+    names = load_catalog()["designation"]
+    key   = np.array(designation, dtype = names.dtype)
+    i     = int(np.searchsorted(names, key))
+
+    if i == len(names) or names[i] != key:
+        raise KeyError(designation)
+
+    return i
+
+# end def find()
+
+
+def properties(designation):
+    """
+    Section properties of one catalog section.
+
+    Args:
+        designation (str):  Section designation.
+
+    Returns:
+        SectionProperties: Properties as length-1 arrays, as returned by section_properties().
+    """
+
+    columns, i = load_catalog(), find(designation)
+    return SectionProperties(*(np.array(columns[name][i:i+1]) for name in SectionProperties._fields))
+
+
+def dimensions(designation):
+
+    columns, i = load_catalog(), find(designation)
+    return (int(columns["kind"][i]), *(float(columns[name][i]) for name in ("d", "b", "tw", "tf", "lip")))
+
+
+def polygon(designation):
+
+    return section_polygon(*dimensions(designation))
+
+
+########################################################################################################
+# FUNCTION - SECTIONS_WITH_IU()
+
+def sections_with_Iu(min_Iu, angle, kind = None):
+    """
+    Range query: all sections whose second moment of area about the u-axis, rotated by an angle
+    from the x-axis, is at least min_Iu.
+
+    Args:
+        min_Iu (float):     Minimum Iu [mm⁴].
+        angle (float):      Rotation of the u-axis [deg].
+        kind (str):         Optional key of KINDS to restrict the query to.
+
+    Returns:
+        list: (designation, Iu) pairs sorted by Iu.
+    """
+
+    columns = load_catalog()
+
+    c = np.cos(2*np.radians(angle))
+    s = np.sin(2*np.radians(angle))
+    Iu = columns["O"] + (columns["Ix"] - columns["Iy"])/2*c - columns["Ixy"]*s
+
+    mask = Iu >= min_Iu
+    if kind is not None:
+        mask &= columns["kind"] == KINDS[kind]
+
+    rows = np.flatnonzero(mask)
+    rows = rows[np.argsort(Iu[rows])]
+
+    return [(columns["designation"][i].decode(), float(Iu[i])) for i in rows]
+
+# end def sections_with_Iu()
+
+
+
+
+
+########################################################################################################
+
+if __name__ == "__main__":
+    print(f"{build_catalog()} sections written to {BIN_PATH}")
@@ -0,0 +1,569 @@
+import os, threading, time
+from collections import namedtuple
+
+import numpy as np
+
+from utils import metrics
+
+
+########################################################################################################
+# CATENARY SOLVER:
+#
+# Cable of length L hanging between support A at (0, ya) and support B at (span, H), under its self
+# weight w per unit length:
+#
+#   y(x) = c cosh((x - v1)/c) + v2
+#
+# With z = span/(2c) the length condition becomes sinh(z)/z = sqrt(L² - (H - ya)²)/span, which is
+# solved for z by a vectorized Newton iteration with analytic derivatives, safeguarded by a bracket
+# that falls back to bisection. Everything else has a closed form. All inputs broadcast, so a whole
+# grid of (L, H, span, w) is solved at once.
+
+TOLERANCE = 1e-12   # Relative tolerance on z.
+MAX_ITER  = 60      # Newton / bisection iterations.
+
+LATENCY_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1)   # Solve durations reported to the metrics [s]
+
+Catenary = namedtuple("Catenary", [
+    "c",            # Catenary parameter To/w [m]
+    "v1",           # x of the vertex of the catenary [m]
+    "v2",           # Vertical offset of the catenary [m]
+    "x_turn",       # x of the turning point (lowest point) [m], equal to v1
+    "h",            # Sag below the chord at the turning point [m]
+    "To",           # Horizontal tension [kN]
+    "Tmax",         # Largest tension, at the support furthest from the vertex [kN]
+])
+
+
+########################################################################################################
+# WARM STARTS:
+#
+# z depends on the single ratio r, so the solution cache is a sorted array of solved (r, z) pairs and
+# the nearest solved neighbour of a new r is found by binary search. Its z starts the Newton
+# iteration, which then typically converges in two or three steps instead of five to eight. The
+# cache keeps the most recent WARM_CACHE solutions.
+
+WARM_CACHE = 4096   # Solved (r, z) pairs kept for warm starts.
+
+# Iteration counts reported to the metrics histogram:
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, MAX_ITER)
+
+_warm      = (np.empty(0), np.empty(0))   # Sorted r, matching z
+_warm_lock = threading.Lock()
+
+
+def warm_start(r):
+    """
+    z of the nearest previously solved r, NaN where the cache is empty.
+
+    Args:
+        r (np.ndarray):     Ratios to solve.
+
+    Returns:
+        np.ndarray: Starting values, same shape as r.
+    """
+
+    rs, zs = _warm
+    if not len(rs):
+        return np.full(np.shape(r), np.nan)
+    # end if
+
+    right   = np.minimum(np.searchsorted(rs, r), len(rs) - 1)
+    left    = np.maximum(right - 1, 0)
+    nearest = np.where(np.abs(r - rs[left]) <= np.abs(rs[right] - r), left, right)
+
+    return zs[nearest]
+
+
+def _remember(r, z):
+
+    global _warm
+    keep = np.isfinite(z)
+    r, z = r[keep][-WARM_CACHE:], z[keep][-WARM_CACHE:]
+
+    with _warm_lock:
+        rs, zs = _warm
+        rs, unique = np.unique(np.concatenate([r, rs]), return_index = True)
+        zs = np.concatenate([z, zs])[unique]
+
+        # Over capacity, thin the cache evenly so that it keeps covering the whole range of r:
+        if len(rs) > WARM_CACHE:
+            pick = np.linspace(0, len(rs) - 1, WARM_CACHE).round().astype(int)
+            rs, zs = rs[pick], zs[pick]
+        # end if
+
+        _warm = (rs, zs)
+    # end with
+
+
+########################################################################################################
+# FUNCTION - SOLVE_Z()
+
+def solve_z(r, tol = TOLERANCE, max_iter = MAX_ITER, warm = True):
+    """
+    Solves sinh(z) = r z for z > 0, element-wise. Iteration counts and failures are reported to
+    utils.metrics.
+
+    Args:
+        r (np.ndarray):     Ratio of the cable length (projected on the chord normal) to the span, > 1.
+        tol (float):        Relative tolerance.
+        max_iter (int):     Iteration limit.
+        warm (bool):        Start from the nearest cached solution and cache the new ones.
+
+    Returns:
+        np.ndarray: z, NaN where r <= 1 (cable not longer than the chord) or the iteration failed.
+    """
+
+    started = time.perf_counter()
+
+    r  = np.asarray(r, dtype = float)
+    ok = r > 1
+    r  = np.where(ok, r, 2.0)
+
+    # Bracket: f(lo) < 0 < f(hi)
+    lo = np.zeros_like(r)
+    hi = 2*np.log(2*r) + 2
+
+    # Start from the nearest solved ratio, otherwise from the small-z series (sinh z/z ≈ 1 + z²/6)
+    # or the large-z asymptote:
+    z = np.where(r < 3, np.sqrt(6*(r - 1)), np.log(2*r) + np.log(np.log(2*r) + 1))
+    if warm:
+        z0 = warm_start(r)
+        z  = np.where(np.isfinite(z0), z0, z)
+    # end if
+    z = np.clip(z, 1e-6, hi)
+
+    done       = np.zeros(r.shape, dtype = bool)
+    iterations = np.zeros(r.shape, dtype = int)
+
+    for _ in range(max_iter):
+
+        f  = np.sinh(z) - r*z
+        lo = np.where(f < 0, z, lo)
+        hi = np.where(f > 0, z, hi)
+
+        step  = f/(np.cosh(z) - r)
+        new_z = z - step
+
+        # Newton steps that leave the bracket are replaced by bisection:
+        outside = (new_z < lo) | (new_z > hi) | ~np.isfinite(new_z)
+        new_z   = np.where(outside, (lo + hi)/2, new_z)
+
+        # Converged once the step is below tolerance or f is down to round-off:
+        iterations += ~done
+        done  = done | (np.abs(step) <= tol*z) | (np.abs(f) <= 4*np.finfo(float).eps*r*z)
+        z     = np.where(done, z, new_z)
+        if done.all():
+            break
+        # end if
+    # end for
+
+    z = np.where(ok & done, z, np.nan)
+    if warm:
+        _remember(r[ok & done], z[ok & done])
+    # end if
+
+    metrics.count("catenary_solves", r.size)
+    metrics.count("catenary_failures", int(np.count_nonzero(ok & ~done)))
+    metrics.count("catenary_too_short", int(np.count_nonzero(~ok)))
+    metrics.observe("catenary_iterations", iterations[ok], ITERATION_BUCKETS)
+    metrics.observe("catenary_solve_seconds", time.perf_counter() - started, LATENCY_BUCKETS)
+
+    return z
+
+# end def solve_z()
+
+
+########################################################################################################
+# FUNCTION - SOLVE_CATENARY()
+
+def solve_catenary(L, H, w = 1.0, span = 20.0, ya = 10.0):
+    """
+    Solves catenaries for arrays of cable lengths, support heights, spans and self weights.
+
+    Args:
+        L (float):      Cable length [m].
+        H (float):      Height of support B [m].
+        w (float):      Self weight [kN/m].
+        span (float):   Horizontal distance between the supports [m].
+        ya (float):     Height of support A [m].
+
+    Returns:
+        Catenary: One broadcast array per result, NaN where the cable is too short.
+    """
+
+    L, H, w, span, ya = np.broadcast_arrays(*(np.asarray(v, dtype = float) for v in (L, H, w, span, ya)))
+    dh = H - ya
+
+    with np.errstate(invalid = "ignore"):
+        z = solve_z(np.sqrt(L**2 - dh**2)/span)
+    # end with
+
+    c  = span/(2*z)
+    v1 = span/2 - c*np.arcsinh(dh/(2*c*np.sinh(span/(2*c))))
+    v2 = ya - c*np.cosh(v1/c)
+
+    x_turn = v1
+    h      = np.abs(ya + dh*x_turn/span - (c*np.cosh((x_turn - v1)/c) + v2))
+
+    To   = w*c
+    Tmax = w*c*np.cosh(np.maximum(np.abs(v1), np.abs(span - v1))/c)
+
+    return Catenary(c, v1, v2, x_turn, h, To, Tmax)
+
+# end def solve_catenary()
+
+
+########################################################################################################
+# FUNCTION - SEGMENT_OFFSETS()
+
+def segment_offsets(To, V, s, w):
+    """
+    End offsets of inextensible catenary segments from the forces at their left end, and their
+    derivatives. With u = V/To growing by w s/To along the segment:
+
+        dx = To/w [asinh(u1) - asinh(u0)]        dy = To/w [sqrt(1 + u1²) - sqrt(1 + u0²)]
+
+    Args:
+        To (np.ndarray):    Horizontal tension [kN].
+        V (np.ndarray):     Vertical force at the left end, To y' [kN].
+        s (np.ndarray):     Unstretched length of the segments [m].
+        w (np.ndarray):     Self weight [kN/m].
+
+    Returns:
+        tuple: dx, dy, d(dx)/dTo, d(dx)/dV, d(dy)/dTo, d(dy)/dV.
+    """
+
+    u0, u1 = V/To, (V + w*s)/To
+    r0, r1 = np.sqrt(1 + u0**2), np.sqrt(1 + u1**2)
+    a      = np.arcsinh(u1) - np.arcsinh(u0)
+
+    dx = To/w*a
+    dy = To/w*(r1 - r0)
+
+    dx_dV = (1/r1 - 1/r0)/w
+    dx_dH = (a - u1/r1 + u0/r0)/w
+    dy_dV = (u1/r1 - u0/r0)/w
+    dy_dH = dx_dV
+
+    return dx, dy, dx_dH, dx_dV, dy_dH, dy_dV
+
+# end def segment_offsets()
+
+
+########################################################################################################
+# ELASTIC CATENARY:
+#
+# Cable of unstretched length L0 and axial stiffness EA (Irvine's elastic catenary). A temperature
+# change dT lengthens the unstretched cable to L0 (1 + alpha dT) and leaves its total weight
+# unchanged. With the horizontal tension To and the vertical force V = To y' at support A as
+# unknowns, the end of the cable must reach support B:
+#
+#   To L/EA + dx(To, V) = span          (V L + w L²/2)/EA + dy(To, V) = H - ya
+#
+# dx and dy are the inextensible offsets of segment_offsets(). The 2x2 system is solved by Newton
+# iterations vectorized over the batch, starting from the inextensible solution. Where the elastic
+# stretch of that solution is below STRETCH_TOL the inextensible solution is returned as it is.
+
+ALPHA       = 12e-6   # Thermal expansion coefficient of steel [1/°C]
+STRETCH_TOL = 1e-6    # Elastic stretch below which the cable is treated as inextensible [m]
+
+ElasticCatenary = namedtuple("ElasticCatenary", [
+    "To",           # Horizontal tension [kN]
+    "Va",           # Upward reaction at support A [kN]
+    "Vb",           # Upward reaction at support B [kN]
+    "Ta",           # Tension at support A [kN]
+    "Tb",           # Tension at support B [kN]
+    "L0",           # Unstretched length at the temperature [m]
+    "stretch",      # Elastic elongation [m]
+    "w",            # Self weight per unit unstretched length at the temperature [kN/m]
+    "EA",           # Axial stiffness [kN]
+])
+
+
+########################################################################################################
+# FUNCTION - SOLVE_ELASTIC()
+
+def solve_elastic(L0, H, w = 1.0, EA = np.inf, dT = 0.0, alpha = ALPHA, span = 20.0, ya = 10.0,
+                  tol = TOLERANCE, max_iter = MAX_ITER):
+    """
+    Solves elastic catenaries for arrays of unstretched lengths, support heights, stiffnesses and
+    temperature changes.
+
+    Args:
+        L0 (float):     Unstretched cable length at the reference temperature [m].
+        H (float):      Height of support B [m].
+        w (float):      Self weight at the reference temperature [kN/m].
+        EA (float):     Axial stiffness [kN], np.inf for an inextensible cable.
+        dT (float):     Temperature change [°C].
+        alpha (float):  Thermal expansion coefficient [1/°C].
+        span (float):   Horizontal distance between the supports [m].
+        ya (float):     Height of support A [m].
+        tol (float):    Relative tolerance.
+        max_iter (int): Iteration limit.
+
+    Returns:
+        ElasticCatenary: One broadcast array per result, NaN where the iteration failed.
+    """
+
+    started = time.perf_counter()
+
+    L0, H, w, EA, dT, span, ya = np.broadcast_arrays(
+        *(np.asarray(v, dtype = float) for v in (L0, H, w, EA, dT, span, ya))
+    )
+    L  = L0*(1 + alpha*dT)
+    w  = w*L0/L
+    dh = H - ya
+    W  = w*L
+
+    # Inextensible solution as the starting point, a taut straight cable where it does not exist:
+    rigid = solve_catenary(L, H, w, span, ya)
+    To    = rigid.To
+    V     = -To*np.sinh(rigid.v1/rigid.c)
+
+    chord = np.hypot(span, dh)
+    taut  = ~np.isfinite(To)
+    To    = np.where(taut, EA*np.maximum(chord/L - 1, 1e-4)*span/chord, To)
+    V     = np.where(taut, To*dh/span - W/2, V)
+
+    # Fast path: stretch of the inextensible solution below tolerance.
+    active     = taut | (rigid.Tmax*L/EA > STRETCH_TOL)
+    iterations = np.zeros(L.shape, dtype = int)
+
+    for _ in range(max_iter):
+
+        if not active.any():
+            break
+        # end if
+
+        dx, dy, dx_dH, dx_dV, dy_dH, dy_dV = segment_offsets(To, V, L, w)
+
+        F1 = To*L/EA + dx - span
+        F2 = (V*L + W*L/2)/EA + dy - dh
+        J11, J12 = L/EA + dx_dH, dx_dV
+        J21, J22 = dy_dH, L/EA + dy_dV
+
+        det = J11*J22 - J12*J21
+        dTo = -( J22*F1 - J12*F2)/det
+        dV  = -(-J21*F1 + J11*F2)/det
+
+        # Keep the horizontal tension positive: at most a 75 % decrease per step.
+        lam = np.where(dTo < 0, np.minimum(1, 0.75*To/np.maximum(-dTo, 1e-300)), 1)
+        lam = np.where(np.isfinite(lam), lam, 0)
+
+        To = np.where(active, To + lam*dTo, To)
+        V  = np.where(active, V + lam*dV, V)
+
+        iterations += active
+        active = active & ~((np.abs(dTo) <= tol*To) & (np.abs(dV) <= tol*np.maximum(np.abs(V), To)))
+    # end for
+
+    failed = active | ~np.isfinite(To) | ~np.isfinite(V)
+    To, V  = np.where(failed, np.nan, To), np.where(failed, np.nan, V)
+
+    Ta = np.hypot(To, V)
+    Tb = np.hypot(To, V + W)
+
+    # Stretch: integral of T/EA over the unstretched length.
+    u0, u1  = V/To, (V + W)/To
+    stretch = To**2/(2*w*EA)*(u1*np.sqrt(1 + u1**2) + np.arcsinh(u1) - u0*np.sqrt(1 + u0**2) - np.arcsinh(u0))
+    stretch = np.where(np.isfinite(EA), stretch, 0)
+
+    metrics.count("elastic_solves", L.size)
+    metrics.count("elastic_failures", int(np.count_nonzero(failed)))
+    metrics.observe("elastic_iterations", iterations, ITERATION_BUCKETS)
+    metrics.observe("elastic_solve_seconds", time.perf_counter() - started, LATENCY_BUCKETS)
+
+    return ElasticCatenary(To, -V, V + W, Ta, Tb, L, stretch, w, EA)
+
+# end def solve_elastic()
+
+
+def elastic_profile(sol, points = 200, ya = 10.0):
+    """
+    Stretched shape and tension along solved elastic catenaries.
+
+    Args:
+        sol (ElasticCatenary):  Solved cables.
+        points (int):           Points along every cable.
+        ya (float):             Height of support A [m].
+
+    Returns:
+        tuple: x, y and tension arrays shaped (*batch, points).
+    """
+
+    To, V, w, EA = (np.asarray(v, dtype = float)[..., None] for v in (sol.To, -sol.Va, sol.w, sol.EA))
+    s  = np.linspace(0, 1, points)*np.asarray(sol.L0, dtype = float)[..., None]
+    dx, dy = segment_offsets(To, V, s, w)[:2]
+
+    x = To*s/EA + dx
+    y = ya + (V*s + w*s**2/2)/EA + dy
+    T = np.hypot(To, V + w*s)
+
+    return x, y, T
+
+# end def elastic_profile()
+
+
+########################################################################################################
+# CATENARY ATLAS:
+#
+# Precomputed solutions of the cables page geometry (span 20 m, support A at 10 m) over a dense grid
+# of cable lengths L and heights H, so continuous slider values are answered by bilinear
+# interpolation instead of a solve. The atlas is one float32 array (field, L, H) saved as
+# data/catenary_atlas.npy and memory-mapped read-only:
+#
+#   c, v1, h    solution at the grid nodes [m] (x_turn equals v1, To and Tmax scale with w)
+#   bound       interpolation error bound of the cell starting at the node [m]: the largest error
+#               of c, v1 and h against exact solves at the cell centre and edge midpoints, x 1.25
+#
+# Cells whose bound exceeds the requested tolerance, and points outside the grid, are solved exactly.
+#
+# Rebuild after changing the grid with:   python -m utils.catenary
+
+DATA_DIR   = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+ATLAS_PATH = os.path.join(DATA_DIR, "catenary_atlas.npy")
+
+ATLAS_L    = (23.0, 30.0)   # Cable lengths covered [m]
+ATLAS_H    = (5.0, 20.0)    # Heights of support B covered [m]
+ATLAS_STEP = 0.05           # Grid spacing [m]
+ATLAS_SPAN = 20.0           # Span the atlas is built for [m]
+ATLAS_YA   = 10.0           # Height of support A the atlas is built for [m]
+ATLAS_TOL  = 1e-3           # Default accepted interpolation error [m]
+
+_atlas = None
+
+
+def _atlas_axes():
+
+    Ls = np.round(np.arange(ATLAS_L[0], ATLAS_L[1] + ATLAS_STEP/2, ATLAS_STEP), 10)
+    Hs = np.round(np.arange(ATLAS_H[0], ATLAS_H[1] + ATLAS_STEP/2, ATLAS_STEP), 10)
+
+    return Ls, Hs
+
+
+########################################################################################################
+# FUNCTION - BUILD_ATLAS()
+
+def build_atlas(path = ATLAS_PATH):
+    """
+    Solves the atlas grid, estimates the interpolation error of every cell and saves the atlas.
+
+    Args:
+        path (str):     Output file.
+
+    Returns:
+        tuple: Shape of the atlas.
+    """
+
+    Ls, Hs = _atlas_axes()
+    fields = lambda sol: np.stack([sol.c, sol.v1, sol.h])
+
+    nodes = fields(solve_catenary(*np.meshgrid(Ls, Hs, indexing = "ij"), span = ATLAS_SPAN, ya = ATLAS_YA))
+
+    Lm, Hm = (Ls[:-1] + Ls[1:])/2, (Hs[:-1] + Hs[1:])/2
+    probes = {
+        "centre": (Lm, Hm, (0.5, 0.5)),
+        "bottom": (Lm, Hs[:-1], (0.5, 0.0)),
+        "top":    (Lm, Hs[1:],  (0.5, 1.0)),
+        "left":   (Ls[:-1], Hm, (0.0, 0.5)),
+        "right":  (Ls[1:],  Hm, (1.0, 0.5)),
+    }
+
+    bound = np.zeros((len(Ls), len(Hs)))
+    for L, H, (tl, th) in probes.values():
+        exact = fields(solve_catenary(*np.meshgrid(L, H, indexing = "ij"), span = ATLAS_SPAN, ya = ATLAS_YA))
+        inter = ((1 - tl)*(1 - th)*nodes[:, :-1, :-1] + tl*(1 - th)*nodes[:, 1:, :-1] +
+                 (1 - tl)*th*nodes[:, :-1, 1:] + tl*th*nodes[:, 1:, 1:])
+        bound[:-1, :-1] = np.maximum(bound[:-1, :-1], 1.25*np.abs(inter - exact).max(axis = 0))
+    # end for L
+
+    atlas = np.concatenate([nodes, bound[None]]).astype(np.float32)
+    np.save(path, atlas)
+
+    return atlas.shape
+
+# end def build_atlas()
+
+
+def load_atlas(path = ATLAS_PATH):
+
+    global _atlas
+    if _atlas is None or _atlas[0] != path:
+        atlas = np.load(path, mmap_mode = "r")
+        if atlas.shape[1:] != tuple(len(axis) for axis in _atlas_axes()):
+            raise ValueError(f"{path} does not match the atlas grid, rebuild it with python -m utils.catenary")
+        _atlas = (path, atlas)
+    # end if
+
+    return _atlas[1]
+
+
+########################################################################################################
+# FUNCTION - ATLAS_CATENARY()
+
+def atlas_catenary(L, H, w = 1.0, tol = ATLAS_TOL, span = ATLAS_SPAN, ya = ATLAS_YA):
+    """
+    Catenaries from the atlas where its error bound allows, exact solves elsewhere.
+
+    Args:
+        L (float):      Cable length [m], scalar or array.
+        H (float):      Height of support B [m].
+        w (float):      Self weight [kN/m].
+        tol (float):    Accepted interpolation error of c, v1 and h [m].
+        span (float):   Horizontal distance between the supports [m].
+        ya (float):     Height of support A [m].
+
+    Returns:
+        Catenary: Same results as solve_catenary(), within tol.
+    """
+
+    L, H, w = np.broadcast_arrays(*(np.asarray(v, dtype = float) for v in (L, H, w)))
+
+    if span != ATLAS_SPAN or ya != ATLAS_YA:
+        return solve_catenary(L, H, w, span, ya)
+    # end if
+
+    shape   = L.shape
+    L, H, w = L.ravel(), H.ravel(), w.ravel()
+
+    atlas  = load_atlas()
+    Ls, Hs = _atlas_axes()
+
+    # Cell and position inside the cell:
+    fi = (L - Ls[0])/ATLAS_STEP
+    fj = (H - Hs[0])/ATLAS_STEP
+    i  = np.clip(fi.astype(int), 0, len(Ls) - 2)
+    j  = np.clip(fj.astype(int), 0, len(Hs) - 2)
+    tl, th = fi - i, fj - j
+
+    # Gather the four corners of every cell from the flattened fields:
+    flat = atlas.reshape(4, -1)
+    k    = i*len(Hs) + j
+    c00, c10, c01, c11 = (flat[:3, k + dk] for dk in (0, len(Hs), 1, len(Hs) + 1))
+    c, v1, h = (1 - tl)*((1 - th)*c00 + th*c01) + tl*((1 - th)*c10 + th*c11)
+
+    inside = (L >= Ls[0]) & (L <= Ls[-1]) & (H >= Hs[0]) & (H <= Hs[-1])
+    exact  = ~inside | (flat[3, k] > tol)
+
+    if exact.any():
+        sol = solve_catenary(L[exact], H[exact], span = span, ya = ya)
+        c[exact], v1[exact], h[exact] = sol.c, sol.v1, sol.h
+    # end if
+
+    v2   = ya - c*np.cosh(v1/c)
+    Tmax = w*c*np.cosh(np.maximum(np.abs(v1), np.abs(span - v1))/c)
+
+    return Catenary(*(v.reshape(shape) for v in (c, v1, v2, v1, h, w*c, Tmax)))
+
+# end def atlas_catenary()
+
+
+
+
+
+
+########################################################################################################
+
+if __name__ == "__main__":
+    print(f"Atlas {build_atlas()} written to {ATLAS_PATH}")
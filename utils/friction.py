@@ -0,0 +1,485 @@
+from collections import namedtuple
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+
+########################################################################################################
+# FRICTION SYSTEMS:
+#
+# A stack of N blocks on an incline: block 0 rests on the incline, block i on block i-1. Cables run
+# over ideal pulleys anchored to the incline; cable k pulls block i up the incline with C[k, i] times
+# its tension T_k (2 for a block hanging in a bight of the cable, 0 for a block it does not touch).
+# Along the incline, with F_i the friction force on block i from the surface below it (up positive):
+#
+#   sum_k C[k, i] T_k + F_i - F_i+1 = W_i sin(angle)         |F_i| <= s mu_i N_i,  T_k >= 0
+#
+# where N_i = cos(angle) sum_j>=i W_j. The linear program minimises the friction utilisation s: the
+# blocks hold while s < 1 and motion is impending at s = 1. The duals of the equilibrium equations
+# are the virtual velocities of the blocks, so the same solve gives the direction of the motion.
+#
+# Configurations are posed CHUNK at a time as one block-diagonal program, so a batch costs a few
+# linprog calls (HiGHS slows down superlinearly beyond a few hundred configurations per program).
+# Residual forces with a large penalty keep configurations that no friction can hold feasible.
+
+SLIP_TOL = 1e-9   # Utilisation above 1 - SLIP_TOL is impending motion.
+PENALTY  = 1e6    # Cost of residual forces, relative to the total weight of a configuration.
+CHUNK    = 128    # Configurations per linear program.
+
+BlockSystem = namedtuple("BlockSystem", [
+    "utilisation",  # (M,) friction utilisation s, inf where friction cannot hold the blocks
+    "slip",         # (M,) impending motion
+    "velocity",     # (M, N) direction of motion of the blocks, up the incline positive, max |v| = 1
+    "tension",      # (M, K) cable tensions of the solution [kN]
+    "friction",     # (M, N) friction forces on the blocks from the surface below [kN]
+])
+
+
+########################################################################################################
+# FUNCTION - SOLVE_BLOCKS()
+
+def solve_blocks(W, angle, mu, cables, tol = SLIP_TOL):
+    """
+    Decides impending motion of stacked blocks coupled by cables, for many configurations at once.
+
+    Args:
+        W (np.ndarray):         (M, N) or (N,) weights of the blocks from the bottom up [kN].
+        angle (np.ndarray):     (M,) inclination angles [deg].
+        mu (np.ndarray):        Static friction coefficients of the surfaces below the blocks,
+                                scalar, (N,) or (M, N).
+        cables (np.ndarray):    (K, N) or (N,) cable coefficients of the blocks, or (M, K, N).
+        tol (float):            Utilisation tolerance of impending motion.
+
+    Returns:
+        BlockSystem: Results of every configuration.
+    """
+
+    angle = np.atleast_1d(np.asarray(angle, dtype = float))
+    W     = np.atleast_2d(np.asarray(W, dtype = float))
+    M, N  = max(len(angle), len(W)), W.shape[1]
+
+    W      = np.broadcast_to(W, (M, N))
+    angle  = np.broadcast_to(angle, (M,))
+    mu     = np.broadcast_to(np.asarray(mu, dtype = float), (M, N))
+    cables = np.asarray(cables, dtype = float)
+    if cables.ndim < 3:
+        cables = cables.reshape(-1, N)
+    # end if
+    cables = np.broadcast_to(cables, (M, *cables.shape[-2:]))
+
+    chunks = [_solve_chunk(W[i:i+CHUNK], angle[i:i+CHUNK], mu[i:i+CHUNK], cables[i:i+CHUNK], tol)
+              for i in range(0, M, CHUNK)]
+
+    return BlockSystem(*(np.concatenate(field) for field in zip(*chunks)))
+
+# end def solve_blocks()
+
+
+def _solve_chunk(W, angle, mu, cables, tol):
+
+    (M, N), K = W.shape, cables.shape[1]
+
+    sin, cos = np.sin(np.radians(angle)), np.cos(np.radians(angle))
+    normal   = cos[:, None]*np.cumsum(W[:, ::-1], axis = 1)[:, ::-1]
+
+    # Variables of configuration m: T (K), F (N), s, residual forces r+ (N), r- (N).
+    n   = K + 3*N + 1
+    off = n*np.arange(M)[:, None]
+    iT  = off + np.arange(K)
+    iF  = off + K + np.arange(N)
+    iS  = off[:, 0] + K + N
+    iR  = off + K + N + 1 + np.arange(N)
+    eq  = N*np.arange(M)[:, None] + np.arange(N)
+
+    # Equilibrium rows: cables, friction from below, friction from the block above, residuals.
+    rows = [np.repeat(eq, K, axis = 1), eq, eq[:, :-1], eq, eq]
+    cols = [np.tile(iT, N), iF, iF[:, 1:], iR, iR + N]
+    vals = [cables.transpose(0, 2, 1).reshape(M, -1), np.ones((M, N)), -np.ones((M, N - 1)),
+            np.ones((M, N)), -np.ones((M, N))]
+    A_eq = coo_matrix((np.concatenate([v.ravel() for v in vals]),
+                       (np.concatenate([r.ravel() for r in rows]), np.concatenate([c.ravel() for c in cols]))),
+                      shape = (M*N, M*n))
+    b_eq = (W*sin[:, None]).ravel()
+
+    # Friction bounds: F - s mu N <= 0 and -F - s mu N <= 0.
+    ub   = 2*N*np.arange(M)[:, None] + np.arange(2*N)
+    cap  = (mu*normal)
+    A_ub = coo_matrix((np.concatenate([np.ones(M*N), -np.ones(M*N), -cap.ravel(), -cap.ravel()]),
+                       (np.concatenate([ub[:, :N].ravel(), ub[:, N:].ravel(), ub[:, :N].ravel(), ub[:, N:].ravel()]),
+                        np.concatenate([iF.ravel(), iF.ravel(), np.repeat(iS, N), np.repeat(iS, N)]))),
+                      shape = (2*M*N, M*n))
+
+    cost = np.zeros(M*n)
+    cost[iS] = 1
+    cost[iR] = cost[iR + N] = (PENALTY/W.sum(axis = 1))[:, None]
+
+    bounds = np.zeros((M*n, 2))
+    bounds[:, 1]         = np.inf
+    bounds[iF.ravel(), 0] = -np.inf
+
+    res = linprog(cost, A_ub = A_ub.tocsr(), b_ub = np.zeros(2*M*N), A_eq = A_eq.tocsr(), b_eq = b_eq,
+                  bounds = bounds, method = "highs")
+    if res.status != 0:
+        raise ValueError(f"The friction program failed: {res.message}")
+    # end if
+
+    x = res.x
+    residual    = (x[iR] + x[iR + N]).sum(axis = 1) > tol*W.sum(axis = 1)
+    utilisation = np.where(residual, np.inf, x[iS])
+    slip        = utilisation >= 1 - tol
+
+    # Virtual velocities: more down-slope load on a block that moves down raises the utilisation.
+    velocity = -res.eqlin.marginals.reshape(M, N)
+    scale    = np.abs(velocity).max(axis = 1, keepdims = True)
+    velocity = np.where(slip[:, None] & (scale > 0), velocity/np.where(scale > 0, scale, 1), 0)
+
+    return utilisation, slip, velocity, x[iT], x[iF]
+
+
+
+
+
+########################################################################################################
+# MOTION AFTER SLIP:
+#
+# Once motion starts the blocks move in the mechanism of the impending motion, v = phi q', with the
+# cable constraints satisfied by construction. Kinetic friction mu_k N_i acts at every interface that
+# slides (phi_i != phi_i-1) and the virtual power of the forces gives one equation of motion:
+#
+#   sum_i m_i phi_i² q'' = -sin(angle) sum_i W_i phi_i - sum_i mu_k,i N_i |phi_i - phi_i-1|
+#
+# The right-hand side is constant while the blocks slide, so from rest q = a t²/2 in closed form,
+# evaluated for all configurations and times at once. A configuration stops when a block reaches the
+# end of its travel; with a <= 0 kinetic friction holds the blocks and they do not move.
+
+GRAVITY = 9.81   # [m/s²], masses W/g in tonnes for weights in kN
+
+BlockMotion = namedtuple("BlockMotion", [
+    "t",            # (steps + 1,) time [s]
+    "q",            # (M, steps + 1) distance travelled along the mechanism [m]
+    "v",            # (M, steps + 1) velocity along the mechanism [m/s]
+    "displacement", # (M, steps + 1, N) displacement of the blocks, up the incline positive [m]
+    "a",            # (M,) acceleration along the mechanism while the blocks slide [m/s²]
+    "stopped",      # (M,) time at which the motion stopped [s], inf if still moving
+])
+
+
+########################################################################################################
+# FUNCTION - SIMULATE_BLOCKS()
+
+def simulate_blocks(W, angle, mu_k, mechanism, travel = np.inf, duration = 2.0, steps = 400):
+    """
+    Motion of stacked blocks from rest after slip starts, for many configurations at once.
+
+    Args:
+        W (np.ndarray):         (M, N) or (N,) weights of the blocks from the bottom up [kN].
+        angle (np.ndarray):     (M,) inclination angles [deg].
+        mu_k (np.ndarray):      Kinetic friction coefficients, scalar, (N,) or (M, N).
+        mechanism (np.ndarray): (M, N) direction of motion, e.g. BlockSystem.velocity; zero rows
+                                do not move.
+        travel (np.ndarray):    Room of every block down and up the incline [m], (N, 2) or
+                                (M, N, 2), or a scalar.
+        duration (float):       Time span of the trajectory [s].
+        steps (int):            Time intervals of the trajectory.
+
+    Returns:
+        BlockMotion: Trajectories of every configuration.
+    """
+
+    mechanism = np.atleast_2d(np.asarray(mechanism, dtype = float))
+    M, N      = mechanism.shape
+    W         = np.broadcast_to(np.asarray(W, dtype = float), (M, N))
+    angle     = np.broadcast_to(np.asarray(angle, dtype = float), (M,))
+    mu_k      = np.broadcast_to(np.asarray(mu_k, dtype = float), (M, N))
+    travel    = np.broadcast_to(np.asarray(travel, dtype = float), (M, N, 2))
+
+    sin, cos = np.sin(np.radians(angle)), np.cos(np.radians(angle))
+    normal   = cos[:, None]*np.cumsum(W[:, ::-1], axis = 1)[:, ::-1]
+    sliding  = np.abs(np.diff(mechanism, axis = 1, prepend = 0))
+
+    drive  = -sin*(W*mechanism).sum(axis = 1)
+    resist = (mu_k*normal*sliding).sum(axis = 1)
+    mass   = (W/GRAVITY*mechanism**2).sum(axis = 1)
+
+    moving = (mass > 0) & (drive > resist)
+    a      = np.where(moving, (drive - resist)/np.where(mass > 0, mass, 1), 0)
+
+    # End of travel along the mechanism: the first block to run out of room.
+    room  = np.where(mechanism > 0, travel[..., 1], travel[..., 0])/np.where(mechanism != 0, np.abs(mechanism), np.nan)
+    q_max = np.fmin.reduce(np.where(mechanism != 0, room, np.inf), axis = 1)
+
+    stopped = np.where(moving, np.sqrt(2*q_max/np.where(moving, a, 1)), 0.0)
+
+    t = np.linspace(0, duration, steps + 1)
+    q = a[:, None]*np.minimum(t, stopped[:, None])**2/2
+    v = np.where(t < stopped[:, None], a[:, None]*t, 0.0)
+
+    return BlockMotion(t, q, v, q[..., None]*mechanism[:, None, :], a, stopped)
+
+# end def simulate_blocks()
+
+
+
+
+
+########################################################################################################
+# TWO BLOCKS IN CLOSED FORM:
+#
+# The stacked-block problem of the friction page (cables [1, 2]) has closed-form cable tensions at
+# impending motion, which classify a configuration with a few array operations instead of a linear
+# program. This is the classifier of the regime map and of the reliability analysis; it counts
+# impending motion as slip with the same tolerance as solve_blocks(), so both agree on the boundaries.
+
+def slip_case(Wt, Wb, us, angle, tol = SLIP_TOL):
+    """
+    Determines the case of the slippage.
+    Case 1 Slippage: Top block slides UPWARDS and the bottom block slides DOWNWARDS.
+    Case 2 Slippage: Top block slides DOWNWARDS and the bottom block slides UPWARDS.
+    
+    All arguments broadcast, so a whole grid of cases is classified at once.
+
+    Args:
+        Wt (float):     Mass of the top block [kN].
+        Wb (float):     Mass of the bottom block [kN].
+        us (float):     Coefficient of static friction.
+        angle (float):  Inclination angle of blocks [deg].
+        tol (float):    Relative tolerance on the friction forces; impending motion within it
+                        counts as slip, like SLIP_TOL in solve_blocks().
+
+    Returns:
+        int: 1, 2, 0 (an array of cases for array arguments)
+    """
+    
+    sin, cos = np.sin(np.radians(angle)), np.cos(np.radians(angle))
+    
+    Ttop1 = 0.5*Wt*sin + 0.5*us*Wt*cos
+    Ttop2 = 0.5*Wt*sin - 0.5*us*Wt*cos
+    
+    Tbot1 = Wb*sin - us*(2*Wt + Wb)*cos
+    Tbot2 = Wb*sin + us*(2*Wt + Wb)*cos
+    
+    slack = tol*us*(2*Wt + Wb)*cos
+    
+    case = np.select(
+        [(Ttop1 <= Tbot1 + slack) & (Ttop2 < Tbot2), (Tbot2 <= Ttop2 + slack) & (Tbot1 < Ttop1)],
+        [1, 2],
+        default = 0,
+    )
+    
+    return case if case.ndim else int(case)
+    
+# end def slip_case()
+
+
+########################################################################################################
+# SLIP RELIABILITY:
+#
+# Monte Carlo estimate of the probability of every slip case when the weights, the friction
+# coefficient and the angle are uncertain. Samples are drawn and classified MC_CHUNK at a time, so
+# memory stays bounded for any sample count, and every chunk only returns sums: case counts and the
+# first and second moments of the inputs and of the case indicators. The sums merge across chunks and
+# processes, and give the correlation of every input with every case, which ranks the inputs by
+# their influence on slip. Every chunk has its own seed spawned from one SeedSequence, so a result
+# does not depend on the number of workers.
+
+MC_CHUNK  = 2**17                              # Samples per chunk
+VARIABLES = ("Wt", "Wb", "us", "angle")        # Arguments of slip_case()
+BOUNDS    = {"us": (0, np.inf), "angle": (0, 90)}   # Samples are clipped to the physical range
+
+Reliability = namedtuple("Reliability", [
+    "probability",  # (3,) probability of no slip, case 1 and case 2
+    "error",        # (3,) standard error of the probabilities
+    "samples",      # Number of samples
+    "correlation",  # (variables, 3) correlation of every input with every case indicator
+    "ranking",      # Inputs ordered by their influence on slip, |correlation with no slip|
+])
+
+
+########################################################################################################
+# FUNCTION - SLIP_RELIABILITY()
+
+def slip_reliability(distributions, n = 10**6, chunk = MC_CHUNK, workers = 0, seed = None):
+    """
+    Probability of every slip case for uncertain inputs.
+
+    Args:
+        distributions (dict):   One entry per name of VARIABLES: a number for a fixed input or
+                                ("normal", mean, sd), ("lognormal", mean, sd), ("uniform", lo, hi).
+        n (int):                Number of samples.
+        chunk (int):            Samples per chunk.
+        workers (int):          Processes to spread the chunks over, 0 for this process.
+        seed (int):             Seed of the random numbers.
+
+    Returns:
+        Reliability: Probabilities, standard errors and sensitivities.
+    """
+
+    specs  = [distributions[name] if isinstance(distributions[name], tuple) else ("fixed", distributions[name], 0)
+              for name in VARIABLES]
+    sizes  = [min(chunk, n - i) for i in range(0, n, chunk)]
+    seeds  = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks  = [(specs, size, child) for size, child in zip(sizes, seeds)]
+
+    if workers:
+        with ProcessPoolExecutor(max_workers = min(workers, os.cpu_count() or 1)) as pool:
+            parts = list(pool.map(_reliability_chunk, tasks))
+        # end with
+    else:
+        parts = [_reliability_chunk(task) for task in tasks]
+    # end if else
+
+    counts, sx, sxx, sxc = (sum(part[k] for part in parts) for k in range(4))
+
+    p     = counts/n
+    mean  = sx/n
+    sd_x  = np.sqrt(np.maximum(sxx/n - mean**2, 0))
+    sd_c  = np.sqrt(p*(1 - p))
+    cov   = sxc/n - mean[:, None]*p[None, :]
+    scale = sd_x[:, None]*sd_c[None, :]
+    corr  = np.divide(cov, scale, out = np.zeros_like(cov), where = scale > 0)
+
+    ranking = [VARIABLES[i] for i in np.argsort(-np.abs(corr[:, 0]), kind = "stable")]
+
+    return Reliability(p, np.sqrt(p*(1 - p)/n), n, corr, ranking)
+
+# end def slip_reliability()
+
+
+def _reliability_chunk(task):
+
+    specs, size, seed = task
+    rng = np.random.default_rng(seed)
+
+    x = np.empty((len(specs), size))
+    for i, ((kind, a, b), name) in enumerate(zip(specs, VARIABLES)):
+        if kind == "normal":
+            x[i] = rng.normal(a, b, size)
+        elif kind == "lognormal":      # Mean and standard deviation of the variable itself
+            s2   = np.log1p((b/a)**2)
+            x[i] = rng.lognormal(np.log(a) - s2/2, np.sqrt(s2), size)
+        elif kind == "uniform":
+            x[i] = rng.uniform(a, b, size)
+        elif kind == "fixed":
+            x[i] = a
+        else:
+            raise ValueError(f"Unknown distribution {kind!r} of {name}")
+        # end if else
+        if name in BOUNDS:
+            np.clip(x[i], *BOUNDS[name], out = x[i])
+        # end if
+    # end for i
+
+    case = slip_case(*x)
+    hits = case == np.arange(3)[:, None]
+
+    return (hits.sum(axis = 1), x.sum(axis = 1), (x**2).sum(axis = 1), x @ hits.T.astype(float))
+
+
+
+
+
+########################################################################################################
+# BELTS AND WEDGES:
+#
+# A belt about to slip on a drum over a wrap angle beta carries T1 = T2 exp(mu beta) (capstan
+# equation); in a V-groove of angle 2a the normal forces grow by 1/sin(a), so the exponent becomes
+# mu beta/sin(a). A wedge of angle alpha with the friction angle phi = atan(mu) on both faces, pushed
+# under a load W that is guided vertically, needs P = W [tan(alpha + phi) + tan(phi)] to raise the load
+# and W [tan(phi - alpha) + tan(phi)] to be pulled out; it holds the load on its own (self-locking)
+# while that force is positive, alpha <= 2 phi.
+#
+# Every argument broadcasts, so a grid of parameters, e.g. from layouts.input_grid(), is evaluated
+# in one call, for figures as well as for generated problems.
+
+BeltFriction = namedtuple("BeltFriction", [
+    "ratio",        # Tension ratio T1/T2 at impending slip
+    "tight",        # Tension of the tight side T1 [kN]
+    "slack",        # Tension of the slack side T2 [kN]
+    "friction",     # Friction force of the drum on the belt, T1 - T2 [kN]
+])
+
+WedgeForces = namedtuple("WedgeForces", [
+    "push",         # Force to drive the wedge in and raise the load [kN]
+    "removal",      # Force to pull the wedge out, negative when it slides out on its own [kN]
+    "self_locking", # The wedge holds the load without a force
+    "phi",          # Friction angle [deg]
+])
+
+
+########################################################################################################
+# FUNCTION - BELT_TENSIONS() / REQUIRED_WRAP()
+
+def belt_tensions(mu, wrap, slack, groove = 180):
+    """
+    Tensions of a belt at impending slip on a drum.
+
+    Args:
+        mu (np.ndarray):        Coefficients of static friction.
+        wrap (np.ndarray):      Wrap angles [deg].
+        slack (np.ndarray):     Tensions of the slack side [kN].
+        groove (np.ndarray):    Groove angles of a V-belt [deg], 180 for a flat belt.
+
+    Returns:
+        BeltFriction: Tension ratios and tensions.
+    """
+
+    ratio = np.exp(np.asarray(mu)*np.radians(wrap)/np.sin(np.radians(groove)/2))
+    tight = ratio*slack
+
+    return BeltFriction(ratio, tight, np.broadcast_to(slack, np.shape(tight)), tight - slack)
+
+# end def belt_tensions()
+
+
+def required_wrap(ratio, mu, groove = 180):
+    """
+    Wrap angle that holds a tension ratio at impending slip, the inverse of belt_tensions().
+
+    Args:
+        ratio (np.ndarray):     Tension ratios T1/T2.
+        mu (np.ndarray):        Coefficients of static friction.
+        groove (np.ndarray):    Groove angles of a V-belt [deg], 180 for a flat belt.
+
+    Returns:
+        np.ndarray: Wrap angles [deg].
+    """
+
+    return np.degrees(np.log(ratio)*np.sin(np.radians(groove)/2)/np.asarray(mu))
+
+# end def required_wrap()
+
+
+########################################################################################################
+# FUNCTION - WEDGE_FORCES()
+
+def wedge_forces(W, alpha, mu):
+    """
+    Forces on a wedge that lifts a vertically guided load.
+
+    Args:
+        W (np.ndarray):         Loads [kN].
+        alpha (np.ndarray):     Wedge angles [deg].
+        mu (np.ndarray):        Coefficients of static friction of both wedge faces.
+
+    Returns:
+        WedgeForces: Driving and removal forces.
+    """
+
+    phi     = np.degrees(np.arctan(mu))
+    tan     = lambda deg: np.tan(np.radians(deg))
+    push    = W*(tan(alpha + phi) + tan(phi))
+    removal = W*(tan(phi - alpha) + tan(phi))
+
+    return WedgeForces(push, removal, removal >= 0, phi)
+
+# end def wedge_forces()
+
+
+
+
+
+########################################################################################################
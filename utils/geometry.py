@@ -0,0 +1,147 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np, shapely
+from shapely.geometry import LineString, Polygon
+
+
+########################################################################################################
+# SCENE GEOMETRY:
+#
+# A scene holds the drawing primitives of a page as groups of shapely geometries, one group per
+# trace style. rotate_scene() applies one affine transform to every geometry of the scene with a
+# single shapely.transform() call on the stacked coordinates, and caches the result per angle
+# (scenes are tuples of geometries, which are hashable). outline() joins the lines and polygon rings
+# of a group into one NaN-separated coordinate list, so a group becomes a single go.Scatter trace.
+
+Scene = namedtuple("Scene", [
+    "names",        # Group names
+    "parts",        # One tuple of geometries per group
+])
+
+
+def make_scene(**groups):
+
+    return Scene(tuple(groups), tuple(tuple(geoms) for geoms in groups.values()))
+
+
+def group(scene, name):
+
+    return scene.parts[scene.names.index(name)]
+
+
+########################################################################################################
+# FUNCTION - AFFINE() / TRANSFORM()
+
+def affine(angle = 0.0, origin = (0.0, 0.0), scale = 1.0, offset = (0.0, 0.0)):
+    """
+    Affine transform that scales and rotates about an origin, then translates.
+
+    Args:
+        angle (float):      Anticlockwise rotation [deg].
+        origin (tuple):     Centre of the rotation and scaling.
+        scale (float):      Scale factor.
+        offset (tuple):     Translation applied last.
+
+    Returns:
+        tuple: 2x2 matrix A and vector b of p' = A p + b.
+    """
+
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    A    = scale*np.array([[c, -s], [s, c]])
+    b    = np.asarray(origin, dtype = float) - A @ np.asarray(origin, dtype = float) + np.asarray(offset, dtype = float)
+
+    return A, b
+
+
+def transform(geoms, A, b):
+
+    return shapely.transform(np.asarray(geoms, dtype = object), lambda xy: xy @ A.T + b)
+
+
+########################################################################################################
+# FUNCTION - ROTATE_SCENE()
+
+@lru_cache(maxsize = 512)
+def rotate_scene(scene, angle, origin = (0.0, 0.0)):
+    """
+    Rotates every geometry of a scene at once.
+
+    Args:
+        scene (Scene):      Scene to rotate.
+        angle (float):      Anticlockwise rotation [deg].
+        origin (tuple):     Centre of the rotation.
+
+    Returns:
+        Scene: Rotated scene, cached per scene, angle and origin.
+    """
+
+    geoms   = [geom for part in scene.parts for geom in part]
+    rotated = transform(geoms, *affine(angle, origin))
+    splits  = np.cumsum([len(part) for part in scene.parts])[:-1]
+
+    return Scene(scene.names, tuple(tuple(part) for part in np.split(rotated, splits)))
+
+# end def rotate_scene()
+
+
+########################################################################################################
+# FUNCTION - OUTLINE()
+
+def outline(geoms):
+    """
+    Coordinates of lines and polygon rings joined into one list, separated by NaN.
+
+    Args:
+        geoms (list):   Lines, rings and polygons (all rings of a polygon are included).
+
+    Returns:
+        tuple: x and y arrays.
+    """
+
+    geoms = np.asarray(geoms, dtype = object)
+    if not len(geoms):
+        return np.empty(0), np.empty(0)
+    # end if
+
+    polygons = shapely.get_type_id(geoms) == 3
+    parts    = np.concatenate([geoms[~polygons], shapely.get_rings(geoms[polygons])])
+
+    xy   = shapely.get_coordinates(parts)
+    ends = np.cumsum(shapely.get_num_coordinates(parts))[:-1]
+    xy   = np.insert(xy, ends, np.nan, axis = 0)
+
+    return xy[:, 0], xy[:, 1]
+
+# end def outline()
+
+
+########################################################################################################
+# FUNCTION - ARC() / SECTOR()
+
+def arc(center, start_angle, end_angle, radius = 1, steps = 500):
+    """
+    Circular arc from start_angle to end_angle (anticlockwise, degrees), with steps segments.
+    A start angle above the end angle wraps through 360.
+    """
+
+    if start_angle > end_angle:
+        start_angle -= 360
+    # end if
+
+    phi = np.radians(np.linspace(start_angle, end_angle, steps + 1))
+
+    return LineString(np.column_stack([center[0] + radius*np.cos(phi), center[1] + radius*np.sin(phi)]))
+
+
+def sector(center, start_angle, end_angle, radius = 1, steps = 500):
+
+    return Polygon(np.vstack([center, shapely.get_coordinates(arc(center, start_angle, end_angle, radius, steps)), center]))
+
+# end def sector()
+
+
+
+
+
+########################################################################################################
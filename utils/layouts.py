@@ -0,0 +1,192 @@
+import hashlib, itertools
+from collections import namedtuple
+
+import flask, numpy as np
+from plotly.io.json import to_json_plotly
+from dash import html, dcc
+import dash_bootstrap_components as dbc
+
+
+########################################################################################################
+# SLIDER SPECS:
+#
+# A page describes its sliders once, as a list of SliderSpec. The same list builds the label & slider
+# rows of the layout and the input grids used for precomputation and benchmarks.
+
+SliderSpec = namedtuple("SliderSpec", ["id", "label", "min", "max", "step", "value", "mark", "mark_step"],
+                        defaults = [str, None])   # mark_step: spacing of the marks, default every step
+
+
+########################################################################################################
+# FUNCTION - SLIDER_VALUES()
+
+def slider_values(spec):
+    """
+    Lists every value a slider can take.
+
+    Args:
+        spec (SliderSpec):  Slider to enumerate.
+
+    Returns:
+        np.ndarray: Slider positions from min to max.
+    """
+
+    if all(float(v).is_integer() for v in (spec.min, spec.max, spec.step)):
+        return np.arange(int(spec.min), int(spec.max) + 1, int(spec.step))
+
+    return np.round(np.arange(spec.min, spec.max + 0.5*spec.step, spec.step), 10)
+
+# end def slider_values()
+
+
+########################################################################################################
+# FUNCTION - INPUT_GRID()
+
+def input_grid(*specs):
+    """
+    Enumerates every combination of slider positions.
+
+    Args:
+        *specs (SliderSpec):    Sliders spanning the grid.
+
+    Returns:
+        list: Tuples of slider values, in the order of the specs.
+    """
+
+    return list(itertools.product(*[slider_values(spec).tolist() for spec in specs]))
+
+# end def input_grid()
+
+
+########################################################################################################
+# FUNCTION - SLIDER_ROW()
+
+def slider_row(spec, className = "mt-3"):
+    """
+    Builds the label & slider row used on every page.
+
+    The marks only carry their label, their rotation and colour come from assets/sliders.css.
+
+    Args:
+        spec (SliderSpec):  Slider to build.
+        className (str):    Class of the row, "mt-1" for the first row of a page.
+
+    Returns:
+        dbc.Row: Label & slider row.
+    """
+
+    marks = {v: spec.mark(v) for v in slider_values(spec._replace(step = spec.mark_step or spec.step)).tolist()}
+
+    return dbc.Row([
+
+        dbc.Col(
+
+            html.Div(html.Label(spec.label, style = {"color": "black"})),
+            xs = 12, sm = 12, md = 12, lg = 2, xl = 2, xxl = 2
+
+        ),
+
+        dbc.Col(
+
+            dcc.Slider(spec.min, spec.max, spec.step, value = spec.value, id = spec.id,
+                       marks = marks, className = "swk-slider"),
+            xs = 12, sm = 12, md = 12, lg = 10, xl = 10, xxl = 10, style = {"height": "5vh"}
+
+        )
+
+    ], className = className
+    )
+
+# end def slider_row()
+
+
+########################################################################################################
+# FUNCTION - SLIDER_ROWS()
+
+def slider_rows(specs):
+
+    return [slider_row(spec, "mt-1" if i == 0 else "mt-3") for i, spec in enumerate(specs)]
+
+# end def slider_rows()
+
+
+########################################################################################################
+# COMPILED LAYOUTS:
+#
+# The app shell is static, but Dash serializes it again on every page load. install_layout_cache()
+# serializes it once, with the same plotly JSON encoder as Dash, and answers /_dash-layout from that
+# JSON, with 304 responses for browsers that already hold it.
+#
+# Page layouts are left out: Dash's pages router builds and serializes them on every navigation and
+# offers no public hook to serve cached JSON instead, and answering the router ourselves would skip
+# its validation layout update. Per-page caching waits for a supported path.
+
+CompiledLayout = namedtuple("CompiledLayout", ["json", "etag"])
+
+
+def compile_layout(component):
+    """
+    Serializes a layout.
+
+    Args:
+        component (Component):  Layout to serialize.
+
+    Returns:
+        CompiledLayout: JSON string and its ETag.
+    """
+
+    payload = to_json_plotly(component)
+
+    return CompiledLayout(payload, '"' + hashlib.sha1(payload.encode()).hexdigest()[:16] + '"')
+
+# end def compile_layout()
+
+
+def _compiled_response(compiled, mimetype = "application/json"):
+
+    if flask.request.if_none_match.contains(compiled.etag.strip('"')):
+        response = flask.Response(status = 304)
+    else:
+        response = flask.Response(compiled.json, mimetype = mimetype)
+    # end if else
+
+    response.headers["ETag"] = compiled.etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+########################################################################################################
+# FUNCTION - INSTALL_LAYOUT_CACHE()
+
+def install_layout_cache(app):
+    """
+    Serves the app shell from JSON serialized once.
+
+    Args:
+        app (dash.Dash):    App with a static (non-callable) layout; callable layouts are left to Dash.
+    """
+
+    path  = app.config.requests_pathname_prefix + "_dash-layout"
+    shell = {}   # The compiled shell and the layout it was compiled from
+
+    @app.server.before_request
+    def serve_compiled_layout():
+
+        if flask.request.method != "GET" or flask.request.path != path or callable(app.layout):
+            return None
+
+        if shell.get("layout") is not app.layout:
+            shell.update(layout = app.layout, compiled = compile_layout(app.layout))
+        # end if
+
+        return _compiled_response(shell["compiled"])
+
+    # end def serve_compiled_layout()
+
+# end def install_layout_cache()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,115 @@
+from dash import dcc, html, callback, clientside_callback, Input, Output
+
+from utils.preview import PREVIEW
+
+
+########################################################################################################
+# BROWSER MEMO STORE:
+#
+# memo_callback() registers a server callback behind a clientside lookup (assets/memo.js).
+# Each browser tab keeps the most recent responses of every memoized callback, keyed by its
+# input values, so revisiting a slider position is answered without a round trip.
+#
+# Data flow for a callback called <name>:
+#   inputs -> clientside lookup --(hit)--> outputs
+#                               --(miss)-> <name>-request -> server -> <name>-response -> lookup -> outputs
+
+MEMO_SIZE = 32   # Default number of responses remembered per callback and tab.
+
+_LOOKUP_JS = """
+function(...args) {
+    return window.dash_clientside.memo.lookup("%(name)s", %(n)d, %(size)d, %(preview)d, args);
+}
+"""
+
+
+########################################################################################################
+# FUNCTION - MEMO_STORES()
+
+def memo_stores(*names):
+    """
+    Creates the request and response stores of memoized callbacks.
+
+    Args:
+        *names (str):   Names given to memo_callback().
+
+    Returns:
+        html.Div: Div holding the stores, to place in the page layout.
+    """
+
+    return html.Div([
+        dcc.Store(id = f"{name}-{kind}") for name in names for kind in ("request", "response")
+    ])
+
+# end def memo_stores()
+
+
+########################################################################################################
+# FUNCTION - MEMO_CALLBACK()
+
+def memo_callback(name, outputs, inputs, max_entries = MEMO_SIZE, preview = None):
+    """
+    Decorator that registers a callback with a browser-side memo store in front of it.
+
+    The decorated function is called with the input values and returns one value per output,
+    exactly like a plain Dash callback. With max_entries = 0 it is registered as a plain callback.
+
+    Args:
+        name (str):         Unique name, also used for the stores from memo_stores().
+        outputs (list):     Outputs of the callback.
+        inputs (list):      Inputs of the callback.
+        max_entries (int):  Responses remembered per tab, 0 disables the memo store.
+        preview (str):      Id of the page's drag store if it is one of the inputs.
+
+    Returns:
+        function: Decorator.
+    """
+
+    def decorator(func):
+
+        if max_entries <= 0:
+            return callback(*outputs, *inputs)(func)
+        # end if
+
+        preview_index = [i.component_id for i in inputs].index(preview) if preview else -1
+
+        clientside_callback(
+            _LOOKUP_JS % {"name": name, "n": len(outputs), "size": max_entries, "preview": preview_index},
+            *outputs,
+            Output(f"{name}-request", "data"),
+            *inputs,
+            Input(f"{name}-response", "data"),
+        )
+
+        @callback(
+            Output(f"{name}-response", "data"),
+            Input(f"{name}-request", "data"),
+            prevent_initial_call = True,
+        )
+        def respond(request):
+
+            token = PREVIEW.set(request["preview"])
+            try:
+                values = func(*request["args"])
+            finally:
+                PREVIEW.reset(token)
+            # end try
+
+            if len(outputs) == 1:
+                values = [values]
+
+            return {"key": request["key"], "outputs": list(values)}
+
+        # end def respond()
+
+        return func
+
+    return decorator
+
+# end def memo_callback()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,95 @@
+import threading
+from collections import defaultdict
+
+import flask, numpy as np
+
+
+########################################################################################################
+# METRICS:
+#
+# Process-wide counters and histograms for the numerical services (solver iterations, failures,
+# latencies), exposed in the Prometheus text format by install_metrics(). Every worker process keeps
+# its own values.
+
+_lock       = threading.Lock()
+_counters   = defaultdict(float)
+_histograms = {}   # name -> [bucket bounds, bucket counts, sum, count]
+
+
+def count(name, value = 1):
+
+    with _lock:
+        _counters[name] += value
+
+
+########################################################################################################
+# FUNCTION - OBSERVE()
+
+def observe(name, values, buckets):
+    """
+    Adds observations to a histogram.
+
+    Args:
+        name (str):         Histogram name.
+        values (float):     One value or an array of values.
+        buckets (tuple):    Upper bounds of the buckets, used when the histogram is created.
+    """
+
+    values = np.asarray(values, dtype = float).ravel()
+
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = [np.asarray(buckets, dtype = float), np.zeros(len(buckets), dtype = int), 0.0, 0]
+        # end if
+
+        hist = _histograms[name]
+        hist[1] += np.bincount(np.searchsorted(hist[0], values), minlength = len(hist[0]) + 1)[:len(hist[0])]
+        hist[2] += float(values.sum())
+        hist[3] += len(values)
+    # end with
+
+# end def observe()
+
+
+def snapshot():
+
+    with _lock:
+        return dict(_counters), {name: (h[0].copy(), h[1].copy(), h[2], h[3]) for name, h in _histograms.items()}
+
+
+########################################################################################################
+# FUNCTION - INSTALL_METRICS()
+
+def install_metrics(app, path = "/_metrics"):
+    """
+    Serves the metrics of the process in the Prometheus text format.
+
+    Args:
+        app (dash.Dash):    App to add the route to.
+        path (str):         Route of the metrics.
+    """
+
+    def metrics():
+
+        counters, histograms = snapshot()
+        lines = [f"{name} {value:g}" for name, value in sorted(counters.items())]
+
+        for name, (bounds, counts, total, n) in sorted(histograms.items()):
+            cumulative = np.cumsum(counts)
+            lines += [f'{name}_bucket{{le="{bound:g}"}} {c}' for bound, c in zip(bounds, cumulative)]
+            lines += [f'{name}_bucket{{le="+Inf"}} {n}', f"{name}_sum {total:g}", f"{name}_count {n}"]
+        # end for name
+
+        return flask.Response("\n".join(lines) + "\n", mimetype = "text/plain")
+
+    # end def metrics()
+
+    app.server.add_url_rule(path, "metrics", metrics)
+
+# end def install_metrics()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,134 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+
+########################################################################################################
+# MOHR'S CIRCLES:
+#
+# Principal values and Mohr's circles of symmetric 2D and 3D tensors (stress, strain, second moments
+# of area). Tensors come in batches shaped (..., 2, 2) or (..., 3, 3) and are decomposed together by
+# np.linalg.eigh, so a whole problem set costs one call. Circles are drawn from a unit circle that is
+# computed once per resolution and only scaled and shifted per tensor.
+#
+# A 2D state has one circle, a 3D state three: (σ1, σ2), (σ2, σ3) and the outer (σ1, σ3).
+
+MohrState = namedtuple("MohrState", [
+    "principal",    # (..., n) principal values, largest first
+    "directions",   # (..., n, n) unit principal directions, one per column
+    "centres",      # (..., circles) circle centres
+    "radii",        # (..., circles) circle radii
+])
+
+# Pairs of principal values spanning the circles:
+CIRCLES = {
+    2: [(0, 1)],
+    3: [(0, 1), (1, 2), (0, 2)],
+}
+
+
+########################################################################################################
+# FUNCTION - TENSOR_2D() / INERTIA_TENSOR()
+
+def tensor_2d(sx, sy, txy):
+    """
+    Builds a batch of 2D tensors from their components.
+
+    Args:
+        sx, sy (float):     Normal components, scalars or arrays.
+        txy (float):        Shear component.
+
+    Returns:
+        np.ndarray: (..., 2, 2) tensors.
+    """
+
+    sx, sy, txy = np.broadcast_arrays(*(np.asarray(v, dtype = float) for v in (sx, sy, txy)))
+
+    return np.stack([np.stack([sx, txy], axis = -1), np.stack([txy, sy], axis = -1)], axis = -2)
+
+
+def inertia_tensor(Ix, Iy, Ixy):
+
+    # The product of area enters the inertia tensor with a negative sign:
+    return tensor_2d(Ix, Iy, -np.asarray(Ixy))
+
+
+########################################################################################################
+# FUNCTION - MOHR()
+
+def mohr(tensors):
+    """
+    Principal values, directions and Mohr's circles of a batch of symmetric tensors.
+
+    Args:
+        tensors (np.ndarray):   (..., 2, 2) or (..., 3, 3) symmetric tensors.
+
+    Returns:
+        MohrState: Principal values and circles of every tensor.
+    """
+
+    tensors = np.asarray(tensors, dtype = float)
+    n       = tensors.shape[-1]
+
+    values, vectors = np.linalg.eigh(tensors)
+    values, vectors = values[..., ::-1], vectors[..., ::-1]        # eigh sorts ascending
+
+    i, j    = np.array(CIRCLES[n]).T
+    centres = (values[..., i] + values[..., j])/2
+    radii   = (values[..., i] - values[..., j])/2
+
+    return MohrState(values, vectors, centres, radii)
+
+# end def mohr()
+
+
+########################################################################################################
+# FUNCTION - UNIT_CIRCLE() / CIRCLE_POINTS()
+
+@lru_cache(maxsize = 16)
+def unit_circle(points, half = False):
+    """
+    Points of the unit circle, computed once per resolution.
+
+    Args:
+        points (int):   Number of points.
+        half (bool):    Upper half only, from angle 0 to π.
+
+    Returns:
+        tuple: Read-only cos and sin arrays.
+    """
+
+    phi = np.linspace(0, np.pi if half else 2*np.pi, points)
+    c, s = np.cos(phi), np.sin(phi)
+    c.flags.writeable = s.flags.writeable = False
+
+    return c, s
+
+
+def circle_points(centres, radii, points = 200, half = False):
+    """
+    Scales the unit circle to every circle of a batch.
+
+    Args:
+        centres (np.ndarray):   Circle centres, any shape.
+        radii (np.ndarray):     Circle radii, same shape.
+        points (int):           Points per circle.
+        half (bool):            Upper half circles only.
+
+    Returns:
+        tuple: x and y arrays shaped (*centres.shape, points).
+    """
+
+    c, s = unit_circle(points, half)
+    centres, radii = np.asarray(centres)[..., None], np.asarray(radii)[..., None]
+
+    return centres + radii*c, radii*s
+
+# end def circle_points()
+
+
+
+
+
+########################################################################################################
@@ -0,0 +1,93 @@
+from contextvars import ContextVar
+
+from dash import dcc, ctx, Input, Output, clientside_callback
+
+
+########################################################################################################
+# DRAG PREVIEWS:
+#
+# dcc.Slider only updates "value" on release, but reports "drag_value" while it is being dragged.
+# drag_store() collects the drag values of a page's sliders into one dcc.Store, throttled in the
+# browser, and page callbacks take that store as an extra Input. When the store triggered the
+# callback it builds a cheap low-resolution figure; when a slider "value" triggered it (on release)
+# it builds the full-resolution figure.
+
+THROTTLE_MS = 150
+
+# Set by utils/memo.py, where the callback is triggered by a request store instead of the sliders:
+PREVIEW = ContextVar("preview", default = None)
+
+_THROTTLE_JS = """
+function(...values) {
+    const now = Date.now();
+    window._dragThrottle = window._dragThrottle || {};
+    if (now - (window._dragThrottle["%(id)s"] || 0) < %(ms)d) {
+        return window.dash_clientside.no_update;
+    }
+    window._dragThrottle["%(id)s"] = now;
+    return values;
+}
+"""
+
+
+########################################################################################################
+# FUNCTION - DRAG_STORE()
+
+def drag_store(store_id, slider_ids, throttle = THROTTLE_MS):
+    """
+    Creates the store holding the throttled drag values of a page's sliders.
+
+    Args:
+        store_id (str):     Id of the store, by convention "<page>-drag".
+        slider_ids (list):  Ids of the sliders to watch, in callback argument order.
+        throttle (int):     Minimum time between two previews [ms].
+
+    Returns:
+        dcc.Store: Store to place in the page layout.
+    """
+
+    clientside_callback(
+        _THROTTLE_JS % {"id": store_id, "ms": throttle},
+        Output(store_id, "data"),
+        [Input(slider_id, "drag_value") for slider_id in slider_ids],
+        prevent_initial_call = True,
+    )
+
+    return dcc.Store(id = store_id)
+
+# end def drag_store()
+
+
+########################################################################################################
+# FUNCTION - PREVIEW_VALUES()
+
+def preview_values(store_id, values, drag):
+    """
+    Picks the slider values a callback should draw.
+
+    Args:
+        store_id (str):     Id of the page's drag store.
+        values (list):      Slider "value" inputs, in the same order as the store.
+        drag (list):        Data of the drag store.
+
+    Returns:
+        tuple: (values, preview) where preview is True while a slider is being dragged.
+    """
+
+    preview = PREVIEW.get()
+    if preview is None:
+        preview = bool(drag) and ctx.triggered_id == store_id
+    # end if
+
+    if not preview or not drag:
+        return list(values), False
+
+    return [v if d is None else d for v, d in zip(values, drag)], True
+
+# end def preview_values()
+
+
+
+
+
+########################################################################################################
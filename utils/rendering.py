@@ -0,0 +1,333 @@
+import base64, hashlib, io, json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np, plotly.graph_objects as go
+
+
+########################################################################################################
+# RENDER MODES:
+
+RENDER_MODES = {
+    "auto":  "Auto",
+    "svg":   "SVG",
+    "webgl": "WebGL",
+    "image": "Image",
+}
+
+AUTO_POINTS   = 400    # Below this many points "auto" always keeps SVG.
+LOW_END_MEM   = 4      # navigator.deviceMemory [GB] at or below which a client counts as low-end.
+LOW_END_CORES = 4      # navigator.hardwareConcurrency at or below which a client counts as low-end.
+
+IMAGE_WIDTH, IMAGE_HEIGHT = 700, 450    # Plotly's default figure size [px].
+IMAGE_CACHE_SIZE = 256
+
+_image_cache = OrderedDict()
+_pool = None
+
+
+# Clientside callback that reports the browser's hardware hints once on page load:
+CLIENT_HINTS_JS = """
+function(_) {
+    return {
+        memory: navigator.deviceMemory || null,
+        cores:  navigator.hardwareConcurrency || null,
+        width:  window.innerWidth,
+    };
+}
+"""
+
+
+########################################################################################################
+# FUNCTION - COUNT_POINTS()
+
+def count_points(fig):
+    """
+    Counts the number of data points drawn by the scatter traces of a figure.
+
+    Args:
+        fig (go.Figure):    Figure to inspect.
+
+    Returns:
+        int: Total number of points.
+    """
+
+    return sum(len(trace.x) for trace in fig.data if trace.x is not None)
+
+# end def count_points()
+
+
+########################################################################################################
+# FUNCTION - CHOOSE_MODE()
+
+def choose_mode(fig, mode = "auto", hints = None):
+    """
+    Resolves the "auto" render mode from the point count and the client hints.
+
+    Small figures stay SVG. Dense figures use WebGL, unless the client reports
+    low-end hardware, in which case the figure is rasterized on the server.
+
+    Args:
+        fig (go.Figure):    Figure to render.
+        mode (str):         One of RENDER_MODES.
+        hints (dict):       Client hints from the "client-hints" store.
+
+    Returns:
+        str: "svg", "webgl" or "image".
+    """
+
+    if mode in ("svg", "webgl", "image"):
+        return mode
+
+    if count_points(fig) < AUTO_POINTS:
+        return "svg"
+
+    hints  = hints or {}
+    memory = hints.get("memory")
+    cores  = hints.get("cores")
+
+    if (memory is not None and memory <= LOW_END_MEM) or (cores is not None and cores <= LOW_END_CORES):
+        return "image"
+
+    return "webgl"
+
+# end def choose_mode()
+
+
+########################################################################################################
+# FUNCTION - RENDER()
+
+def render(fig, mode = "auto", hints = None):
+    """
+    Converts a figure built from go.Scatter traces to the requested render mode.
+
+    Args:
+        fig (go.Figure):    Figure built from go.Scatter traces.
+        mode (str):         One of RENDER_MODES.
+        hints (dict):       Client hints from the "client-hints" store.
+
+    Returns:
+        go.Figure: The same figure (SVG), a WebGL copy, or a figure showing a server-rendered PNG.
+    """
+
+    if not fig.data:
+        return fig
+
+    mode = choose_mode(fig, mode, hints)
+
+    if mode == "webgl":
+        return to_webgl(fig)
+    elif mode == "image":
+        return to_image(fig, (hints or {}).get("width"))
+    else:
+        return fig
+    # end if else
+
+# end def render()
+
+
+########################################################################################################
+# FUNCTION - TO_WEBGL()
+
+def to_webgl(fig):
+
+    traces = []
+    for trace in fig.data:
+
+        if trace.type == "scatter":
+            props = trace.to_plotly_json()
+            props.pop("type")
+            trace = go.Scattergl(**props)
+        # end if
+
+        traces.append(trace)
+    # end for trace
+
+    return go.Figure(data = traces, layout = fig.layout)
+
+# end def to_webgl()
+
+
+########################################################################################################
+# FUNCTION - TO_IMAGE()
+
+def to_image(fig, client_width = None):
+    """
+    Replaces the traces of a figure with a PNG rasterized by matplotlib.
+
+    The layout (axes, titles, annotations) is kept, and the image is placed in data
+    coordinates over the axis ranges, so the figure looks the same as the SVG version.
+    PNGs are cached by their input, and rendered in a process pool. A figure without
+    traces is returned as is.
+
+    Args:
+        fig (go.Figure):        Figure built from go.Scatter traces.
+        client_width (int):     Browser window width [px]; the PNG is no wider, at the
+                                figure's aspect ratio.
+
+    Returns:
+        go.Figure: Figure without traces, showing the rasterized image.
+    """
+
+    if not fig.data:
+        return fig
+    # end if
+
+    xrange, yrange = _axis_ranges(fig)
+
+    width, height = fig.layout.width or IMAGE_WIDTH, fig.layout.height or IMAGE_HEIGHT
+    if client_width and client_width < width:
+        width, height = int(client_width), int(height*client_width/width)
+    # end if
+
+    spec = {
+        "traces": [_trace_spec(trace) for trace in fig.data if trace.type == "scatter"],
+        "xrange": xrange,
+        "yrange": yrange,
+        "size":   [width, height],
+    }
+    key = hashlib.sha1(json.dumps(spec, sort_keys = True).encode()).hexdigest()
+
+    if key in _image_cache:
+        _image_cache.move_to_end(key)
+        source = _image_cache[key]
+    else:
+        source = "data:image/png;base64," + _executor().submit(rasterize, spec).result()
+        _image_cache[key] = source
+        if len(_image_cache) > IMAGE_CACHE_SIZE:
+            _image_cache.popitem(last = False)
+    # end if else
+
+    out = go.Figure(layout = fig.layout)
+    out.add_trace(go.Scatter(x = xrange, y = yrange, mode = "markers", marker_opacity = 0,
+                             hoverinfo = "skip", showlegend = False))
+    out.update_layout(
+        hovermode = False,
+        images = [dict(source = source, xref = "x", yref = "y", x = xrange[0], y = yrange[1],
+                       sizex = xrange[1] - xrange[0], sizey = yrange[1] - yrange[0],
+                       sizing = "stretch", layer = "below")],
+    )
+    out.update_xaxes(range = xrange, fixedrange = True)
+    out.update_yaxes(range = yrange, fixedrange = True)
+
+    return out
+
+# end def to_image()
+
+
+def _executor():
+
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers = 2)
+
+    return _pool
+
+
+def _axis_ranges(fig):
+
+    ranges = []
+    for axis, key in ((fig.layout.xaxis, "x"), (fig.layout.yaxis, "y")):
+
+        if axis.range is not None:
+            ranges.append([float(axis.range[0]), float(axis.range[1])])
+            continue
+        # end if
+
+        values = [np.asarray(getattr(trace, key), dtype = float).ravel() for trace in fig.data
+                  if getattr(trace, key) is not None]
+        values = np.concatenate(values) if values else np.empty(0)
+        if not np.isfinite(values).any():
+            ranges.append([0.0, 1.0])
+            continue
+        # end if
+
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        pad    = 0.05*(hi - lo) if hi > lo else 1
+        ranges.append([float(lo - pad), float(hi + pad)])
+    # end for axis
+
+    return ranges
+
+
+def _trace_spec(trace):
+
+    return {
+        "x":      np.asarray(trace.x, dtype = float).tolist(),
+        "y":      np.asarray(trace.y, dtype = float).tolist(),
+        "mode":   trace.mode or "lines",
+        "color":  trace.line.color or trace.marker.color or "black",
+        "mcolor": trace.marker.color or trace.line.color or "black",
+        "fill":   (trace.fillcolor or trace.line.color or "black") if trace.fill == "toself" else None,
+        "symbol": trace.marker.symbol or "circle",
+        "msize":  trace.marker.size or 6,
+        "text":   _text(trace),
+    }
+
+
+def _text(trace):
+
+    if trace.text is None or "text" not in (trace.mode or ""):
+        return None
+
+    return [trace.text]*len(trace.x) if isinstance(trace.text, str) else list(trace.text)
+
+
+########################################################################################################
+# FUNCTION - RASTERIZE()
+
+_SYMBOLS = {"circle": "o", "triangle-up": "^", "x": "x", "square": "s"}
+
+def rasterize(spec):
+    """
+    Draws a figure spec with matplotlib. Runs inside the process pool.
+
+    Args:
+        spec (dict):    Traces, axis ranges and size as built by to_image().
+
+    Returns:
+        str: Base64 encoded PNG.
+    """
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    width, height = spec["size"]
+
+    fig = plt.figure(figsize = (width/100, height/100), dpi = 100)
+    ax  = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_xlim(*spec["xrange"])
+    ax.set_ylim(*spec["yrange"])
+
+    for trace in spec["traces"]:
+
+        x, y = np.array(trace["x"]), np.array(trace["y"])
+
+        if trace["fill"] is not None:
+            ax.fill(x, y, color = trace["fill"], linewidth = 0)
+        if "lines" in trace["mode"]:
+            ax.plot(x, y, color = trace["color"], linewidth = 1.5)
+        if "markers" in trace["mode"]:
+            ax.plot(x, y, linestyle = "none", color = trace["mcolor"],
+                    marker = _SYMBOLS.get(trace["symbol"], "o"), markersize = 0.75*trace["msize"])
+        if trace["text"] is not None:
+            for xi, yi, ti in zip(x, y, trace["text"]):
+                ax.annotate(ti, (xi, yi), textcoords = "offset points", xytext = (0, -14), ha = "center")
+        # end if
+    # end for trace
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format = "png", dpi = 100)
+    plt.close(fig)
+
+    return base64.b64encode(buffer.getvalue()).decode()
+
+# end def rasterize()
+
+
+
+
+
+########################################################################################################
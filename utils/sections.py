@@ -0,0 +1,143 @@
+from collections import namedtuple
+
+import numpy as np
+from shapely.geometry import Polygon
+
+
+########################################################################################################
+# SECTION PROPERTIES:
+#
+# Area, centroid and second moments of area of arbitrary polygons (with holes), from Green's theorem
+# sums over the polygon edges. All the rings of a batch of sections are padded into one array, so a
+# batch is evaluated with a handful of NumPy operations instead of a loop over sections.
+#
+# Sign convention: x to the right, y upwards, Ix = ∫y² dA, Iy = ∫x² dA, Ixy = ∫xy dA, all about the
+# centroid of the section.
+
+SectionProperties = namedtuple("SectionProperties", [
+    "A",            # Area [mm²]
+    "cx", "cy",     # Centroid [mm]
+    "Ix", "Iy",     # Second moments of area about the centroidal axes [mm⁴]
+    "Ixy",          # Product of area about the centroidal axes [mm⁴]
+    "I1", "I2",     # Principal second moments of area, I1 >= I2 [mm⁴]
+    "theta",        # Angle from the x-axis to the I1 axis [deg]
+    "O", "R",       # Mohr-circle centre and radius [mm⁴]
+])
+
+
+########################################################################################################
+# FUNCTION - SECTION_PROPERTIES()
+
+def section_properties(sections):
+    """
+    Calculates the section properties of a batch of polygons.
+
+    Args:
+        sections (list):    Shapely Polygons, or (n, 2) arrays of exterior coordinates.
+
+    Returns:
+        SectionProperties: One array per property, with one entry per section.
+    """
+
+    rings, owner, sign = [], [], []
+    for i, section in enumerate(sections):
+
+        polygon = section if isinstance(section, Polygon) else Polygon(section)
+
+        rings.append(np.asarray(polygon.exterior.coords)[:, :2])
+        owner.append(i)
+        sign.append(1.0)
+
+        for interior in polygon.interiors:
+            rings.append(np.asarray(interior.coords)[:, :2])
+            owner.append(i)
+            sign.append(-1.0)
+        # end for interior
+    # end for section
+
+    xy = _pad_rings(rings)
+    x0, y0 = xy[:, :-1, 0], xy[:, :-1, 1]
+    x1, y1 = xy[:, 1:, 0],  xy[:, 1:, 1]
+
+    cross = x0*y1 - x1*y0
+
+    # Orient every ring so that exteriors add and holes subtract:
+    area  = 0.5*cross.sum(axis = 1)
+    sign  = np.asarray(sign)*np.sign(area)
+    cross = cross*sign[:, None]
+
+    n     = len(sections)
+    owner = np.asarray(owner)
+    total = lambda ring_sums: np.bincount(owner, weights = ring_sums, minlength = n)
+
+    A   = total(cross.sum(axis = 1))/2
+    Qy  = total(((x0 + x1)*cross).sum(axis = 1))/6
+    Qx  = total(((y0 + y1)*cross).sum(axis = 1))/6
+    Ixx = total(((y0**2 + y0*y1 + y1**2)*cross).sum(axis = 1))/12
+    Iyy = total(((x0**2 + x0*x1 + x1**2)*cross).sum(axis = 1))/12
+    Ixy = total(((x0*y1 + 2*x0*y0 + 2*x1*y1 + x1*y0)*cross).sum(axis = 1))/24
+
+    cx, cy = Qy/A, Qx/A
+
+    Ix  = Ixx - A*cy**2
+    Iy  = Iyy - A*cx**2
+    Ixy = Ixy - A*cx*cy
+
+    O = (Ix + Iy)/2
+    R = np.hypot((Ix - Iy)/2, Ixy)
+
+    theta = np.degrees(0.5*np.arctan2(-2*Ixy, Ix - Iy))
+
+    return SectionProperties(A, cx, cy, Ix, Iy, Ixy, O + R, O - R, theta, O, R)
+
+# end def section_properties()
+
+
+def _pad_rings(rings):
+    # Pads closed rings to a common length by repeating their first vertex, so the padding edges
+    # have zero length and drop out of every sum.
+
+    size = max(len(ring) for ring in rings)
+    xy   = np.empty((len(rings), size, 2))
+
+    for i, ring in enumerate(rings):
+        xy[i, :len(ring)] = ring
+        xy[i, len(ring):] = ring[0]
+    # end for i
+
+    return xy
+
+
+########################################################################################################
+# FUNCTION - ROTATED_INERTIA()
+
+def rotated_inertia(props, angle):
+    """
+    Transforms second moments of area to axes rotated anticlockwise by an angle (Mohr's circle).
+
+    Args:
+        props (SectionProperties):  Properties of one or more sections.
+        angle (float):              Rotation of the u-axis from the x-axis [deg], scalar or array.
+
+    Returns:
+        tuple: Iu, Iv, Iuv [mm⁴], broadcast over sections and angles.
+    """
+
+    c = np.cos(2*np.radians(angle))
+    s = np.sin(2*np.radians(angle))
+
+    half = (props.Ix - props.Iy)/2
+
+    Iu  = props.O + half*c - props.Ixy*s
+    Iv  = props.O - half*c + props.Ixy*s
+    Iuv = half*s + props.Ixy*c
+
+    return Iu, Iv, Iuv
+
+# end def rotated_inertia()
+
+
+
+
+
+########################################################################################################
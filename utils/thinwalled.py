@@ -0,0 +1,332 @@
+from collections import namedtuple
+
+import numpy as np
+
+from utils.catalog import KINDS
+
+
+########################################################################################################
+# THIN-WALLED SECTIONS:
+#
+# Mid-line model of the catalog sections: straight segments of constant thickness between nodes. Every
+# kind of section has a fixed topology, so a batch of sections of one kind shares the segment list and
+# every integral below runs over the whole batch at once, segment by segment.
+#
+# Segments point from the free ends towards a root node (children before parents), which is the order
+# the shear flow accumulates in. Closed cells (hollow sections) are cut at a node that appears twice.
+#
+# Coordinates are those of catalog.section_polygon(): mm, bottom left corner at the origin.
+
+Midline = namedtuple("Midline", [
+    "nodes",        # (sections, nodes, 2) node coordinates [mm]
+    "start",        # (segments,) start node of every segment
+    "end",          # (segments,) end node of every segment
+    "t",            # (sections, segments) wall thickness [mm]
+    "closed",       # True if the last node closes a cell onto the first
+])
+
+ThinWalledProperties = namedtuple("ThinWalledProperties", [
+    "A",            # Area [mm²]
+    "cx", "cy",     # Centroid [mm]
+    "Ix", "Iy",     # Second moments of area about the centroidal axes [mm⁴]
+    "Ixy",          # Product of area about the centroidal axes [mm⁴]
+    "xs", "ys",     # Shear centre [mm]
+    "J",            # St. Venant torsion constant [mm⁴]
+    "Cw",           # Warping constant about the shear centre [mm⁶]
+])
+
+# Segment lists (start, end) of every kind:
+TOPOLOGY = {
+    KINDS["LC"]:  ([0, 1, 2, 3, 4], [1, 2, 3, 4, 5]),
+    KINDS["UPE"]: ([0, 1, 2],       [1, 2, 3]),
+    KINDS["IPE"]: ([0, 1, 2, 4, 5], [2, 2, 3, 3, 3]),
+    KINDS["L"]:   ([0, 1],          [1, 2]),
+    KINDS["HS"]:  ([0, 1, 2, 3],    [1, 2, 3, 4]),
+}
+
+
+########################################################################################################
+# FUNCTION - MIDLINE()
+
+def midline(kind, d, b, tw, tf, lip = 0):
+    """
+    Builds the mid-line model of a batch of sections of one kind, from the dimensions that also
+    build their polygons (catalog.section_polygon()).
+
+    Args:
+        kind (int):     Code from catalog.KINDS.
+        d (float):      Depth [mm] (web length of a lipped channel), scalar or array.
+        b (float):      Flange width [mm].
+        tw (float):     Web thickness [mm].
+        tf (float):     Flange thickness [mm].
+        lip (float):    Lip length of a lipped channel [mm].
+
+    Returns:
+        Midline: Mid-line model of the batch.
+    """
+
+    d, b, tw, tf, lip = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype = float))
+                                              for v in (d, b, tw, tf, lip)))
+
+    if kind == KINDS["LC"]:
+        W, H, t = d, b, tw
+        nodes = [(lip, t/2), (t/2, t/2), (t/2, H - t/2), (W - t/2, H - t/2), (W - t/2, t/2), (W - lip, t/2)]
+        t     = [t, t, t, t, t]
+
+    elif kind == KINDS["UPE"]:
+        nodes = [(b, tf/2), (tw/2, tf/2), (tw/2, d - tf/2), (b, d - tf/2)]
+        t     = [tf, tw, tf]
+
+    elif kind == KINDS["IPE"]:
+        nodes = [(0*b, d - tf/2), (b, d - tf/2), (b/2, d - tf/2), (b/2, tf/2), (0*b, tf/2), (b, tf/2)]
+        t     = [tf, tf, tw, tf, tf]
+
+    elif kind == KINDS["L"]:
+        nodes = [(b, tf/2), (tw/2, tf/2), (tw/2, d)]
+        t     = [tf, tw]
+
+    elif kind == KINDS["HS"]:
+        nodes = [(tw/2, tf/2), (b - tw/2, tf/2), (b - tw/2, d - tf/2), (tw/2, d - tf/2), (tw/2, tf/2)]
+        t     = [tf, tw, tf, tw]
+
+    else:
+        raise ValueError(f"Unknown section kind: {kind}")
+    # end if else
+
+    start, end = TOPOLOGY[kind]
+
+    return Midline(np.stack([np.stack(node, axis = -1) for node in nodes], axis = 1),
+                   np.array(start), np.array(end), np.stack(t, axis = 1), kind == KINDS["HS"])
+
+# end def midline()
+
+
+def _segments(model):
+    # Start points, end points, lengths and unit directions of all segments, (sections, segments, ...)
+
+    a = model.nodes[:, model.start]
+    b = model.nodes[:, model.end]
+    L = np.linalg.norm(b - a, axis = -1)
+
+    return a, b, L, (b - a)/L[..., None]
+
+
+def _cross(u, v):
+
+    return u[..., 0]*v[..., 1] - u[..., 1]*v[..., 0]
+
+
+########################################################################################################
+# FUNCTION - THIN_WALLED_PROPERTIES()
+
+def thin_walled_properties(model):
+    """
+    Section properties, shear centre and torsion constants of a batch of thin-walled sections.
+
+    Args:
+        model (Midline):    Mid-line model from midline().
+
+    Returns:
+        ThinWalledProperties: One array per property, with one entry per section.
+    """
+
+    a, b, L, _ = _segments(model)
+    t = model.t
+
+    #--------------------------------------------------------------------------
+    # Area properties, exact for straight segments:
+
+    A  = (t*L).sum(axis = 1)
+    cx = (t*L*(a[..., 0] + b[..., 0])/2).sum(axis = 1)/A
+    cy = (t*L*(a[..., 1] + b[..., 1])/2).sum(axis = 1)/A
+
+    C  = np.stack([cx, cy], axis = -1)[:, None]
+    xa, ya = (a - C)[..., 0], (a - C)[..., 1]
+    xb, yb = (b - C)[..., 0], (b - C)[..., 1]
+
+    Ix  = (t*L*(ya**2 + ya*yb + yb**2)/3).sum(axis = 1)
+    Iy  = (t*L*(xa**2 + xa*xb + xb**2)/3).sum(axis = 1)
+    Ixy = (t*L*(2*xa*ya + xa*yb + xb*ya + 2*xb*yb)/6).sum(axis = 1)
+
+    props = ThinWalledProperties(A, cx, cy, Ix, Iy, Ixy, None, None, None, None)
+
+    #--------------------------------------------------------------------------
+    # Shear centre: point of action of the resultant of the shear flow of unit shear forces.
+
+    Mx = _flow_moment(model, props, 1.0, 0.0)
+    My = _flow_moment(model, props, 0.0, 1.0)
+
+    xs = cx + My
+    ys = cy - Mx
+
+    #--------------------------------------------------------------------------
+    # Torsion and warping:
+
+    S = np.stack([xs, ys], axis = -1)[:, None]
+    rho = _cross(a - S, (b - a)/L[..., None])          # Distance from the shear centre to each segment
+
+    if model.closed:
+        ds_t = (L/t).sum(axis = 1)
+        Am   = np.abs((rho*L).sum(axis = 1))/2         # Area enclosed by the mid-line
+        J    = 4*Am**2/ds_t
+        psi  = (rho*L).sum(axis = 1)/ds_t              # Bredt correction of the sectorial coordinate
+        rate = rho - psi[:, None]/t
+    else:
+        J    = (L*t**3/3).sum(axis = 1)
+        rate = rho
+    # end if else
+
+    # Sectorial coordinate, integrated outwards from the root:
+    w_start, w_end, w_node = np.zeros_like(L), np.zeros_like(L), {}
+    for i in reversed(range(len(model.start))):
+        w_end[:, i]   = w_node.get(model.end[i], 0)
+        w_start[:, i] = w_end[:, i] - rate[:, i]*L[:, i]
+        w_node[model.start[i]] = w_start[:, i]
+    # end for i
+
+    w0 = (t*L*(w_start + w_end)/2).sum(axis = 1)/A
+    wa = w_start - w0[:, None]
+    wb = w_end   - w0[:, None]
+    Cw = (t*L*(wa**2 + wa*wb + wb**2)/3).sum(axis = 1)
+    Cw = np.where(Cw > 1e-9*(Ix + Iy)**2/A, Cw, 0)       # Round-off of sections that do not warp
+
+    return ThinWalledProperties(A, cx, cy, Ix, Iy, Ixy, xs, ys, J, Cw)
+
+# end def thin_walled_properties()
+
+
+########################################################################################################
+# FUNCTION - SHEAR_FLOW()
+
+def shear_flow(model, props, Vx, Vy, points = 20):
+    """
+    Shear flow of shear forces acting through the shear centre, sampled along every segment.
+
+    Args:
+        model (Midline):                Mid-line model from midline().
+        props (ThinWalledProperties):   Its properties.
+        Vx, Vy (float):                 Shear force components [N].
+        points (int):                   Samples per segment.
+
+    Returns:
+        tuple: Sample coordinates (sections, segments, points, 2) [mm] and shear flow
+               (sections, segments, points) [N/mm], positive along the segment direction.
+    """
+
+    a, b, L, _ = _segments(model)
+    s          = np.linspace(0, 1, points)
+
+    q0, kx, ky, qc = _flow_coefficients(model, props, Vx, Vy)
+
+    xy = a[..., None, :] + (b - a)[..., None, :]*s[:, None]
+    q  = _flow(q0, kx, ky, qc, a, b, L, model.t, props, s)
+
+    return xy, q
+
+# end def shear_flow()
+
+
+def _flow_coefficients(model, props, Vx, Vy):
+    # Shear flow q(s) = q0 - kx Qx(s) - ky Qy(s) + qc, with Qx, Qy the first moments of the wall from
+    # the start of the segment and q0 the flow entering the segment from its children.
+
+    a, b, L, _ = _segments(model)
+    t = model.t
+
+    D  = props.Ix*props.Iy - props.Ixy**2
+    kx = ((Vy*props.Iy - Vx*props.Ixy)/D)[:, None]
+    ky = ((Vx*props.Ix - Vy*props.Ixy)/D)[:, None]
+
+    C = np.stack([props.cx, props.cy], axis = -1)[:, None]
+    ra, rb = a - C, b - C
+
+    # Flow leaving every segment, accumulated from the free ends:
+    q0, q_node = np.zeros_like(L), {}
+    for i in range(len(model.start)):
+        q0[:, i] = q_node.get(model.start[i], 0)
+        Qx = t[:, i]*L[:, i]*(ra[:, i, 1] + rb[:, i, 1])/2
+        Qy = t[:, i]*L[:, i]*(ra[:, i, 0] + rb[:, i, 0])/2
+        q_node[model.end[i]] = q_node.get(model.end[i], 0) + q0[:, i] - kx[:, 0]*Qx - ky[:, 0]*Qy
+    # end for i
+
+    # Closed cells: constant circulation so that the cell does not twist (∮ q/t ds = 0):
+    if model.closed:
+        open_flow = _integral(q0, kx, ky, 0, ra, rb, L, t)
+        qc = -(open_flow/t).sum(axis = 1)/(L/t).sum(axis = 1)
+    else:
+        qc = np.zeros(len(L))
+    # end if else
+
+    return q0, kx, ky, qc[:, None]
+
+
+def _flow(q0, kx, ky, qc, a, b, L, t, props, s):
+
+    C = np.stack([props.cx, props.cy], axis = -1)[:, None, None]
+    r = a[..., None, :] - C
+    d = (b - a)[..., None, :]
+    S = s*L[..., None]
+
+    Qx = t[..., None]*(r[..., 1]*S + d[..., 1]*S*s/2)
+    Qy = t[..., None]*(r[..., 0]*S + d[..., 0]*S*s/2)
+
+    return q0[..., None] - kx[..., None]*Qx - ky[..., None]*Qy + qc[..., None]
+
+
+def _integral(q0, kx, ky, qc, ra, rb, L, t):
+    # ∫ q ds over every segment.
+
+    Qx = t*L**2*(ra[..., 1]/2 + (rb[..., 1] - ra[..., 1])/6)
+    Qy = t*L**2*(ra[..., 0]/2 + (rb[..., 0] - ra[..., 0])/6)
+
+    return (q0 + qc)*L - kx*Qx - ky*Qy
+
+
+def _flow_moment(model, props, Vx, Vy):
+    # Moment of the shear flow about the centroid (anticlockwise).
+
+    a, b, L, u = _segments(model)
+
+    q0, kx, ky, qc = _flow_coefficients(model, props, Vx, Vy)
+
+    C = np.stack([props.cx, props.cy], axis = -1)[:, None]
+    F = _integral(q0, kx, ky, qc, a - C, b - C, L, model.t)
+
+    return (_cross(a - C, u)*F).sum(axis = 1)
+
+
+########################################################################################################
+# FUNCTION - BATCH_PROPERTIES()
+
+def batch_properties(kind, d, b, tw, tf, lip):
+    """
+    Thin-walled properties of a mixed batch of sections, evaluated one kind at a time.
+
+    Args:
+        kind (np.ndarray):              Codes from catalog.KINDS.
+        d, b, tw, tf, lip (np.ndarray): Dimensions [mm].
+
+    Returns:
+        ThinWalledProperties: One array per property, in the order of the batch.
+    """
+
+    kind = np.asarray(kind)
+    out  = {name: np.empty(len(kind)) for name in ThinWalledProperties._fields}
+
+    for code in np.unique(kind):
+        rows  = kind == code
+        props = thin_walled_properties(midline(code, *(np.asarray(v)[rows] for v in (d, b, tw, tf, lip))))
+        for name, values in props._asdict().items():
+            out[name][rows] = values
+        # end for name
+    # end for code
+
+    return ThinWalledProperties(**out)
+
+# end def batch_properties()
+
+
+
+
+
+########################################################################################################